@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Import benchmark: POST /blogpost one post at a time vs POST /blogpost/batch.
+
+Imports the same archive into empty in-memory tables (fakes.py) twice:
+through blogpost-create, one request per post, strictly serial as a
+migration script would do it, and through blogpost-batch-create in batches
+of --batch-size posts (JSON arrays, or NDJSON with --ndjson). Every
+DynamoDB call sleeps --latency ms, so the numbers show how much of an
+import is round trips. The serial path is run on the first --single posts
+only and extrapolated.
+
+Reports posts/s, the estimated time for the whole archive and the DynamoDB
+calls per post. Checks that a failed summary collection update is reported
+in the batch response (207, indexErrors), that GET /blogpost still lists
+the posts (the collection is marked stale, so it scans) and that the next
+import rebuilds the collection.
+
+Usage: python benchmarks/bench_batch_import.py [--posts N] [--batch-size N]
+           [--latency MS] [--single N] [--ndjson]
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_handlers import load_handler, make_event, make_post  # noqa: E402
+from fakes import FakeClientError, FakeDynamoDBClient, FakeS3Client  # noqa: E402
+
+
+def fresh_tables(latency: float) -> FakeDynamoDBClient:
+    dynamodb = FakeDynamoDBClient(latency=latency)
+    dynamodb.create_table('blogpost', 'slug', indexes={'date_index': ('list_pk', 'date_slug')})
+    dynamodb.create_table('blogpost_index', 'pk', 'sk')
+    return dynamodb
+
+
+def import_serial(posts, latency: float):
+    dynamodb = fresh_tables(latency)
+    handler = load_handler('blogpost', 'blogpost-create', dynamodb, FakeS3Client())
+    start = time.perf_counter()
+    for post in posts:
+        response = handler(make_event('POST /blogpost', '/blogpost', post, admin=True), None)
+        if response['statusCode'] != 201:
+            raise RuntimeError(f"Create failed: {response['body']}")
+    return time.perf_counter() - start, sum(dynamodb.calls.values())
+
+
+def import_batches(posts, batch_size: int, latency: float, ndjson: bool):
+    dynamodb = fresh_tables(latency)
+    handler = load_handler('blogpost', 'blogpost-batch-create', dynamodb, FakeS3Client())
+    start = time.perf_counter()
+    for offset in range(0, len(posts), batch_size):
+        batch = posts[offset:offset + batch_size]
+        event = make_event('POST /blogpost/batch', '/blogpost/batch', batch, admin=True)
+        if ndjson:
+            event['headers']['content-type'] = 'application/x-ndjson'
+            event['body'] = '\n'.join(json.dumps(post) for post in batch)
+        response = handler(event, None)
+        if response['statusCode'] != 201:
+            raise RuntimeError(f"Batch failed: {response['statusCode']} {response['body'][:500]}")
+    return time.perf_counter() - start, sum(dynamodb.calls.values())
+
+
+def check_index_failure(posts):
+    """A batch whose summary update fails reports it; its posts stay listed."""
+    dynamodb = fresh_tables(0)
+    batch_create = load_handler('blogpost', 'blogpost-batch-create', dynamodb, FakeS3Client())
+    summary_index = sys.modules['utils.summary_index']
+    
+    def create(batch):
+        event = make_event('POST /blogpost/batch', '/blogpost/batch', batch, admin=True)
+        event['headers'].pop('accept-encoding')
+        response = batch_create(event, None)
+        return response['statusCode'], json.loads(response['body'])
+    
+    def failing(**kwargs):
+        raise FakeClientError('InternalServerError', 'injected failure')
+    
+    third = len(posts) // 3
+    assert create(posts[:third])[0] == 201
+    transact = dynamodb.transact_write_items
+    dynamodb.transact_write_items = failing
+    status, body = create(posts[third:2 * third])
+    dynamodb.transact_write_items = transact
+    assert status == 207, status
+    assert body['created'] == third, body['message']
+    assert [error['index'] for error in body.get('indexErrors', [])] == ['summaries'], body.get('indexErrors')
+    assert summary_index.read_summaries(use_cache=False) is None, 'stale collection served'
+    
+    list_posts = load_handler('blogpost', 'blogpost-list', dynamodb, FakeS3Client())
+    event = make_event('GET /blogpost', '/blogpost')
+    event['headers'].pop('accept-encoding')
+    listed = {post['slug'] for post in json.loads(list_posts(event, None)['body'])['blogposts']}
+    assert listed == {post['slug'] for post in posts[:2 * third]}, f"{len(listed)} of {2 * third} posts listed"
+    
+    # The next import rebuilds the collection from the table
+    batch_create = load_handler('blogpost', 'blogpost-batch-create', dynamodb, FakeS3Client())
+    summary_index = sys.modules['utils.summary_index']
+    assert create(posts[2 * third:])[0] == 201
+    assert len(summary_index.read_summaries(use_cache=False)) == len(posts), 'collection not rebuilt'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=10000, help='posts in the archive')
+    parser.add_argument('--batch-size', type=int, default=500, help='posts per batch request')
+    parser.add_argument('--blocks', type=int, default=10, help='content blocks per post')
+    parser.add_argument('--latency', type=float, default=5.0, help='ms per DynamoDB call')
+    parser.add_argument('--single', type=int, default=200, help='posts imported one by one (extrapolated)')
+    parser.add_argument('--ndjson', action='store_true', help='send batches as NDJSON')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    posts = [make_post(rng, f"post-{i:06d}", args.blocks) for i in range(args.posts)]
+    latency = args.latency / 1000
+    single = posts[:min(args.single, len(posts))]
+    
+    # Handlers print EMF lines; keep the report readable
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        serial_seconds, serial_calls = import_serial(single, latency)
+        batch_seconds, batch_calls = import_batches(posts, args.batch_size, latency, args.ndjson)
+        check_index_failure(posts[:60])
+    
+    print(f"{args.posts} posts, {args.blocks} blocks each, {args.latency:g} ms per DynamoDB call\n")
+    print(f"{'path':<32} {'posts/s':>9} {'import s':>9} {'calls/post':>11}")
+    serial_rate = len(single) / serial_seconds
+    print(f"{'POST /blogpost (serial)':<32} {serial_rate:>9.0f} {args.posts / serial_rate:>8.0f}* "
+          f"{serial_calls / len(single):>11.2f}")
+    label = f"POST /blogpost/batch ({args.batch_size}{', NDJSON' if args.ndjson else ''})"
+    print(f"{label:<32} {args.posts / batch_seconds:>9.0f} {batch_seconds:>9.1f} {batch_calls / args.posts:>11.2f}")
+    print(f"\n* extrapolated from {len(single)} posts")
+    print("checks: a failed summary update is reported (207, indexErrors), lists scan until the next import rebuilds it")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Latency test: default botocore client vs the shared tuned client configuration.
+
+Starts a local stand-in DynamoDB endpoint (JSON protocol over HTTP) that
+answers GetItem after --latency seconds, except for a --stall-rate fraction
+of requests that hang for --stall seconds (a slow or dropped connection).
+Both clients issue the same GetItem calls from a thread pool the size of the
+scan fan-out; the tuned client's read timeout cuts stalls short and retries
+them, while the default client waits each one out with a 10-connection pool.
+
+Needs boto3 (requirements.txt); no AWS account is used.
+
+Usage: python benchmarks/bench_client_config.py [--requests N] [--threads N]
+           [--latency S] [--stall S] [--stall-rate F] [--read-timeout S]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils import aws_clients  # noqa: E402
+
+ITEM = {
+    'slug': {'S': 'my-blog-post'},
+    'title': {'S': 'My Blog Post'},
+    'summary': {'S': 'A brief summary'},
+    'date': {'S': '2024-01-01'}
+}
+
+
+def make_handler(latency: float, stall: float, stall_rate: float, seed: int):
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    
+    class StandInDynamoDB(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            with rng_lock:
+                stalled = rng.random() < stall_rate
+            time.sleep(stall if stalled else latency)
+            
+            body = json.dumps({'Item': ITEM}).encode('utf-8')
+            try:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-amz-json-1.0')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client gave up (read timeout)
+        
+        def log_message(self, *args):
+            pass
+    
+    return StandInDynamoDB
+
+
+def run(client, requests: int, threads: int) -> dict:
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    
+    def call(_):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            client.get_item(TableName='blogpost', Key={'slug': {'S': 'my-blog-post'}})
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(call, range(requests)))
+    wall = time.perf_counter() - start
+    
+    latencies.sort()
+    
+    def percentile(p):
+        if not latencies:
+            return float('nan')
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    
+    return {
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'max': (latencies[-1] * 1000) if latencies else float('nan'),
+        'mean': statistics.mean(latencies) * 1000 if latencies else float('nan'),
+        'errors': errors,
+        'wall': wall
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=16, help='concurrent callers (scan fan-out)')
+    parser.add_argument('--latency', type=float, default=0.005, help='normal response delay, seconds')
+    parser.add_argument('--stall', type=float, default=3.0, help='stalled response delay, seconds')
+    parser.add_argument('--stall-rate', type=float, default=0.01, help='fraction of stalled requests')
+    parser.add_argument('--read-timeout', type=float, default=0.5, help='tuned client read timeout')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    
+    import boto3
+    from botocore.config import Config
+    
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'bench')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'bench')
+    os.environ['AWS_READ_TIMEOUT'] = str(args.read_timeout)
+    
+    print(f"{args.requests} GetItem calls, {args.threads} threads, "
+          f"{args.latency * 1000:.0f} ms normal, {args.stall_rate:.1%} stalled for {args.stall:.1f} s")
+    print(f"{'client':<8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'mean':>8} {'errors':>7} {'wall s':>7}")
+    
+    for name in ('default', 'tuned'):
+        # A fresh server per client so both see the same stall sequence
+        server = ThreadingHTTPServer(
+            ('127.0.0.1', 0),
+            make_handler(args.latency, args.stall, args.stall_rate, args.seed)
+        )
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+        
+        if name == 'default':
+            client = boto3.client('dynamodb', region_name='us-east-1', endpoint_url=endpoint, config=Config())
+        else:
+            client = aws_clients.create_client('dynamodb', region_name='us-east-1', endpoint_url=endpoint)
+        
+        result = run(client, args.requests, args.threads)
+        server.shutdown()
+        print(f"{name:<8} {result['p50']:>8.1f} {result['p95']:>8.1f} {result['p99']:>8.1f} "
+              f"{result['max']:>8.1f} {result['mean']:>8.1f} {result['errors']:>7} {result['wall']:>7.2f}")
+    
+    settings = aws_clients.client_settings('dynamodb')
+    print("tuned settings: " + ", ".join(f"{k}={v}" for k, v in settings.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled item codec vs the old json.dumps/json.loads round trip.
+
+Usage: python benchmarks/bench_codec.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.codec import get_codec  # noqa: E402
+
+BLOCK_COUNTS = [10, 100, 1000, 5000]
+
+
+def legacy_decimal_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def legacy_serialize_item(item):
+    return json.loads(json.dumps(item, default=legacy_decimal_default))
+
+
+def legacy_deserialize_item(item):
+    return json.loads(json.dumps(item), parse_float=Decimal)
+
+
+def make_post(blocks: int) -> dict:
+    """Build a blogpost item shaped like the ones stored by blogpost-create."""
+    content = []
+    for i in range(blocks):
+        if i % 10 == 0:
+            content.append({'title': f"Section {i // 10}"})
+        elif i % 7 == 0:
+            content.append({'image_url': f"https://bucket.s3.us-east-1.amazonaws.com/{i:08d}.jpg"})
+        else:
+            content.append({'paragraph': "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4})
+    return {
+        'slug': f"post-{blocks}",
+        'id': f"id-{blocks}",
+        'title': f"A post with {blocks} blocks",
+        'title_image_url': 'https://bucket.s3.us-east-1.amazonaws.com/title.jpg',
+        'summary': 'A brief summary of the blog post',
+        'content': content,
+        'date': '2024-01-01',
+        'author': 'John Doe',
+        'tags': ['tech', 'python', 'aws'],
+        'created_at': '2024-01-01T12:00:00.000000'
+    }
+
+
+def bench(func, arg, repeat: int) -> float:
+    """Best-of-5 time per call in microseconds."""
+    number = max(1, repeat)
+    return min(timeit.repeat(lambda: func(arg), number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=0, help='calls per timing run (default: scaled by size)')
+    args = parser.parse_args()
+    
+    codec = get_codec('blogpost')
+    generic = get_codec()
+    
+    print(f"{'blocks':>7} {'op':>6} {'legacy us':>11} {'generic us':>11} {'blogpost us':>12} {'speedup':>8}")
+    for blocks in BLOCK_COUNTS:
+        post = make_post(blocks)
+        repeat = args.repeat or max(1, 20000 // blocks)
+        
+        assert codec.decode(post) == legacy_serialize_item(post)
+        assert codec.encode(post) == legacy_deserialize_item(post)
+        
+        for op, legacy, fast, slow in [
+            ('decode', legacy_serialize_item, codec.decode, generic.decode),
+            ('encode', legacy_deserialize_item, codec.encode, generic.encode)
+        ]:
+            legacy_us = bench(legacy, post, repeat)
+            generic_us = bench(slow, post, repeat)
+            fast_us = bench(fast, post, repeat)
+            print(f"{blocks:>7} {op:>6} {legacy_us:>11.1f} {generic_us:>11.1f} {fast_us:>12.1f} {legacy_us / fast_us:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start import/init time of each Lambda function.
+
+Every run starts a fresh interpreter (like a new Lambda container) and
+imports the function's handler the way the runtime does. Two modes:
+
+  lazy   import handler only (current code: clients are created on first use)
+  eager  import handler, then build what the helpers used to build at import
+         time (boto3.resource('dynamodb') / boto3.client('s3'))
+
+Also reports the cumulative import time of the handler module from
+`python -X importtime`. No AWS calls are made; a region is set so clients
+can be constructed offline.
+
+Usage: python benchmarks/bench_cold_start.py [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+LAMBDA_DIR = os.path.join(BENCH_DIR, '..', 'src', 'lambda')
+
+# (function name, handler directory, utils group directory, service built at import before)
+FUNCTIONS = [
+    ('blogpost-create', 'blogpost/blogpost-create', 'blogpost', 'dynamodb'),
+    ('blogpost-get', 'blogpost/blogpost-get', 'blogpost', 'dynamodb'),
+    ('blogpost-list', 'blogpost/blogpost-list', 'blogpost', 'dynamodb'),
+    ('portfolio-create', 'portfolio/portfolio-create', 'portfolio', 'dynamodb'),
+    ('portfolio-get', 'portfolio/portfolio-get', 'portfolio', 'dynamodb'),
+    ('portfolio-list', 'portfolio/portfolio-list', 'portfolio', 'dynamodb'),
+    ('resume-create', 'resume/resume-create', 'resume', 'dynamodb'),
+    ('resume-list', 'resume/resume-list', 'resume', 'dynamodb'),
+    ('image-upload', 'image/image-upload', 'image', 's3'),
+]
+
+TIMED_INIT = """
+import time
+start = time.perf_counter()
+import handler
+{eager}
+print((time.perf_counter() - start) * 1000)
+"""
+
+EAGER_INIT = {
+    'dynamodb': "import boto3; boto3.resource('dynamodb')",
+    's3': "import boto3; boto3.client('s3')",
+}
+
+
+def _env(handler_dir: str, group_dir: str) -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [handler_dir, group_dir, env.get('PYTHONPATH')]))
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    env.setdefault('BUCKET_NAME', 'bench-bucket')
+    env.setdefault('SECRET_TOKEN', 'bench')
+    return env
+
+
+def init_ms(handler_dir: str, group_dir: str, eager: str) -> float:
+    """Time the handler import (plus eager client construction) in a fresh interpreter."""
+    code = TIMED_INIT.format(eager=eager)
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=handler_dir,
+        env=_env(handler_dir, group_dir),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def importtime_ms(handler_dir: str, group_dir: str) -> float:
+    """Cumulative import time of the handler module reported by -X importtime."""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import handler'],
+        cwd=handler_dir,
+        env=_env(handler_dir, group_dir),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    for line in output.stderr.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == 'handler':
+            return int(parts[1]) / 1000
+    return float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per measurement')
+    args = parser.parse_args()
+    
+    print(f"median of {args.runs} fresh interpreters, milliseconds")
+    print(f"{'function':<18} {'importtime':>10} {'lazy':>8} {'eager':>8} {'saved':>8}")
+    for name, handler_path, group, service in FUNCTIONS:
+        handler_dir = os.path.abspath(os.path.join(LAMBDA_DIR, handler_path))
+        group_dir = os.path.abspath(os.path.join(LAMBDA_DIR, group))
+        
+        imported = importtime_ms(handler_dir, group_dir)
+        lazy = statistics.median(init_ms(handler_dir, group_dir, '') for _ in range(args.runs))
+        eager = statistics.median(
+            init_ms(handler_dir, group_dir, EAGER_INIT[service]) for _ in range(args.runs)
+        )
+        print(f"{name:<18} {imported:>10.1f} {lazy:>8.1f} {eager:>8.1f} {eager - lazy:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark: response compression, bytes on the wire vs added latency.
+
+Encodes typical and worst-case responses (a short post, long posts up to
+the ~1 MB worst case, the unpaginated summary list) and compresses each body
+with gzip and brotli at several levels. For every setting it reports the
+compressed size, the time to compress and base64-encode it in the Lambda,
+and the estimated time to deliver it at a few client bandwidths
+(compression time + transfer time; API Gateway sends the decoded bytes).
+
+Post text is drawn from a fixed pseudo-random vocabulary so it compresses
+about as well as prose, not as well as repeated lorem ipsum.
+
+brotli is optional (pip install brotli); without it only gzip is measured.
+
+Usage: python benchmarks/bench_compression.py [--repeat N] [--bandwidth MBPS ...]
+"""
+import argparse
+import base64
+import gzip
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils import pipeline  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def make_vocabulary(rng: random.Random, size: int = 3000) -> list:
+    letters = 'etaoinshrdlcumwfgypbvkjxqz'
+    weights = [26 - i for i in range(len(letters))]
+    return [
+        ''.join(rng.choices(letters, weights, k=rng.randint(2, 10)))
+        for _ in range(size)
+    ]
+
+
+def make_text(rng: random.Random, vocabulary: list, words: int) -> str:
+    return ' '.join(rng.choice(vocabulary) for _ in range(words)).capitalize() + '.'
+
+
+def make_post(rng: random.Random, vocabulary: list, blocks: int) -> dict:
+    content = []
+    for i in range(blocks):
+        if i % 10 == 0:
+            content.append({'title': make_text(rng, vocabulary, 5)})
+        elif i % 10 == 5:
+            content.append({'image_url': f"https://bucket.s3.amazonaws.com/images/{rng.getrandbits(64):x}.jpg"})
+        else:
+            content.append({'paragraph': make_text(rng, vocabulary, 30)})
+    return {
+        'slug': 'a-long-post',
+        'id': 'post-1',
+        'title': make_text(rng, vocabulary, 6),
+        'title_image_url': 'https://bucket.s3.amazonaws.com/images/title.jpg',
+        'summary': make_text(rng, vocabulary, 25),
+        'date': '2024-01-01',
+        'author': 'John Doe',
+        'tags': ['python', 'aws', 'lambda'],
+        'content': content,
+        'created_at': '2024-01-01T00:00:00'
+    }
+
+
+def make_summaries(rng: random.Random, vocabulary: list, count: int) -> dict:
+    return {
+        'blogposts': [
+            {
+                'title_image_url': f"https://bucket.s3.amazonaws.com/images/{i}.jpg",
+                'slug': f"post-{i}",
+                'title': make_text(rng, vocabulary, 6),
+                'summary': make_text(rng, vocabulary, 25),
+                'author': 'John Doe',
+                'date': f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"
+            }
+            for i in range(count)
+        ],
+        'count': count
+    }
+
+
+def codecs() -> list:
+    settings = [('identity', None)]
+    settings += [(f"gzip-{level}", lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0))
+                 for level in (1, 6, 9)]
+    if brotli is not None:
+        settings += [(f"br-{quality}", lambda data, quality=quality: brotli.compress(
+            data, quality=quality, mode=brotli.MODE_TEXT))
+            for quality in (1, 4, 6, 11)]
+    return settings
+
+
+def best_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--bandwidth', type=float, nargs='+', default=[5, 50],
+                        help='client bandwidths in Mbit/s for the delivery estimate')
+    args = parser.parse_args()
+    
+    rng = random.Random(1)
+    vocabulary = make_vocabulary(rng)
+    payloads = [
+        ('post, 20 blocks', make_post(rng, vocabulary, 20)),
+        ('post, 200 blocks', make_post(rng, vocabulary, 200)),
+        ('post, 5000 blocks', make_post(rng, vocabulary, 5000)),
+        ('list, 500 posts', make_summaries(rng, vocabulary, 500)),
+    ]
+    if brotli is None:
+        print("brotli not installed; only gzip is measured")
+    
+    for label, data in payloads:
+        raw = pipeline.encode_json(data).encode('utf-8')
+        print(f"\n{label}: {len(raw) / 1024:.1f} KB")
+        header = f"  {'coding':<9} {'KB':>8} {'ratio':>6} {'cpu ms':>7}"
+        for mbps in args.bandwidth:
+            header += f" {f'@{mbps:g} Mbps ms':>14}"
+        print(header)
+        
+        for name, compress in codecs():
+            if compress is None:
+                size, cpu = len(raw), 0.0
+            else:
+                size = len(compress(raw))
+                cpu = best_ms(lambda: base64.b64encode(compress(raw)), args.repeat)
+            row = f"  {name:<9} {size / 1024:>8.1f} {len(raw) / size:>5.1f}x {cpu:>7.2f}"
+            for mbps in args.bandwidth:
+                row += f" {cpu + size * 8 / (mbps * 1e6) * 1000:>14.1f}"
+            print(row)
+    
+    # The pipeline path at the configured defaults
+    print(f"\ncompress_response defaults: codings {list(pipeline.COMPRESSORS)}, "
+          f"min {pipeline.COMPRESSION_MIN_BYTES} B, gzip {pipeline.GZIP_LEVEL}, br {pipeline.BROTLI_QUALITY}")
+    event = {'headers': {'accept-encoding': 'gzip, deflate, br'}}
+    for label, data in payloads:
+        response = pipeline.success_response(200, data)
+        ms = best_ms(lambda: pipeline.compress_response(event, response), args.repeat)
+        compressed = pipeline.compress_response(event, response)
+        size = len(base64.b64decode(compressed['body'])) if compressed.get('isBase64Encoded') else len(response['body'])
+        print(f"  {label:<18} {compressed['headers'].get('Content-Encoding', 'identity'):<9} "
+              f"{size / 1024:>8.1f} KB {ms:>7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: content-addressed image uploads (s3_helper.upload_content_addressed)
+vs random UUID keys, against the in-memory S3 stand-in.
+
+Replays --uploads uploads drawn from --distinct images of --size KB (a few
+images are uploaded over and over, as with shared logos and re-imported
+posts) with per-request latency and a throttled connection, and reports the
+objects and bytes stored, bytes written, S3 requests and total time of each
+scheme, plus the SHA-256 cost per MB that content addressing adds.
+
+Usage: python benchmarks/bench_dedup.py [--uploads N] [--distinct N] [--size KB]
+           [--mbps MB/S] [--latency MS]
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+import uuid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from fakes import FakeS3Client  # noqa: E402
+from utils import aws_clients, s3_helper  # noqa: E402
+
+BUCKET = 'bench-bucket'
+MB = 1024 * 1024
+
+
+def workload(uploads: int, distinct: int, size: int, seed: int = 11):
+    """Upload sequence with a skewed (Zipf-like) choice of images."""
+    rng = random.Random(seed)
+    images = [rng.randbytes(size) for _ in range(distinct)]
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return rng.choices(images, weights, k=uploads)
+
+
+def replay(images, content_addressed: bool, latency: float, mbps: float):
+    fake = FakeS3Client(latency=latency, bytes_per_second=mbps * MB, keep_bodies=False)
+    aws_clients.set_client('s3', fake)
+    written = 0
+    urls = set()
+    start = time.perf_counter()
+    for image in images:
+        if content_addressed:
+            stored = s3_helper.upload_content_addressed(image, BUCKET, '.jpg', 'image/jpeg')
+            written += 0 if stored['existing'] else len(image)
+            urls.add(stored['url'])
+        else:
+            urls.add(s3_helper.upload_image_to_s3(image, BUCKET, f"{uuid.uuid4()}.jpg", 'image/jpeg'))
+            written += len(image)
+    seconds = time.perf_counter() - start
+    stored_bytes = sum(item['Size'] for item in fake.objects.values())
+    return seconds, len(fake.objects), stored_bytes, written, dict(fake.calls), len(urls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--uploads', type=int, default=200, help='uploads replayed')
+    parser.add_argument('--distinct', type=int, default=40, help='distinct images among them')
+    parser.add_argument('--size', type=int, default=500, help='image size in KB')
+    parser.add_argument('--mbps', type=float, default=40.0, help='transfer rate of one request, MB/s')
+    parser.add_argument('--latency', type=float, default=15.0, help='ms per request')
+    args = parser.parse_args()
+    
+    images = workload(args.uploads, args.distinct, args.size * 1024)
+    print(f"{args.uploads} uploads of {len({hashlib.sha256(i).digest() for i in images})} distinct "
+          f"{args.size} KB images, {args.mbps:g} MB/s and {args.latency:g} ms per request\n")
+    print(f"{'keys':<18} {'objects':>8} {'stored MB':>10} {'written MB':>11} {'puts':>6} {'heads':>6} "
+          f"{'urls':>6} {'seconds':>8}")
+    for name, content_addressed in (('uuid', False), ('content hash', True)):
+        seconds, objects, stored, written, calls, urls = replay(images, content_addressed, args.latency / 1000, args.mbps)
+        print(f"{name:<18} {objects:>8} {stored / MB:>10.1f} {written / MB:>11.1f} {calls.get('put_object', 0):>6} "
+              f"{calls.get('head_object', 0):>6} {urls:>6} {seconds:>8.2f}")
+    
+    data = os.urandom(8 * MB)
+    start = time.perf_counter()
+    for _ in range(5):
+        s3_helper.content_hash(data)
+    per_mb = (time.perf_counter() - start) / 5 / 8
+    print(f"\nSHA-256: {per_mb * 1000:.2f} ms per MB ({1 / per_mb:.0f} MB/s)")
+
+
+if __name__ == '__main__':
+    main()
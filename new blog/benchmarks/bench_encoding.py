@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: response encoding per endpoint.
+
+Compares the old per-handler success_response (header dict rebuilt and
+json.dumps(data, default=str) on every call) with the shared pipeline's
+success_response using the stdlib encoder and, when installed, orjson.
+
+Usage: python benchmarks/bench_encoding.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils import pipeline  # noqa: E402
+
+
+def legacy_success_response(status_code, data):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json.dumps(data, default=str)
+    }
+
+
+def make_post(blocks: int) -> dict:
+    """A blogpost as returned by blogpost-get (after the codec: floats, lists)."""
+    content = []
+    for i in range(blocks):
+        if i % 10 == 0:
+            content.append({'title': f"Section {i // 10}"})
+        elif i % 10 == 5:
+            content.append({'image': f"https://bucket.s3.amazonaws.com/images/{i}.jpg"})
+        else:
+            content.append({'paragraph': "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4})
+    return {
+        'slug': 'a-long-post',
+        'id': 'post-1',
+        'title': 'A Long Post',
+        'title_image_url': 'https://bucket.s3.amazonaws.com/images/title.jpg',
+        'summary': 'A brief summary',
+        'date': '2024-01-01',
+        'author': 'John Doe',
+        'tags': ['python', 'aws', 'lambda'],
+        'content': content,
+        'created_at': '2024-01-01T00:00:00'
+    }
+
+
+def make_summaries(count: int) -> dict:
+    return {
+        'blogposts': [
+            {
+                'title_image_url': f"https://bucket.s3.amazonaws.com/images/{i}.jpg",
+                'slug': f"post-{i}",
+                'title': f"Post {i}",
+                'summary': 'A brief summary of the post',
+                'author': 'John Doe',
+                'date': f"2024-01-{i % 28 + 1:02d}"
+            }
+            for i in range(count)
+        ],
+        'count': count
+    }
+
+
+def make_resume(count: int) -> dict:
+    items = [
+        {
+            'id': f"exp-{i}",
+            'title': 'Software Engineer',
+            'company_name': f"Company {i}",
+            'image_url': f"https://bucket.s3.amazonaws.com/logos/{i}.png",
+            'start_month': '2020-01',
+            'end_month': '2022-06',
+            'description': 'Built things. ' * 20,
+            'created_at': '2024-01-01T00:00:00'
+        }
+        for i in range(count)
+    ]
+    return {'resume': items, 'count': count}
+
+
+PAYLOADS = [
+    ('blogpost-get', '100 blocks', make_post(100)),
+    ('blogpost-get', '1000 blocks', make_post(1000)),
+    ('blogpost-get', '5000 blocks', make_post(5000)),
+    ('portfolio-get', '1000 blocks', {**make_post(1000), 'updated_at': '2024-02-01T00:00:00'}),
+    ('blogpost-list', '500 posts', make_summaries(500)),
+    ('resume-list', '100 items', make_resume(100)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    encoders = [('stdlib', pipeline.stdlib_encode)]
+    orjson_encode = pipeline._orjson_encoder()
+    if orjson_encode is not None:
+        encoders.append(('orjson', orjson_encode))
+    else:
+        print("orjson not installed; only the stdlib encoder is measured")
+    
+    header = f"{'endpoint':<14} {'payload':<12} {'KB':>6} {'legacy us':>10}"
+    for name, _ in encoders:
+        header += f" {name + ' us':>10} {'speedup':>8}"
+    print(header)
+    
+    for endpoint, label, data in PAYLOADS:
+        size = len(json.dumps(data)) / 1024
+        number = max(1, int(2000 / max(size, 1)))
+        
+        def best(fn):
+            return min(timeit.repeat(lambda: fn(200, data), number=number, repeat=args.repeat)) / number * 1e6
+        
+        legacy = best(legacy_success_response)
+        row = f"{endpoint:<14} {label:<12} {size:>6.0f} {legacy:>10.1f}"
+        for _, encoder in encoders:
+            pipeline.set_encoder(encoder)
+            assert json.loads(pipeline.success_response(200, data)['body']) == data
+            current = best(pipeline.success_response)
+            row += f" {current:>10.1f} {legacy / current:>7.1f}x"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
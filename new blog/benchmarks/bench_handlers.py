@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: every lambda_handler against the in-memory AWS stand-ins.
+
+Seeds the fakes through the create handlers (so the summary, tag, date and
+list-version indexes are consistent), then drives each endpoint with
+synthetic API Gateway HTTP API (v2) events from a thread pool. Each handler
+is imported the way it is packaged (its group's utils copy) with fresh
+module state, so the first request pays the cold path (client creation,
+empty read cache) and is reported separately.
+
+Reports per endpoint and concurrency: throughput, p50/p95/p99 latency, the
+first request, errors (non-2xx/304), and the peak Python memory allocated
+by a single request (tracemalloc, measured in a separate sequential pass).
+
+Every DynamoDB/S3 call sleeps --latency ms; scans and queries return at most
+--page-size items per page.
+
+Usage: python benchmarks/bench_handlers.py [--posts N] [--requests N]
+           [--concurrency N ...] [--latency MS] [--endpoint NAME ...]
+"""
+import argparse
+import base64
+import contextlib
+import importlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+LAMBDA_DIR = os.path.join(BENCH_DIR, '..', 'src', 'lambda')
+sys.path.insert(0, BENCH_DIR)
+
+from fakes import FakeDynamoDBClient, FakeS3Client  # noqa: E402
+
+SECRET_TOKEN = 'bench-token'
+BUCKET = 'bench-bucket'
+TAGS = ['python', 'aws', 'lambda', 'dynamodb', 'terraform', 'react', 'devops', 'testing', 'design', 'career']
+
+os.environ.update({
+    'SECRET_TOKEN': SECRET_TOKEN,
+    'S3_BUCKET': BUCKET,
+    'CURSOR_SECRET': 'bench-cursor-secret',
+    'METRICS_SAMPLE_RATE': '0',
+    'AWS_DEFAULT_REGION': 'us-east-1'
+})
+
+
+def make_event(
+    route_key: str,
+    path: str,
+    body: Optional[Dict[str, Any]] = None,
+    query: Optional[Dict[str, str]] = None,
+    path_parameters: Optional[Dict[str, str]] = None,
+    admin: bool = False
+) -> Dict[str, Any]:
+    """Build an API Gateway HTTP API (v2) event as a browser request would produce."""
+    method = route_key.split(' ', 1)[0]
+    headers = {'accept-encoding': 'gzip, deflate, br', 'content-type': 'application/json'}
+    if admin:
+        headers['x-admin-token'] = SECRET_TOKEN
+    return {
+        'version': '2.0',
+        'routeKey': route_key,
+        'rawPath': path,
+        'rawQueryString': '&'.join(f"{k}={v}" for k, v in (query or {}).items()),
+        'headers': headers,
+        'queryStringParameters': query,
+        'pathParameters': path_parameters,
+        'requestContext': {
+            'http': {'method': method, 'path': path},
+            'requestId': f"{random.getrandbits(64):016x}",
+            'routeKey': route_key,
+            'stage': '$default'
+        },
+        'body': json.dumps(body) if body is not None else None,
+        'isBase64Encoded': False
+    }
+
+
+def paragraph(rng: random.Random, words: int = 40) -> str:
+    return ' '.join(rng.choice(TAGS + ['the', 'a', 'system', 'request', 'cache', 'index', 'page']) for _ in range(words))
+
+
+def make_post(rng: random.Random, slug: str, blocks: int) -> Dict[str, Any]:
+    content = []
+    for i in range(blocks):
+        if i % 10 == 0:
+            content.append({'title': paragraph(rng, 5)})
+        elif i % 10 == 5:
+            content.append({'image_url': f"https://{BUCKET}.s3.amazonaws.com/{rng.getrandbits(64):x}.jpg"})
+        else:
+            content.append({'paragraph': paragraph(rng)})
+    return {
+        'slug': slug,
+        'id': slug,
+        'title': paragraph(rng, 6),
+        'title_image_url': f"https://{BUCKET}.s3.amazonaws.com/{slug}.jpg",
+        'summary': paragraph(rng, 25),
+        'date': f"{rng.randint(2019, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        'author': 'Bench Author',
+        'tags': rng.sample(TAGS, 3),
+        'content': content
+    }
+
+
+def make_portfolio(rng: random.Random, slug: str, blocks: int) -> Dict[str, Any]:
+    post = make_post(rng, slug, blocks)
+    return {key: post[key] for key in ('id', 'slug', 'title', 'summary', 'content', 'title_image_url')}
+
+
+def make_experience(rng: random.Random, item_id: str) -> Dict[str, Any]:
+    start = rng.randint(2010, 2023)
+    return {
+        'id': item_id,
+        'title': 'Software Engineer',
+        'company_name': f"Company {item_id}",
+        'image_url': f"https://{BUCKET}.s3.amazonaws.com/logos/{item_id}.png",
+        'start_month': f"{start}-01",
+        'end_month': f"{start + 1}-06",
+        'description': paragraph(rng, 60)
+    }
+
+
+def load_handler(group: str, function: str, dynamodb: FakeDynamoDBClient, s3: FakeS3Client):
+    """Import a handler with its group's utils copy and fresh module state."""
+    for name in [name for name in sys.modules if name == 'handler' or name == 'utils' or name.startswith('utils.')]:
+        del sys.modules[name]
+    paths = [os.path.join(LAMBDA_DIR, group, function), os.path.join(LAMBDA_DIR, group)]
+    sys.path[:0] = paths
+    try:
+        handler = importlib.import_module('handler')
+        aws_clients = importlib.import_module('utils.aws_clients')
+    finally:
+        del sys.path[:len(paths)]
+    aws_clients.set_client('dynamodb', dynamodb)
+    aws_clients.set_client('s3', s3)
+    return handler.lambda_handler
+
+
+def seed(args, rng: random.Random, dynamodb: FakeDynamoDBClient, s3: FakeS3Client) -> Dict[str, List[str]]:
+    """Create the dataset through the create handlers; returns the keys created."""
+    keys = {'posts': [], 'portfolio': [], 'experience': []}
+    for group, function, kind, count, build, route_key in (
+        ('blogpost', 'blogpost-create', 'posts', args.posts,
+         lambda key: make_post(rng, key, args.blocks), 'POST /blogpost'),
+        ('portfolio', 'portfolio-create', 'portfolio', args.portfolio,
+         lambda key: make_portfolio(rng, key, args.blocks), 'POST /portfolio'),
+        ('resume', 'resume-create', 'experience', args.experience,
+         lambda key: make_experience(rng, key), 'POST /resume'),
+    ):
+        handler = load_handler(group, function, dynamodb, s3)
+        for i in range(count):
+            key = f"seed-{kind}-{i:05d}"
+            response = handler(make_event(route_key, route_key.split(' ')[1], build(key), admin=True), None)
+            if response['statusCode'] != 201:
+                raise RuntimeError(f"Seeding {kind} failed: {response['body']}")
+            keys[kind].append(key)
+    return keys
+
+
+def scenarios(args, rng: random.Random, keys: Dict[str, List[str]]) -> List[tuple]:
+    """(name, group, function, event factory) for every endpoint variant."""
+    image = base64.b64encode(os.urandom(args.image_kb * 1024)).decode('ascii')
+    counter = iter(range(10 ** 9))
+    
+    def get(route: str, kind: str):
+        def build():
+            slug = rng.choice(keys[kind])
+            return make_event(f"GET /{route}/{{slug}}", f"/{route}/{slug}", path_parameters={'slug': slug})
+        return build
+    
+    def listing(route: str, query: Optional[Callable[[], Dict[str, str]]] = None):
+        return lambda: make_event(f"GET /{route}", f"/{route}", query=query() if query else None)
+    
+    def create(route: str, build: Callable[[str], Dict[str, Any]]):
+        return lambda: make_event(f"POST /{route}", f"/{route}", build(f"bench-{next(counter):07d}"), admin=True)
+    
+    return [
+        ('blogpost-get', 'blogpost', 'blogpost-get', get('blogpost', 'posts')),
+        ('blogpost-list', 'blogpost', 'blogpost-list', listing('blogpost')),
+        ('blogpost-list?limit=20', 'blogpost', 'blogpost-list', listing('blogpost', lambda: {'limit': '20'})),
+        ('blogpost-list?tag', 'blogpost', 'blogpost-list', listing('blogpost', lambda: {'tag': rng.choice(TAGS)})),
+        ('blogpost-create', 'blogpost', 'blogpost-create',
+         create('blogpost', lambda key: make_post(rng, key, args.blocks))),
+        ('portfolio-get', 'portfolio', 'portfolio-get', get('portfolio', 'portfolio')),
+        ('portfolio-list', 'portfolio', 'portfolio-list', listing('portfolio')),
+        ('portfolio-create', 'portfolio', 'portfolio-create',
+         create('portfolio', lambda key: make_portfolio(rng, key, args.blocks))),
+        ('resume-list', 'resume', 'resume-list', listing('resume')),
+        ('resume-create', 'resume', 'resume-create', create('resume', lambda key: make_experience(rng, key))),
+        ('image-upload', 'image', 'image-upload', lambda: make_event(
+            'POST /image/upload', '/image/upload', {'imageBytes': image, 'imageFileExtension': '.jpg'}, admin=True
+        )),
+    ]
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def run_load(handler, build_event, requests: int, concurrency: int) -> Dict[str, Any]:
+    events = [build_event() for _ in range(requests)]
+    
+    def invoke(event):
+        start = time.perf_counter()
+        response = handler(event, None)
+        return (time.perf_counter() - start) * 1000, response['statusCode']
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(invoke, events))
+    elapsed = time.perf_counter() - start
+    latencies = [ms for ms, _ in results]
+    return {
+        'throughput': requests / elapsed,
+        'latencies': latencies,
+        'errors': sum(1 for _, status in results if status not in (200, 201, 304))
+    }
+
+
+def peak_memory_kb(handler, build_event, requests: int) -> float:
+    """Largest tracemalloc peak of a single request (sequential)."""
+    events = [build_event() for _ in range(requests)]
+    peaks = []
+    tracemalloc.start()
+    try:
+        for event in events:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            handler(event, None)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return max(peaks) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=200, help='blogposts in the dataset')
+    parser.add_argument('--portfolio', type=int, default=40, help='portfolio items in the dataset')
+    parser.add_argument('--experience', type=int, default=20, help='resume entries in the dataset')
+    parser.add_argument('--blocks', type=int, default=30, help='content blocks per post / portfolio item')
+    parser.add_argument('--image-kb', type=int, default=256, help='image upload size')
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint and concurrency level')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--latency', type=float, default=5.0, help='ms per DynamoDB/S3 call')
+    parser.add_argument('--page-size', type=int, default=100, help='items per scan/query page')
+    parser.add_argument('--endpoint', nargs='+', help='only these endpoints (names as printed)')
+    parser.add_argument('--memory-requests', type=int, default=20, help='requests in the tracemalloc pass (0 skips it)')
+    parser.add_argument('--no-cache', action='store_true', help='bypass the warm-container read cache')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    if args.no_cache:
+        os.environ['READ_CACHE_BYPASS'] = '1'
+    
+    rng = random.Random(args.seed)
+    dynamodb = FakeDynamoDBClient(page_size=args.page_size)
+    dynamodb.create_table('blogpost', 'slug', indexes={'date_index': ('list_pk', 'date_slug')})
+    dynamodb.create_table('portfolio', 'slug')
+    dynamodb.create_table('experience', 'id')
+    dynamodb.create_table('blogpost_index', 'pk', 'sk')
+    s3 = FakeS3Client()
+    
+    # Handlers print EMF lines and errors; keep the report readable
+    with open(os.devnull, 'w') as sink:
+        with contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            keys = seed(args, rng, dynamodb, s3)
+        print(f"seeded {args.posts} posts, {args.portfolio} portfolio items, {args.experience} resume entries "
+              f"({args.blocks} blocks) in {time.perf_counter() - start:.1f} s")
+        print(f"{args.latency:g} ms per AWS call, {args.page_size} items per page, "
+              f"read cache {'bypassed' if args.no_cache else 'on'}\n")
+        
+        dynamodb.latency = s3.latency = args.latency / 1000
+        print(f"{'endpoint':<24} {'conc':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'first ms':>9} {'peak KB':>8} {'errors':>6}")
+        for name, group, function, build_event in scenarios(args, rng, keys):
+            if args.endpoint and name not in args.endpoint:
+                continue
+            with contextlib.redirect_stdout(sink):
+                handler = load_handler(group, function, dynamodb, s3)
+                start = time.perf_counter()
+                handler(build_event(), None)
+                first = (time.perf_counter() - start) * 1000
+                results = [(concurrency, run_load(handler, build_event, args.requests, concurrency))
+                           for concurrency in args.concurrency]
+                peak = peak_memory_kb(handler, build_event, args.memory_requests) if args.memory_requests else None
+            for concurrency, result in results:
+                latencies = result['latencies']
+                print(f"{name:<24} {concurrency:>4} {result['throughput']:>8.0f} "
+                      f"{statistics.median(latencies):>8.1f} {percentile(latencies, 0.95):>8.1f} "
+                      f"{percentile(latencies, 0.99):>8.1f} {first:>9.1f} "
+                      f"{f'{peak:.0f}' if peak is not None else '-':>8} {result['errors']:>6}")
+
+
+if __name__ == '__main__':
+    main()
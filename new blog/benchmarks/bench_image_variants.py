@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: responsive image variants (utils/image_variants.py).
+
+Generates the configured widths and formats of an image (default: the
+playground's test photo) and reports, per variant, the time to make it on
+its own (decode, resize, encode) and its size against the original upload
+that pages load today, then the wall time of generating the whole set
+with 1 to --workers widths at a time (useful with more than one vCPU,
+i.e. functions of 1769 MB and up).
+
+Needs Pillow (AVIF needs a Pillow build with libavif, 11.2+ wheels have
+it); no AWS calls are made.
+
+Usage: python benchmarks/bench_image_variants.py [--image PATH] [--widths W,...]
+           [--formats F,...] [--workers N] [--repeat N]
+"""
+import argparse
+import mimetypes
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from utils import image_variants  # noqa: E402
+
+DEFAULT_IMAGE = os.path.join(BENCH_DIR, '..', 'playground', 'images', 'test.jpg')
+FORMAT_NAMES = {content_type: name for name, (_, content_type, _, _) in image_variants.FORMATS.items()}
+
+
+def best_time(function, repeat: int):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--image', default=DEFAULT_IMAGE, help='image file')
+    parser.add_argument('--widths', help='comma separated widths (default: IMAGE_VARIANT_WIDTHS)')
+    parser.add_argument('--formats', help='comma separated formats (default: IMAGE_VARIANT_FORMATS)')
+    parser.add_argument('--workers', type=int, default=4, help='largest number of widths encoded at a time')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement (best is reported)')
+    args = parser.parse_args()
+    
+    if not image_variants.available():
+        sys.exit('Pillow is not installed (pip install pillow)')
+    
+    with open(args.image, 'rb') as f:
+        data = f.read()
+    content_type = mimetypes.guess_type(args.image)[0] or 'image/jpeg'
+    widths = [int(width) for width in args.widths.split(',')] if args.widths else None
+    formats = args.formats.split(',') if args.formats else None
+    
+    variants = image_variants.generate_variants(data, content_type, widths, formats, 1)
+    if not variants:
+        sys.exit('No variants generated (animated image, or no usable formats)')
+    
+    print(f"{os.path.basename(args.image)}: {len(data) / 1024:.0f} KB {content_type}\n")
+    print(f"{'variant':<18} {'size':>10} {'ms':>8} {'vs original':>12}")
+    for variant in variants:
+        name = FORMAT_NAMES[variant.content_type]
+        seconds, _ = best_time(lambda: image_variants.generate_variants(
+            data, content_type, [variant.width], [name], 1
+        ), args.repeat)
+        saving = 1 - len(variant.body) / len(data)
+        print(f"{f'{variant.width}w {name}':<18} {len(variant.body) / 1024:>8.1f}KB {seconds * 1000:>8.1f} "
+              f"{saving:>11.1%}")
+    
+    print(f"\nfull set ({len(variants)} variants)")
+    print(f"{'workers':>7} {'seconds':>8} {'speedup':>8}")
+    baseline = None
+    for workers in sorted({1, 2, args.workers}):
+        seconds, _ = best_time(lambda: image_variants.generate_variants(data, content_type, widths, formats, workers), args.repeat)
+        baseline = baseline or seconds
+        print(f"{workers:>7} {seconds:>8.2f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
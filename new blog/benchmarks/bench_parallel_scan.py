@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential scan vs parallel segmented scan against an in-memory stand-in.
+
+Each scan page costs --latency seconds and returns at most --page-size items,
+so the sequential scan is latency-bound the same way a real 1 MB page loop is.
+
+Usage: python benchmarks/bench_parallel_scan.py [--items N] [--latency S] [--page-size N]
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from fakes import FakeDynamoDBClient  # noqa: E402
+from utils import aws_clients, dynamodb_helper  # noqa: E402
+from utils.codec import get_codec  # noqa: E402
+
+SEGMENT_COUNTS = [1, 2, 4, 8, 16]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=20000)
+    parser.add_argument('--latency', type=float, default=0.03, help='seconds per scan page')
+    parser.add_argument('--page-size', type=int, default=200, help='items per scan page')
+    args = parser.parse_args()
+    
+    fake = FakeDynamoDBClient(latency=args.latency, page_size=args.page_size)
+    fake.create_table('blogpost', 'slug')
+    codec = get_codec('blogpost')
+    fake.load('blogpost', (
+        codec.encode_wire({
+            'slug': f"post-{i:06d}",
+            'title': f"Post {i}",
+            'summary': 'A brief summary',
+            'date': '2024-01-01',
+            'content': [{'paragraph': 'Lorem ipsum dolor sit amet.'}] * 5
+        })
+        for i in range(args.items)
+    ))
+    aws_clients.set_client('dynamodb', fake)
+    
+    print(f"{args.items} items, {args.page_size} items/page, {args.latency * 1000:.0f} ms/page")
+    print(f"{'segments':>8} {'mode':>9} {'seconds':>8} {'items/s':>10} {'speedup':>8}")
+    baseline = None
+    for segments in SEGMENT_COUNTS:
+        for ordered in (True, False):
+            if segments == 1 and not ordered:
+                continue
+            start = time.perf_counter()
+            count = sum(len(page) for page in dynamodb_helper.parallel_scan_pages('blogpost', segments, ordered=ordered))
+            elapsed = time.perf_counter() - start
+            assert count == args.items, count
+            baseline = baseline or elapsed
+            mode = 'ordered' if ordered else 'unordered'
+            print(f"{segments:>8} {mode:>9} {elapsed:>8.2f} {count / elapsed:>10.0f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
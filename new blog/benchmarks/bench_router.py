@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Simulation: cold starts and tail latency, per-endpoint functions vs router.
+
+Replays a traffic trace against a model of Lambda's container reuse for
+both layouts:
+
+  functions  nine functions, each with its own pool of containers
+  router     one function (src/lambda/router) whose containers serve every route
+
+A request that finds no idle container in its function's pool starts a new
+one (cold start). Idle containers are reclaimed after a random idle time.
+Cold starts cost the runtime init plus the handler import; the first call
+that needs an AWS service in a container also pays for building its client
+(boto3 is loaded lazily). In router mode each endpoint module is imported on
+its first use in a container, and clients are shared by all endpoints.
+
+Import and client costs are measured in fresh interpreters from the code in
+src/ (--no-measure uses fixed estimates); warm latencies and the runtime
+init are parameters.
+
+The trace is either an access log (--log, CSV lines of
+"epoch_seconds,routeKey", e.g. from API Gateway access logs with
+$context.requestTimeEpoch and $context.routeKey) or synthetic sessions
+modelled on the frontend: each page fetches one endpoint (Home: GET /resume,
+Blog: GET /blogpost, BlogDetail: GET /blogpost/{slug}, Portfolio and
+PortfolioDetail), with a daily traffic cycle and a few admin writes a week.
+
+Usage: python benchmarks/bench_router.py [--days N] [--sessions-per-day N]
+           [--log FILE] [--no-measure] [--seed N]
+"""
+import argparse
+import csv
+import math
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, '..', 'src')
+LAMBDA_DIR = os.path.join(SRC_DIR, 'lambda')
+
+# endpoint -> (routeKey, handler directory, AWS service, warm latency ms)
+ENDPOINTS = {
+    'blogpost_create': ('POST /blogpost', 'blogpost/blogpost-create', 'dynamodb', 60.0),
+    'blogpost_batch_create': ('POST /blogpost/batch', 'blogpost/blogpost-batch-create', 'dynamodb', 400.0),
+    'blogpost_get': ('GET /blogpost/{slug}', 'blogpost/blogpost-get', 'dynamodb', 25.0),
+    'blogpost_list': ('GET /blogpost', 'blogpost/blogpost-list', 'dynamodb', 35.0),
+    'portfolio_create': ('POST /portfolio', 'portfolio/portfolio-create', 'dynamodb', 50.0),
+    'portfolio_get': ('GET /portfolio/{slug}', 'portfolio/portfolio-get', 'dynamodb', 25.0),
+    'portfolio_list': ('GET /portfolio', 'portfolio/portfolio-list', 'dynamodb', 35.0),
+    'resume_create': ('POST /resume', 'resume/resume-create', 'dynamodb', 50.0),
+    'resume_list': ('GET /resume', 'resume/resume-list', 'dynamodb', 35.0),
+    'image_upload': ('POST /image/upload', 'image/image-upload', 's3', 150.0),
+    'image_presign': ('POST /image/presign', 'image/image-presign', 'dynamodb', 30.0),
+    'image_finalize': ('POST /image/finalize', 'image/image-finalize', 'dynamodb', 40.0),
+}
+ROUTE_KEYS = {route_key: name for name, (route_key, _, _, _) in ENDPOINTS.items()}
+
+# Frontend pages: the endpoint each one fetches, how often a session starts
+# there, and where visitors go next
+PAGES = {
+    'home': ('resume_list', 0.45, {'blog': 0.4, 'portfolio': 0.3, 'post': 0.1}),
+    'blog': ('blogpost_list', 0.15, {'post': 0.7, 'home': 0.1}),
+    'post': ('blogpost_get', 0.30, {'blog': 0.35, 'post': 0.15, 'home': 0.1}),
+    'portfolio': ('portfolio_list', 0.05, {'project': 0.6, 'home': 0.1}),
+    'project': ('portfolio_get', 0.05, {'portfolio': 0.4, 'project': 0.2}),
+}
+
+# Fixed estimates used with --no-measure (ms)
+ESTIMATED_COSTS = {
+    'function_import': 45.0,
+    'router_import': 40.0,
+    'module_import': 3.0,
+    'client_first': 350.0,
+    'client_next': 40.0,
+}
+
+MEASURE_ENV = {'AWS_DEFAULT_REGION': 'us-east-1', 'BUCKET_NAME': 'bench-bucket', 'SECRET_TOKEN': 'bench'}
+
+TIMED = """
+import time, importlib
+{setup}
+start = time.perf_counter()
+{timed}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _run_ms(code: str, cwd: str, pythonpath: List[str], runs: int) -> float:
+    env = {**os.environ, **MEASURE_ENV, 'PYTHONPATH': os.pathsep.join(pythonpath)}
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', code], cwd=cwd, env=env,
+            capture_output=True, text=True, check=True
+        )
+        samples.append(float(output.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def build_router_package(target: str) -> None:
+    """Lay out the router package like terraform/package-lambdas.sh router."""
+    os.makedirs(os.path.join(target, 'functions'))
+    shutil.copy(os.path.join(LAMBDA_DIR, 'router', 'handler.py'), target)
+    shutil.copytree(os.path.join(SRC_DIR, 'utils'), os.path.join(target, 'utils'))
+    open(os.path.join(target, 'functions', '__init__.py'), 'w').close()
+    for name, (_, handler_path, _, _) in ENDPOINTS.items():
+        shutil.copy(os.path.join(LAMBDA_DIR, handler_path, 'handler.py'),
+                    os.path.join(target, 'functions', f"{name}.py"))
+
+
+def measure_costs(runs: int) -> Dict[str, object]:
+    """Measure import and client-construction costs in fresh interpreters."""
+    costs = {'function_import': {}, 'module_import': {}, 'client_first': {}, 'client_next': {}}
+    
+    for name, (_, handler_path, _, _) in ENDPOINTS.items():
+        handler_dir = os.path.abspath(os.path.join(LAMBDA_DIR, handler_path))
+        group_dir = os.path.dirname(handler_dir)
+        costs['function_import'][name] = _run_ms(
+            TIMED.format(setup='', timed='import handler'), handler_dir, [handler_dir, group_dir], runs
+        )
+    
+    with tempfile.TemporaryDirectory() as package:
+        build_router_package(package)
+        costs['router_import'] = _run_ms(TIMED.format(setup='', timed='import handler'), package, [package], runs)
+        for name in ENDPOINTS:
+            costs['module_import'][name] = _run_ms(
+                TIMED.format(setup='import handler', timed=f"importlib.import_module('functions.{name}')"),
+                package, [package], runs
+            )
+        for service, other in (('dynamodb', 's3'), ('s3', 'dynamodb')):
+            setup = 'from utils import aws_clients'
+            costs['client_first'][service] = _run_ms(
+                TIMED.format(setup=setup, timed=f"aws_clients.get_client('{service}')"), package, [package], runs
+            )
+            costs['client_next'][service] = _run_ms(
+                TIMED.format(setup=f"{setup}; aws_clients.get_client('{other}')",
+                             timed=f"aws_clients.get_client('{service}')"),
+                package, [package], runs
+            )
+    return costs
+
+
+def estimated_costs() -> Dict[str, object]:
+    return {
+        'function_import': {name: ESTIMATED_COSTS['function_import'] for name in ENDPOINTS},
+        'router_import': ESTIMATED_COSTS['router_import'],
+        'module_import': {name: ESTIMATED_COSTS['module_import'] for name in ENDPOINTS},
+        'client_first': {service: ESTIMATED_COSTS['client_first'] for service in ('dynamodb', 's3')},
+        'client_next': {service: ESTIMATED_COSTS['client_next'] for service in ('dynamodb', 's3')},
+    }
+
+
+def read_log(path: str) -> List[Tuple[float, str]]:
+    """Read "epoch_seconds,routeKey" lines; unknown routes are skipped."""
+    trace = []
+    with open(path, newline='') as handle:
+        for row in csv.reader(handle):
+            if len(row) < 2 or row[1].strip() not in ROUTE_KEYS:
+                continue
+            try:
+                trace.append((float(row[0]), ROUTE_KEYS[row[1].strip()]))
+            except ValueError:
+                continue
+    trace.sort()
+    if trace:
+        start = trace[0][0]
+        trace = [(t - start, name) for t, name in trace]
+    return trace
+
+
+def synthetic_trace(rng: random.Random, days: float, sessions_per_day: float) -> List[Tuple[float, str]]:
+    """Sessions following the frontend's pages, busier in the day than at night."""
+    duration = days * 86400
+    peak_rate = 2 * sessions_per_day / 86400
+    trace = []
+    
+    # Session starts: Poisson process with a daily cycle (thinning)
+    t = 0.0
+    while True:
+        t += rng.expovariate(peak_rate)
+        if t >= duration:
+            break
+        if rng.random() > 0.5 * (1 - math.cos(2 * math.pi * (t % 86400) / 86400)):
+            continue
+        pages = list(PAGES)
+        page = rng.choices(pages, [PAGES[p][1] for p in pages])[0]
+        view = t
+        while view < duration:
+            trace.append((view, PAGES[page][0]))
+            targets = PAGES[page][2]
+            roll = rng.random()
+            for target, probability in targets.items():
+                if roll < probability:
+                    page = target
+                    break
+                roll -= probability
+            else:
+                break
+            view += rng.expovariate(1 / 30.0)
+    
+    # Admin writes: a post with three images a week, a portfolio item and a
+    # resume entry every two weeks
+    for name, per_week in (('blogpost_create', 1), ('image_upload', 3), ('portfolio_create', 0.5),
+                           ('resume_create', 0.5)):
+        t = 0.0
+        while True:
+            t += rng.expovariate(per_week / (7 * 86400))
+            if t >= duration:
+                break
+            trace.append((t, name))
+    
+    trace.sort()
+    return trace
+
+
+class Container:
+    __slots__ = ('busy_until', 'expires_at', 'modules', 'services')
+    
+    def __init__(self):
+        self.busy_until = 0.0
+        self.expires_at = 0.0
+        self.modules = set()
+        self.services = set()
+
+
+def simulate(
+    trace: List[Tuple[float, str]],
+    mode: str,
+    costs: Dict[str, object],
+    runtime_init_ms: float,
+    idle_range: Tuple[float, float],
+    rng: random.Random
+) -> Dict[str, object]:
+    """Run the trace through one layout; returns latencies and cold-start counts."""
+    pools: Dict[str, List[Container]] = {}
+    latencies = {name: [] for name in ENDPOINTS}
+    cold = {name: 0 for name in ENDPOINTS}
+    containers = 0
+    
+    for t, name in trace:
+        function = 'router' if mode == 'router' else name
+        pool = pools.setdefault(function, [])
+        pool[:] = [c for c in pool if c.expires_at > t]
+        idle = [c for c in pool if c.busy_until <= t]
+        
+        latency = 0.0
+        if idle:
+            # Lambda tends to reuse the most recently used environment
+            container = max(idle, key=lambda c: c.busy_until)
+        else:
+            container = Container()
+            pool.append(container)
+            containers += 1
+            cold[name] += 1
+            latency += runtime_init_ms
+            latency += costs['router_import'] if mode == 'router' else costs['function_import'][name]
+        
+        if mode == 'router' and name not in container.modules:
+            latency += costs['module_import'][name]
+            container.modules.add(name)
+        
+        service = ENDPOINTS[name][2]
+        if service not in container.services:
+            key = 'client_next' if container.services else 'client_first'
+            latency += costs[key][service]
+            container.services.add(service)
+        
+        latency += ENDPOINTS[name][3] * rng.uniform(0.8, 1.4)
+        latencies[name].append(latency)
+        container.busy_until = t + latency / 1000
+        container.expires_at = container.busy_until + rng.uniform(*idle_range)
+    
+    return {'latencies': latencies, 'cold': cold, 'containers': containers}
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--days', type=float, default=14)
+    parser.add_argument('--sessions-per-day', type=float, default=150)
+    parser.add_argument('--log', help='CSV access log: epoch_seconds,routeKey')
+    parser.add_argument('--runtime-init-ms', type=float, default=200, help='runtime start before the handler import')
+    parser.add_argument('--idle-min', type=float, default=300, help='shortest idle time before reclaim, seconds')
+    parser.add_argument('--idle-max', type=float, default=900, help='longest idle time before reclaim, seconds')
+    parser.add_argument('--no-measure', action='store_true', help='use fixed import/client cost estimates')
+    parser.add_argument('--runs', type=int, default=3, help='fresh interpreters per measurement')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    if args.log:
+        trace = read_log(args.log)
+        source = args.log
+    else:
+        trace = synthetic_trace(rng, args.days, args.sessions_per_day)
+        source = f"synthetic, {args.days:g} days, {args.sessions_per_day:g} sessions/day"
+    if not trace:
+        sys.exit("empty trace")
+    
+    costs = estimated_costs() if args.no_measure else measure_costs(args.runs)
+    print(f"trace: {len(trace)} requests ({source})")
+    print(f"costs (ms): runtime init {args.runtime_init_ms:.0f}, router import {costs['router_import']:.1f}, "
+          f"dynamodb client {costs['client_first']['dynamodb']:.0f}, s3 client {costs['client_first']['s3']:.0f}")
+    
+    results = {
+        mode: simulate(trace, mode, costs, args.runtime_init_ms, (args.idle_min, args.idle_max),
+                       random.Random(args.seed))
+        for mode in ('functions', 'router')
+    }
+    
+    print(f"\n{'layout':<10} {'requests':>9} {'cold':>6} {'cold %':>7} {'containers':>10} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for mode, result in results.items():
+        everything = [value for values in result['latencies'].values() for value in values]
+        cold = sum(result['cold'].values())
+        print(f"{mode:<10} {len(everything):>9} {cold:>6} {cold / len(everything):>6.1%} {result['containers']:>10} "
+              f"{percentile(everything, 0.5):>8.0f} {percentile(everything, 0.95):>8.0f} "
+              f"{percentile(everything, 0.99):>8.0f} {max(everything):>8.0f}")
+    
+    print(f"\n{'endpoint':<17} {'requests':>9} {'cold % fn':>10} {'cold % rt':>10} {'p99 fn':>8} {'p99 rt':>8}")
+    for name in ENDPOINTS:
+        count = len(results['functions']['latencies'][name])
+        if not count:
+            continue
+        print(f"{name:<17} {count:>9} "
+              f"{results['functions']['cold'][name] / count:>9.1%} {results['router']['cold'][name] / count:>9.1%} "
+              f"{percentile(results['functions']['latencies'][name], 0.99):>8.0f} "
+              f"{percentile(results['router']['latencies'][name], 0.99):>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark and check: streaming multipart upload (s3_helper.upload_stream)
+vs a single put_object of the whole buffer, against the in-memory S3
+stand-in.
+
+Three parts:
+  checks     Objects from bytes, file objects and iterators of odd-sized
+             chunks, around and far above the threshold, are stored byte for
+             byte with the expected part count and S3 multipart ETag; a failed
+             part aborts the upload and stores nothing.
+  memory     Peak Python memory (tracemalloc) of uploading a --size MB object
+             generated on the fly, against the (workers + 2) parts bound, and
+             of the old way (the whole object in one buffer).
+  throughput Each request is limited to --mbps MB/s plus --latency ms, like
+             one connection; single PutObject vs 1-8 concurrent parts.
+
+Usage: python benchmarks/bench_s3_upload.py [--size MB] [--part-size MB]
+           [--mbps MB/S] [--latency MS]
+"""
+import argparse
+import hashlib
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from fakes import FakeS3Client  # noqa: E402
+from utils import aws_clients, s3_helper  # noqa: E402
+
+BUCKET = 'bench-bucket'
+MB = 1024 * 1024
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def generate(size: int, chunk_size: int, seed: int = 7):
+    """Yield size pseudo-random bytes in chunk_size pieces without holding them all."""
+    rng = random.Random(seed)
+    sent = 0
+    while sent < size:
+        chunk = rng.randbytes(min(chunk_size, size - sent))
+        sent += len(chunk)
+        yield chunk
+
+
+def expected_etag(data: bytes, part_size: int, threshold: int) -> str:
+    if len(data) <= threshold:
+        return f'"{hashlib.md5(data).hexdigest()}"'
+    digests = [hashlib.md5(data[i:i + part_size]).digest() for i in range(0, len(data), part_size)]
+    return f'"{hashlib.md5(b"".join(digests)).hexdigest()}-{len(digests)}"'
+
+
+def run_checks(part_size: int) -> None:
+    threshold = part_size
+    sources = {
+        'bytes': lambda data: data,
+        'file': lambda data: io.BytesIO(data),
+        'iterator': lambda data: (data[i:i + 65537] for i in range(0, len(data), 65537))
+    }
+    sizes = [0, 1000, threshold, threshold + 1, 3 * part_size, 5 * part_size + 12345]
+    checked = 0
+    for size in sizes:
+        data = b''.join(generate(size, MB, seed=size))
+        for name, make_source in sources.items():
+            fake = FakeS3Client(min_part_size=s3_helper.MIN_PART_SIZE)
+            aws_clients.set_client('s3', fake)
+            result = s3_helper.upload_stream(
+                make_source(data), BUCKET, 'check', 'image/gif',
+                part_size=part_size, threshold=threshold, max_workers=3
+            )
+            stored = fake.objects[(BUCKET, 'check')]
+            parts = 0 if size <= threshold else -(-size // part_size)
+            assert stored['Body'] == data, (size, name, 'body')
+            assert stored['ContentType'] == 'image/gif', (size, name, 'content type')
+            assert result.size == size and result.parts == parts, (size, name, result)
+            assert result.etag == stored['ETag'] == expected_etag(data, part_size, threshold), (size, name)
+            assert not fake.uploads, (size, name, 'upload left open')
+            checked += 1
+    
+    fake = FakeS3Client()
+    fake.fail_parts = {3}
+    aws_clients.set_client('s3', fake)
+    try:
+        s3_helper.upload_stream(generate(6 * part_size, MB), BUCKET, 'failed', part_size=part_size, threshold=0)
+    except Exception as e:
+        assert 'part 3' in str(e), e
+    else:
+        raise AssertionError('upload with a failing part succeeded')
+    assert not fake.uploads and (BUCKET, 'failed') not in fake.objects, 'failed upload not aborted'
+    assert fake.calls.get('abort_multipart_upload') == 1, fake.calls
+    print(f"checks: {checked} uploads stored correctly, failed part aborted the upload\n")
+
+
+def run_memory(size: int, part_size: int, mbps: float) -> None:
+    print(f"memory: {size // MB} MB object, {part_size // MB} MB parts")
+    print(f"{'method':<24} {'peak MB':>9} {'bound MB':>9}")
+    
+    aws_clients.set_client('s3', FakeS3Client(keep_bodies=False))
+    tracemalloc.start()
+    # The old way: the whole object is buffered, then sent in one request
+    data = bytearray()
+    for chunk in generate(size, MB):
+        data += chunk
+    s3_helper.get_s3_client().put_object(Bucket=BUCKET, Key='single', Body=data, ContentType='image/gif')
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del data
+    print(f"{'single put_object':<24} {peak / MB:>9.1f} {'-':>9}")
+    
+    for workers in (1, 4, 8):
+        # Throttled, so the pool really holds `workers` parts in flight
+        aws_clients.set_client('s3', FakeS3Client(bytes_per_second=mbps * MB, keep_bodies=False))
+        tracemalloc.start()
+        s3_helper.upload_stream(generate(size, MB), BUCKET, 'stream', part_size=part_size, threshold=part_size, max_workers=workers)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        bound = (workers + 2) * part_size
+        assert peak <= bound * 1.1, (workers, peak, bound)
+        print(f"{f'upload_stream, {workers} workers':<24} {peak / MB:>9.1f} {bound / MB:>9.1f}")
+    print()
+
+
+def run_throughput(size: int, part_size: int, mbps: float, latency: float) -> None:
+    print(f"throughput: {size // MB} MB object, {mbps:g} MB/s and {latency * 1000:g} ms per request")
+    print(f"{'method':<24} {'seconds':>8} {'MB/s':>8} {'speedup':>8}")
+    data = b''.join(generate(size, MB))
+    
+    aws_clients.set_client('s3', FakeS3Client(latency=latency, bytes_per_second=mbps * MB, keep_bodies=False))
+    result = s3_helper.upload_stream(data, BUCKET, 'single', threshold=size)
+    baseline = result.seconds
+    print(f"{'single put_object':<24} {result.seconds:>8.2f} {result.throughput / MB:>8.1f} {1.0:>7.1f}x")
+    
+    for workers in WORKER_COUNTS:
+        aws_clients.set_client('s3', FakeS3Client(latency=latency, bytes_per_second=mbps * MB, keep_bodies=False))
+        result = s3_helper.upload_stream(data, BUCKET, 'multi', part_size=part_size, threshold=0, max_workers=workers)
+        print(f"{f'multipart, {workers} workers':<24} {result.seconds:>8.2f} {result.throughput / MB:>8.1f} "
+              f"{baseline / result.seconds:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=96, help='object size in MB (memory and throughput)')
+    parser.add_argument('--part-size', type=int, default=8, help='part size in MB')
+    parser.add_argument('--mbps', type=float, default=40.0, help='transfer rate of one request, MB/s')
+    parser.add_argument('--latency', type=float, default=20.0, help='ms per request')
+    args = parser.parse_args()
+    
+    part_size = args.part_size * MB
+    start = time.perf_counter()
+    run_checks(part_size)
+    run_memory(args.size * MB, part_size, args.mbps)
+    run_throughput(args.size * MB, part_size, args.mbps, args.latency / 1000)
+    print(f"\n{time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
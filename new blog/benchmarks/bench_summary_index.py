@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Check and benchmark: rewriting the blogpost summary collection
+(utils/summary_index.py) when a change touches many shards.
+
+Builds a collection of --posts posts, then imports --import posts dated
+across the whole range, so nearly every shard changes: far more than one
+TransactWriteItems request can carry (100 actions, 4 MB; the fake
+enforces both). Checks that:
+
+  - the import is written in steps and the collection afterwards equals
+    the blogpost table, shard hashes matching HEAD;
+  - while HEAD is stale (here: a step that fails half-way) readers get no
+    collection, so GET /blogpost scans, and the next write rebuilds it;
+  - a small change still takes one transaction.
+
+Reports the shards rewritten, transactions and time of each write.
+
+Usage: python benchmarks/bench_summary_index.py [--posts N] [--import N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_handlers import make_post  # noqa: E402
+from fakes import FakeClientError, FakeDynamoDBClient  # noqa: E402
+from utils import aws_clients, summary_index  # noqa: E402
+from utils.dynamodb_helper import BLOGPOST_TABLE, batch_write_items  # noqa: E402
+
+
+def fresh_tables() -> FakeDynamoDBClient:
+    dynamodb = FakeDynamoDBClient()
+    dynamodb.create_table('blogpost', 'slug', indexes={'date_index': ('list_pk', 'date_slug')})
+    dynamodb.create_table('blogpost_index', 'pk', 'sk')
+    aws_clients.set_client('dynamodb', dynamodb)
+    return dynamodb
+
+
+def store_posts(posts) -> None:
+    batch_write_items(BLOGPOST_TABLE, items=posts)
+
+
+def expected(posts):
+    return sorted((summary_index.summarize(post) for post in posts), key=summary_index._sort_key)
+
+
+def timed_write(dynamodb: FakeDynamoDBClient, label: str, write) -> None:
+    before = dynamodb.calls.get('transact_write_items', 0)
+    start = time.perf_counter()
+    write()
+    seconds = time.perf_counter() - start
+    head = summary_index._read_partition(consistent=True)['head']
+    print(f"{label:<34} {len(head['shard_hashes']):>7} {dynamodb.calls['transact_write_items'] - before:>13} "
+          f"{seconds:>8.2f}")
+
+
+def check_collection(posts) -> None:
+    state = summary_index._read_partition(consistent=True)
+    assert not state['head'].get('stale'), 'HEAD left stale'
+    assert sorted(state['shards']) == [summary_index._shard_sort_key(i) for i in range(len(state['head']['shard_hashes']))]
+    assert summary_index.read_summaries(use_cache=False) == expected(posts), 'collection differs from the table'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=6000, help='posts in the collection before the import')
+    parser.add_argument('--import', dest='imported', type=int, default=6000, help='posts imported at once')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    posts = [make_post(rng, f"post-{i:06d}", 0) for i in range(args.posts + args.imported + 1)]
+    existing, imported, single = posts[:args.posts], posts[args.posts:-1], posts[-1]
+    
+    print(f"{'write':<34} {'shards':>7} {'transactions':>13} {'seconds':>8}")
+    dynamodb = fresh_tables()
+    store_posts(existing)
+    timed_write(dynamodb, f"build ({args.posts} posts)", summary_index.rebuild_summaries)
+    check_collection(existing)
+    
+    store_posts(imported)
+    timed_write(dynamodb, f"batch import of {args.imported}", lambda: summary_index.batch_upsert_summaries(imported))
+    check_collection(existing + imported)
+    
+    store_posts([single])
+    timed_write(dynamodb, "one post", lambda: summary_index.upsert_summary(single))
+    check_collection(posts)
+    
+    # A stepped write that fails after marking HEAD stale
+    dynamodb = fresh_tables()
+    store_posts(existing)
+    summary_index.rebuild_summaries()
+    store_posts(imported)
+    transact = dynamodb.transact_write_items
+    steps = []
+    
+    def failing(TransactItems, **kwargs):
+        steps.append(len(TransactItems))
+        if len(steps) == 3:
+            raise FakeClientError('InternalServerError', 'injected failure')
+        return transact(TransactItems=TransactItems, **kwargs)
+    
+    dynamodb.transact_write_items = failing
+    try:
+        summary_index.batch_upsert_summaries(imported)
+    except FakeClientError:
+        pass
+    else:
+        raise AssertionError('injected failure did not surface')
+    dynamodb.transact_write_items = transact
+    assert summary_index._read_partition(consistent=True)['head'].get('stale'), 'HEAD not stale after a failed step'
+    assert summary_index.read_summaries(use_cache=False) is None, 'stale collection served'
+    
+    store_posts([single])
+    summary_index.upsert_summary(single)
+    check_collection(posts)
+    print("\nchecks: stepped write matches the table; a failed step leaves HEAD stale (scan), the next write rebuilds")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory of decoding and storing a base64 image upload
+(POST /image/upload), the old way vs pipeline.decode_upload_body.
+
+Old: the whole body is parsed with json.loads (after base64-decoding the
+envelope to text when isBase64Encoded is set), the imageBytes string is
+decoded with base64.b64decode and the bytes are uploaded. New: the body is
+read in chunks, imageBytes is decoded into a spooled temporary file
+(UPLOAD_SPOOL_MAX_BYTES in memory, then /tmp) and the file is streamed to
+the S3 stand-in. Both get the same event, built before measuring (the
+runtime holds it either way); peak Python memory is traced with
+tracemalloc and the stored object's size and MD5 are checked.
+
+Usage: python benchmarks/bench_upload_memory.py [--sizes KB,...] [--repeat N]
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from fakes import FakeS3Client  # noqa: E402
+from utils import aws_clients, s3_helper  # noqa: E402
+from utils.pipeline import decode_body, decode_upload_body  # noqa: E402
+
+BUCKET = 'bench-bucket'
+MB = 1024 * 1024
+
+
+def old_upload(event):
+    body = decode_body(event)
+    image = base64.b64decode(body['imageBytes'])
+    return s3_helper.upload_stream(image, BUCKET, 'old.jpg', 'image/jpeg')
+
+
+def new_upload(event):
+    body, image = decode_upload_body(event, 'imageBytes')
+    with image:
+        return s3_helper.upload_stream(image, BUCKET, 'new.jpg', 'image/jpeg')
+
+
+def measure(upload, event, repeat: int):
+    """Best time and peak bytes of an upload over repeat runs; the last fake client."""
+    best_seconds = best_peak = None
+    for _ in range(repeat):
+        # Objects keep only size and ETag, so storing them adds nothing
+        fake = FakeS3Client(keep_bodies=False)
+        aws_clients.set_client('s3', fake)
+        tracemalloc.start()
+        start = time.perf_counter()
+        upload(event)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+        best_peak = peak if best_peak is None else min(best_peak, peak)
+    return best_seconds, best_peak, fake
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='100,1024,2048,4096', help='image sizes in KB, comma separated')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement (best is reported)')
+    args = parser.parse_args()
+    
+    print(f"{'image':>8} {'envelope':<9} {'path':<5} {'peak MB':>8} {'x image':>8} {'ms':>8}")
+    for size in (int(size) * 1024 for size in args.sizes.split(',')):
+        image = os.urandom(size)
+        etag = f'"{hashlib.md5(image).hexdigest()}"'
+        text = json.dumps({'imageBytes': base64.b64encode(image).decode('ascii'), 'imageFileExtension': '.jpg'})
+        for encoded in (False, True):
+            event = {
+                'body': base64.b64encode(text.encode('utf-8')).decode('ascii') if encoded else text,
+                'isBase64Encoded': encoded
+            }
+            for path, upload in (('old', old_upload), ('new', new_upload)):
+                seconds, peak, fake = measure(upload, event, args.repeat)
+                stored = fake.objects[(BUCKET, f'{path}.jpg')]
+                assert stored['Size'] == size and stored['ETag'] == etag, (size, encoded, path)
+                print(f"{size // 1024:>6}KB {'base64' if encoded else 'text':<9} {path:<5} {peak / MB:>8.2f} "
+                      f"{peak / size:>7.2f}x {seconds * 1000:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
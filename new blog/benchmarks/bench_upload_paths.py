@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Image upload benchmark: base64 through Lambda (POST /image/upload) vs
+direct-to-S3 (POST /image/presign, PUT to S3, POST /image/finalize).
+
+For each image size, drives the handlers against the in-memory fakes
+(fakes.py) and reports the Lambda time and peak Python memory (tracemalloc)
+of the request(s) each path makes, the bytes that pass through Lambda and
+the modelled upload time as the client sees it: the request body over the
+client link (--uplink Mbit/s) plus, for the legacy path, the Lambda-to-S3
+copy (--s3-mbps). Bodies over 6 MB are rejected by Lambda before the
+handler runs; those rows are marked. With Pillow installed, finalize also
+downloads the original from S3 to encode variants; its peak memory stays at
+the download spool (a few MB) whatever the size, and that copy is not
+counted as bytes through Lambda (the client's request bodies).
+
+Usage: python benchmarks/bench_upload_paths.py [--sizes KB,...] [--uplink MBIT]
+           [--s3-mbps MBIT] [--repeat N]
+"""
+import argparse
+import base64
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_handlers import load_handler, make_event  # noqa: E402
+from fakes import FakeDynamoDBClient, FakeS3Client  # noqa: E402
+
+# Lambda's synchronous invocation payload limit
+LAMBDA_PAYLOAD_LIMIT = 6 * 1024 * 1024
+
+
+def measure(handler, event):
+    """Run one request; return (seconds, peak bytes, response)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = handler(event, None)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, response
+
+
+def legacy_upload(image: bytes, s3: FakeS3Client):
+    handler = load_handler('image', 'image-upload', FakeDynamoDBClient(), s3)
+    event = make_event('POST /image/upload', '/image/upload', {
+        'imageBytes': base64.b64encode(image).decode('ascii'),
+        'imageFileExtension': '.jpg'
+    }, admin=True)
+    seconds, peak, response = measure(handler, event)
+    if response['statusCode'] != 200:
+        raise RuntimeError(f"Upload failed: {response['body']}")
+    return seconds, peak, len(event['body'])
+
+
+def direct_upload(image: bytes, s3: FakeS3Client):
+    dynamodb = FakeDynamoDBClient()
+    dynamodb.create_table('image_upload', 'id')
+    presign = load_handler('image', 'image-presign', dynamodb, s3)
+    finalize = load_handler('image', 'image-finalize', dynamodb, s3)
+    
+    event = make_event('POST /image/presign', '/image/presign', {'contentType': 'image/jpeg', 'size': len(image)}, admin=True)
+    presign_seconds, presign_peak, response = measure(presign, event)
+    if response['statusCode'] != 200:
+        raise RuntimeError(f"Presign failed: {response['body']}")
+    upload = json.loads(response['body'])
+    through_lambda = len(event['body'])
+    
+    # The client's PUT, straight to the bucket
+    key = upload['imageUrl'].rsplit('/', 1)[1]
+    s3.put_object(Bucket=os.environ['S3_BUCKET'], Key=key, Body=image, ContentType='image/jpeg')
+    
+    event = make_event('POST /image/finalize', '/image/finalize', {'uploadId': upload['uploadId']}, admin=True)
+    finalize_seconds, finalize_peak, response = measure(finalize, event)
+    if response['statusCode'] != 200:
+        raise RuntimeError(f"Finalize failed: {response['body']}")
+    through_lambda += len(event['body'])
+    return presign_seconds + finalize_seconds, max(presign_peak, finalize_peak), through_lambda
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='100,1024,4096,8192', help='image sizes in KB, comma separated')
+    parser.add_argument('--uplink', type=float, default=10.0, help='client upload bandwidth, Mbit/s')
+    parser.add_argument('--s3-mbps', type=float, default=500.0, help='Lambda-to-S3 bandwidth, Mbit/s')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per size (best is reported)')
+    args = parser.parse_args()
+    
+    uplink = args.uplink * 1e6 / 8
+    s3_link = args.s3_mbps * 1e6 / 8
+    sizes = [int(size) * 1024 for size in args.sizes.split(',')]
+    
+    print(f"client uplink {args.uplink:g} Mbit/s, Lambda to S3 {args.s3_mbps:g} Mbit/s, best of {args.repeat}\n")
+    print(f"{'size':>8} {'path':<10} {'lambda ms':>10} {'peak MB':>9} {'via lambda':>11} {'client s':>9}")
+    for size in sizes:
+        image = os.urandom(size)
+        rows = {'base64': [], 'direct': []}
+        # Handlers print EMF lines; keep the report readable
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            for _ in range(args.repeat):
+                rows['base64'].append(legacy_upload(image, FakeS3Client()))
+                rows['direct'].append(direct_upload(image, FakeS3Client()))
+        
+        for path, runs in rows.items():
+            seconds = min(run[0] for run in runs)
+            peak = min(run[1] for run in runs)
+            through_lambda = runs[0][2]
+            if path == 'base64':
+                client = through_lambda / uplink + size / s3_link + seconds
+            else:
+                client = (through_lambda + size) / uplink + seconds
+            note = ' (over 6 MB: rejected)' if through_lambda > LAMBDA_PAYLOAD_LIMIT else ''
+            print(f"{size // 1024:>6}KB {path:<10} {seconds * 1000:>10.2f} {peak / 1e6:>9.2f} "
+                  f"{through_lambda / 1e6:>9.2f}MB {client:>9.2f}{note}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: request validation of posts with many content blocks.
+
+Compares the old hand-written validate_blogpost (if-chain, allowed-field set
+rebuilt per call, next(iter(...)) per block, stops at the first error) with
+the compiled schema validator in utils/validation.py, stopping at the first
+error and collecting every error, for valid posts of 10 to 20,000 blocks,
+a post with an error in its last block, and a batch of posts through
+validate_many. Also checks that both report the same first error.
+
+Usage: python benchmarks/bench_validation.py [--repeat N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.validation import validate_blogpost  # noqa: E402
+
+
+def legacy_validate_blogpost(data):
+    """The hand-written validator from blogpost-create (before the schema engine)."""
+    required_fields = ['slug', 'id', 'title', 'content', 'date', 'author', 'tags']
+    for field in required_fields:
+        if field not in data:
+            return False, f"Missing required field: {field}"
+    if not isinstance(data['slug'], str) or not data['slug'].strip():
+        return False, "slug must be a non-empty string"
+    if not isinstance(data['id'], str) or not data['id'].strip():
+        return False, "id must be a non-empty string"
+    if not isinstance(data['title'], str) or not data['title'].strip():
+        return False, "title must be a non-empty string"
+    if 'title_image_url' in data and not isinstance(data['title_image_url'], str):
+        return False, "title_image_url must be a string"
+    if 'summary' in data and not isinstance(data['summary'], str):
+        return False, "summary must be a string"
+    if not isinstance(data['content'], list):
+        return False, "content must be a list"
+    allowed_fields = {'paragraph', 'image_url', 'title'}
+    for idx, content_item in enumerate(data['content']):
+        if not isinstance(content_item, dict):
+            return False, f"content item at index {idx} must be an object"
+        if len(content_item) != 1:
+            return False, f"content item at index {idx} must have exactly one field"
+        key, value = next(iter(content_item.items()))
+        if key not in allowed_fields:
+            return False, (f"content item at index {idx}: field name '{key}' is not allowed. "
+                           f"Must be one of: paragraph, image_url, or title")
+        if not isinstance(value, str):
+            return False, f"content item at index {idx}: {key} must be a string"
+    if not isinstance(data['date'], str) or not data['date'].strip():
+        return False, "date must be a non-empty string"
+    if not isinstance(data['author'], str) or not data['author'].strip():
+        return False, "author must be a non-empty string"
+    if not isinstance(data['tags'], list):
+        return False, "tags must be a list"
+    for tag_idx, tag in enumerate(data['tags']):
+        if not isinstance(tag, str):
+            return False, f"tag at index {tag_idx} must be a string"
+    return True, None
+
+
+def make_post(blocks: int, slug: str = 'a-long-post') -> dict:
+    content = []
+    for i in range(blocks):
+        if i % 10 == 0:
+            content.append({'title': f"Section {i // 10}"})
+        elif i % 10 == 5:
+            content.append({'image_url': f"https://bucket.s3.amazonaws.com/images/{i}.jpg"})
+        else:
+            content.append({'paragraph': "Lorem ipsum dolor sit amet, consectetur adipiscing elit."})
+    return {
+        'slug': slug,
+        'id': slug,
+        'title': 'A Long Post',
+        'title_image_url': 'https://bucket.s3.amazonaws.com/images/title.jpg',
+        'summary': 'A brief summary',
+        'date': '2024-01-01',
+        'author': 'John Doe',
+        'tags': ['python', 'aws', 'lambda'],
+        'content': content
+    }
+
+
+INVALID_CASES = [
+    {'slug': 'x'},
+    {**make_post(3), 'slug': '  '},
+    {**make_post(3), 'summary': 5},
+    {**make_post(3), 'content': 'text'},
+    {**make_post(3), 'content': [{'paragraph': 'a'}, 'b']},
+    {**make_post(3), 'content': [{'paragraph': 'a', 'title': 'b'}]},
+    {**make_post(3), 'content': [{'video': 'a'}]},
+    {**make_post(3), 'content': [{'title': 1}]},
+    {**make_post(3), 'date': ''},
+    {**make_post(3), 'tags': 'python'},
+    {**make_post(3), 'tags': ['a', 2]},
+]
+
+
+def best_us(fn, repeat: int) -> float:
+    number = 1
+    while True:
+        elapsed = timeit.timeit(fn, number=number)
+        if elapsed > 0.05 or number >= 100000:
+            break
+        number *= 4
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    for case in INVALID_CASES:
+        assert validate_blogpost(case) == legacy_validate_blogpost(case), (case, validate_blogpost(case))
+    print(f"first errors match the old validator on {len(INVALID_CASES)} invalid posts\n")
+    
+    print(f"{'payload':<28} {'legacy us':>10} {'first us':>10} {'speedup':>8} {'all us':>10} {'errors':>7}")
+    payloads = [(f"valid, {blocks} blocks", make_post(blocks)) for blocks in (10, 1000, 5000, 20000)]
+    broken = make_post(5000)
+    broken['content'][-1] = {'video': 'x'}
+    payloads.append(('last block invalid, 5000', broken))
+    many_broken = make_post(5000)
+    many_broken['content'][::50] = [{'title': 1}] * len(many_broken['content'][::50])
+    payloads.append(('every 50th invalid, 5000', many_broken))
+    
+    for label, post in payloads:
+        legacy = best_us(lambda: legacy_validate_blogpost(post), args.repeat)
+        first = best_us(lambda: validate_blogpost(post), args.repeat)
+        collect = best_us(lambda: validate_blogpost.errors(post), args.repeat)
+        print(f"{label:<28} {legacy:>10.1f} {first:>10.1f} {legacy / first:>7.1f}x {collect:>10.1f} "
+              f"{len(validate_blogpost.errors(post)):>7}")
+    
+    batch = [make_post(1000, slug=f"post-{i}") for i in range(100)]
+    for i in range(0, 100, 10):
+        batch[i] = {**batch[i], 'tags': 'oops'}
+    legacy = best_us(lambda: [legacy_validate_blogpost(post) for post in batch], args.repeat)
+    many = best_us(lambda: validate_blogpost.validate_many(batch), args.repeat)
+    invalid = validate_blogpost.validate_many(batch)
+    print(f"\nbatch of 100 x 1000 blocks ({len(invalid)} invalid): legacy loop {legacy / 1000:.2f} ms, "
+          f"validate_many {many / 1000:.2f} ms ({legacy / many:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
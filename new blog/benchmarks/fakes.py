@@ -0,0 +1,618 @@
+"""
+In-process stand-ins for the AWS APIs used by the helpers.
+
+The fakes speak the low-level client wire format (AttributeValues) so they
+can be swapped in for the real boto3 clients in benchmarks. Every call can
+sleep for an injected latency (time.sleep releases the GIL, so concurrent
+callers overlap like real network I/O), and scans/queries return at most
+page_size items per page to mimic DynamoDB's 1 MB page limit.
+
+FakeDynamoDBClient covers the operations the helpers issue: get/put/update/
+delete_item, scan (with segments), query (tables and GSIs, the key
+conditions the helpers build), batch_get/batch_write_item and
+transact_write_items. ProjectionExpression is applied to top-level
+attributes; put/transact conditions support attribute_exists,
+attribute_not_exists and equality; updates support SET and REMOVE.
+FakeS3Client stores put_object and multipart upload bodies in memory, with
+an optional transfer rate, and returns placeholder presigned URLs and POST
+policies. Unsupported
+expressions raise NotImplementedError rather than returning wrong results.
+"""
+import bisect
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+import zlib
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, Any, List, Optional, Tuple
+
+_SORT_MAX = '\U0010ffff'
+
+_KEY_CONDITION = re.compile(r'^\s*(\S+)\s*=\s*(:\w+)\s*(?:AND\s+(.+?))?\s*$', re.IGNORECASE)
+_BETWEEN = re.compile(r'^(\S+)\s+BETWEEN\s+(:\w+)\s+AND\s+(:\w+)$', re.IGNORECASE)
+_BEGINS_WITH = re.compile(r'^begins_with\(\s*(\S+?)\s*,\s*(:\w+)\s*\)$', re.IGNORECASE)
+_COMPARISON = re.compile(r'^(\S+)\s*(=|<=|>=|<|>)\s*(:\w+)$')
+_FUNCTION_CONDITION = re.compile(r'^(attribute_exists|attribute_not_exists)\(\s*(\S+?)\s*\)$')
+_ASSIGNMENT = re.compile(r'^(\S+)\s*=\s*(:\w+)$')
+_UPDATE_CLAUSES = re.compile(r'^\s*SET\s+(.+?)(?:\s+ADD\s+(.+?))?(?:\s+REMOVE\s+(.+?))?\s*$', re.IGNORECASE)
+_ADDITION = re.compile(r'^(\S+)\s+(:\w+)$')
+
+
+class FakeClientError(Exception):
+    """Error with a botocore ClientError-style response (the helpers read response['Error']['Code'])."""
+    
+    def __init__(self, code: str, message: str = ''):
+        super().__init__(f"{code}: {message}" if message else code)
+        self.response = {'Error': {'Code': code, 'Message': message}}
+
+
+def _key_string(attribute: Dict[str, Any]) -> str:
+    (value,) = attribute.values()
+    return str(value)
+
+
+def _sort_value(attribute: Dict[str, Any]):
+    """Order AttributeValues like DynamoDB: numbers numerically, strings by code point."""
+    if 'N' in attribute:
+        return Decimal(attribute['N'])
+    (value,) = attribute.values()
+    return value
+
+
+def _name(token: str, names: Optional[Dict[str, str]]) -> str:
+    return (names or {}).get(token, token)
+
+
+def _project(item: Dict[str, Any], expression: Optional[str], names: Optional[Dict[str, str]]) -> Dict[str, Any]:
+    """Apply a ProjectionExpression (top-level attributes of each path)."""
+    if not expression:
+        return item
+    keep = set()
+    for path in expression.split(','):
+        top = re.split(r'[.\[]', path.strip(), maxsplit=1)[0]
+        keep.add(_name(top, names))
+    return {name: value for name, value in item.items() if name in keep}
+
+
+def _check_condition(
+    item: Optional[Dict[str, Any]],
+    expression: Optional[str],
+    names: Optional[Dict[str, str]],
+    values: Optional[Dict[str, Any]]
+) -> bool:
+    if not expression:
+        return True
+    for part in re.split(r'\s+AND\s+', expression.strip(), flags=re.IGNORECASE):
+        function = _FUNCTION_CONDITION.match(part)
+        comparison = _COMPARISON.match(part)
+        if function:
+            exists = item is not None and _name(function.group(2), names) in item
+            if exists != (function.group(1) == 'attribute_exists'):
+                return False
+        elif comparison and comparison.group(2) == '=':
+            if item is None or item.get(_name(comparison.group(1), names)) != values[comparison.group(3)]:
+                return False
+        else:
+            raise NotImplementedError(f"Condition not supported by the fake: {part}")
+    return True
+
+
+class FakeDynamoDBClient:
+    """Minimal DynamoDB low-level client backed by dicts."""
+    
+    def __init__(self, latency: float = 0.0, page_size: int = 1000):
+        self.latency = latency
+        self.page_size = page_size
+        self.tables = {}
+        self.calls = {}
+        self._lock = threading.Lock()
+    
+    def create_table(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        indexes: Optional[Dict[str, Tuple[str, Optional[str]]]] = None
+    ) -> None:
+        """Register a table, its key schema and its GSIs ({name: (hash_key, range_key)})."""
+        self.tables[table_name] = {
+            'hash_key': hash_key,
+            'range_key': range_key,
+            'indexes': dict(indexes or {}),
+            'items': {},
+            'segments': {},
+            'partitions': {}
+        }
+    
+    def _call(self, operation: str) -> None:
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+    
+    def _key(self, table: Dict[str, Any], item: Dict[str, Any]) -> tuple:
+        key = (_key_string(item[table['hash_key']]),)
+        if table['range_key']:
+            key += (_key_string(item[table['range_key']]),)
+        return key
+    
+    def _key_attributes(self, table: Dict[str, Any], item: Dict[str, Any], index: Optional[str] = None) -> Dict[str, Any]:
+        names = [table['hash_key'], table['range_key']]
+        if index:
+            names += list(table['indexes'][index])
+        return {name: item[name] for name in names if name}
+    
+    def _changed(self, table: Dict[str, Any]) -> None:
+        table['segments'].clear()
+        table['partitions'].clear()
+    
+    def _put(self, table: Dict[str, Any], item: Dict[str, Any]) -> None:
+        table['items'][self._key(table, item)] = item
+        self._changed(table)
+    
+    def _delete(self, table: Dict[str, Any], key: Dict[str, Any]) -> None:
+        table['items'].pop(self._key(table, key), None)
+        self._changed(table)
+    
+    def load(self, table_name: str, items) -> None:
+        """Bulk-load wire-format items without latency or call counting."""
+        table = self.tables[table_name]
+        for item in items:
+            table['items'][self._key(table, item)] = item
+        self._changed(table)
+    
+    def put_item(
+        self,
+        TableName: str,
+        Item: Dict[str, Any],
+        ConditionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        self._call('put_item')
+        table = self.tables[TableName]
+        with self._lock:
+            existing = table['items'].get(self._key(table, Item))
+            if not _check_condition(existing, ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues):
+                raise FakeClientError('ConditionalCheckFailedException', 'The conditional request failed')
+            self._put(table, Item)
+        return {}
+    
+    def get_item(
+        self,
+        TableName: str,
+        Key: Dict[str, Any],
+        ProjectionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        self._call('get_item')
+        table = self.tables[TableName]
+        item = table['items'].get(self._key(table, Key))
+        if item is None:
+            return {}
+        return {'Item': _project(item, ProjectionExpression, ExpressionAttributeNames)}
+    
+    def _apply_update(
+        self,
+        table: Dict[str, Any],
+        key: Dict[str, Any],
+        expression: str,
+        names: Optional[Dict[str, str]],
+        values: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        clauses = _UPDATE_CLAUSES.match(expression)
+        if not clauses:
+            raise NotImplementedError(f"Update not supported by the fake: {expression}")
+        item = dict(table['items'].get(self._key(table, key)) or key)
+        for part in clauses.group(1).split(','):
+            assignment = _ASSIGNMENT.match(part.strip())
+            if not assignment:
+                raise NotImplementedError(f"Update not supported by the fake: {part}")
+            item[_name(assignment.group(1), names)] = values[assignment.group(2)]
+        for part in (clauses.group(2) or '').split(','):
+            if not part.strip():
+                continue
+            addition = _ADDITION.match(part.strip())
+            if not addition or 'N' not in values[addition.group(2)]:
+                raise NotImplementedError(f"Update not supported by the fake: {part}")
+            name = _name(addition.group(1), names)
+            total = Decimal(item.get(name, {'N': '0'})['N']) + Decimal(values[addition.group(2)]['N'])
+            item[name] = {'N': str(total)}
+        for name in (clauses.group(3) or '').split(','):
+            if name.strip():
+                item.pop(_name(name.strip(), names), None)
+        self._put(table, item)
+        return item
+    
+    def update_item(
+        self,
+        TableName: str,
+        Key: Dict[str, Any],
+        UpdateExpression: str,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ConditionExpression: Optional[str] = None,
+        ReturnValues: str = 'NONE',
+        **kwargs
+    ) -> Dict[str, Any]:
+        self._call('update_item')
+        table = self.tables[TableName]
+        with self._lock:
+            existing = table['items'].get(self._key(table, Key))
+            if not _check_condition(existing, ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues):
+                raise FakeClientError('ConditionalCheckFailedException', 'The conditional request failed')
+            item = self._apply_update(table, Key, UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues)
+        return {'Attributes': item} if ReturnValues == 'ALL_NEW' else {}
+    
+    def delete_item(self, TableName: str, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._call('delete_item')
+        with self._lock:
+            self._delete(self.tables[TableName], Key)
+        return {}
+    
+    def _segment_keys(self, table: Dict[str, Any], segment: int, total: int) -> list:
+        """Sorted keys of one scan segment (cached until the next write)."""
+        with self._lock:
+            keys = table['segments'].get((segment, total))
+            if keys is None:
+                keys = sorted(
+                    key for key in table['items']
+                    if zlib.crc32(key[0].encode('utf-8')) % total == segment
+                )
+                table['segments'][(segment, total)] = keys
+            return keys
+    
+    def scan(
+        self,
+        TableName: str,
+        Segment: int = 0,
+        TotalSegments: int = 1,
+        ExclusiveStartKey: Optional[Dict[str, Any]] = None,
+        Limit: Optional[int] = None,
+        ProjectionExpression: Optional[str] = None,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        FilterExpression: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        if FilterExpression:
+            raise NotImplementedError("FilterExpression is not supported by the fake")
+        self._call('scan')
+        table = self.tables[TableName]
+        keys = self._segment_keys(table, Segment, TotalSegments)
+        start = 0
+        if ExclusiveStartKey:
+            start = bisect.bisect_right(keys, self._key(table, ExclusiveStartKey))
+        
+        limit = min(Limit or self.page_size, self.page_size)
+        page = keys[start:start + limit]
+        response = {
+            'Items': [_project(table['items'][key], ProjectionExpression, ExpressionAttributeNames) for key in page],
+            'Count': len(page)
+        }
+        if start + limit < len(keys):
+            response['LastEvaluatedKey'] = self._key_attributes(table, table['items'][page[-1]])
+        return response
+    
+    def _partition(self, table: Dict[str, Any], index: Optional[str], hash_value: str) -> list:
+        """(sort value, table key) of a partition's items, sorted (cached until the next write)."""
+        hash_key, range_key = table['indexes'][index] if index else (table['hash_key'], table['range_key'])
+        with self._lock:
+            entries = table['partitions'].get((index, hash_value))
+            if entries is None:
+                entries = sorted(
+                    (_sort_value(item[range_key]) if range_key else '', key)
+                    for key, item in table['items'].items()
+                    if hash_key in item and _key_string(item[hash_key]) == hash_value
+                    and (not range_key or range_key in item)
+                )
+                table['partitions'][(index, hash_value)] = entries
+            return entries
+    
+    def query(
+        self,
+        TableName: str,
+        KeyConditionExpression: str,
+        ExpressionAttributeValues: Dict[str, Any],
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        IndexName: Optional[str] = None,
+        ScanIndexForward: bool = True,
+        ExclusiveStartKey: Optional[Dict[str, Any]] = None,
+        Limit: Optional[int] = None,
+        ProjectionExpression: Optional[str] = None,
+        FilterExpression: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        if FilterExpression:
+            raise NotImplementedError("FilterExpression is not supported by the fake")
+        self._call('query')
+        table = self.tables[TableName]
+        range_key = table['indexes'][IndexName][1] if IndexName else table['range_key']
+        condition = _KEY_CONDITION.match(KeyConditionExpression)
+        if not condition:
+            raise NotImplementedError(f"Key condition not supported by the fake: {KeyConditionExpression}")
+        entries = self._partition(table, IndexName, _key_string(ExpressionAttributeValues[condition.group(2)]))
+        sort_values = [entry[0] for entry in entries]
+        
+        low, high = 0, len(entries)
+        range_condition = condition.group(3)
+        if range_condition:
+            value = lambda token: _sort_value(ExpressionAttributeValues[token])  # noqa: E731
+            between = _BETWEEN.match(range_condition)
+            begins_with = _BEGINS_WITH.match(range_condition)
+            comparison = _COMPARISON.match(range_condition)
+            if between:
+                low = bisect.bisect_left(sort_values, value(between.group(2)))
+                high = bisect.bisect_right(sort_values, value(between.group(3)))
+            elif begins_with:
+                prefix = value(begins_with.group(2))
+                low = bisect.bisect_left(sort_values, prefix)
+                high = bisect.bisect_left(sort_values, prefix + _SORT_MAX)
+            elif comparison:
+                operator, bound = comparison.group(2), value(comparison.group(3))
+                if operator in ('=', '>=', '>'):
+                    low = (bisect.bisect_right if operator == '>' else bisect.bisect_left)(sort_values, bound)
+                if operator in ('=', '<=', '<'):
+                    high = (bisect.bisect_left if operator == '<' else bisect.bisect_right)(sort_values, bound)
+            else:
+                raise NotImplementedError(f"Key condition not supported by the fake: {range_condition}")
+        
+        if ExclusiveStartKey:
+            start = (_sort_value(ExclusiveStartKey[range_key]) if range_key else '', self._key(table, ExclusiveStartKey))
+            if ScanIndexForward:
+                low = max(low, bisect.bisect_right(entries, start))
+            else:
+                high = min(high, bisect.bisect_left(entries, start))
+        
+        limit = min(Limit or self.page_size, self.page_size)
+        if ScanIndexForward:
+            page = entries[low:min(high, low + limit)]
+            more = low + limit < high
+        else:
+            page = entries[max(low, high - limit):high][::-1]
+            more = high - limit > low
+        items = [table['items'][key] for _, key in page]
+        response = {
+            'Items': [_project(item, ProjectionExpression, ExpressionAttributeNames) for item in items],
+            'Count': len(items)
+        }
+        if more and items:
+            response['LastEvaluatedKey'] = self._key_attributes(table, items[-1], IndexName)
+        return response
+    
+    def batch_get_item(self, RequestItems: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        self._call('batch_get_item')
+        responses = {}
+        for table_name, request in RequestItems.items():
+            table = self.tables[table_name]
+            responses[table_name] = [
+                _project(item, request.get('ProjectionExpression'), request.get('ExpressionAttributeNames'))
+                for item in (table['items'].get(self._key(table, key)) for key in request['Keys'])
+                if item is not None
+            ]
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+    
+    def batch_write_item(self, RequestItems: Dict[str, List[Dict[str, Any]]], **kwargs) -> Dict[str, Any]:
+        self._call('batch_write_item')
+        with self._lock:
+            for table_name, requests in RequestItems.items():
+                table = self.tables[table_name]
+                for request in requests:
+                    if 'PutRequest' in request:
+                        self._put(table, request['PutRequest']['Item'])
+                    else:
+                        self._delete(table, request['DeleteRequest']['Key'])
+        return {'UnprocessedItems': {}}
+    
+    def transact_write_items(self, TransactItems: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        self._call('transact_write_items')
+        if len(TransactItems) > 100:
+            raise FakeClientError('ValidationException', 'Member must have length less than or equal to 100')
+        # The 4 MB request limit, measured on the wire JSON (an overestimate)
+        if len(json.dumps(TransactItems, separators=(',', ':'))) > 4 * 1024 * 1024:
+            raise FakeClientError('ValidationException', 'Transaction request cannot be larger than 4 MB')
+        with self._lock:
+            actions = []
+            for action in TransactItems:
+                ((kind, spec),) = action.items()
+                table = self.tables[spec['TableName']]
+                key = spec['Item'] if kind == 'Put' else spec['Key']
+                existing = table['items'].get(self._key(table, key))
+                if not _check_condition(existing, spec.get('ConditionExpression'),
+                                        spec.get('ExpressionAttributeNames'), spec.get('ExpressionAttributeValues')):
+                    raise FakeClientError('TransactionCanceledException', 'Transaction cancelled (ConditionalCheckFailed)')
+                actions.append((kind, spec, table))
+            for kind, spec, table in actions:
+                if kind == 'Put':
+                    self._put(table, spec['Item'])
+                elif kind == 'Delete':
+                    self._delete(table, spec['Key'])
+                elif kind == 'Update':
+                    self._apply_update(table, spec['Key'], spec['UpdateExpression'],
+                                       spec.get('ExpressionAttributeNames'), spec.get('ExpressionAttributeValues'))
+        return {}
+
+
+class FakeS3Client:
+    """
+    Minimal S3 low-level client backed by a dict of bytes.
+    
+    bytes_per_second is the rate of one request, so concurrent part uploads
+    add up like parallel connections. With keep_bodies=False objects keep
+    only their size and ETag (memory measurements of large uploads).
+    Part numbers in fail_parts fail their UploadPart.
+    """
+    
+    # Read size of file bodies passed to put_object
+    STREAM_CHUNK_SIZE = 64 * 1024
+    
+    def __init__(
+        self,
+        latency: float = 0.0,
+        bytes_per_second: Optional[float] = None,
+        region_name: str = 'us-east-1',
+        keep_bodies: bool = True,
+        min_part_size: int = 5 * 1024 * 1024
+    ):
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+        self.meta = SimpleNamespace(region_name=region_name)
+        self.keep_bodies = keep_bodies
+        self.min_part_size = min_part_size
+        self.fail_parts = set()
+        self.objects = {}
+        self.uploads = {}
+        self.calls = {}
+        self._lock = threading.Lock()
+    
+    def _call(self, operation: str, size: int = 0) -> None:
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+        delay = self.latency + (size / self.bytes_per_second if self.bytes_per_second else 0.0)
+        if delay:
+            time.sleep(delay)
+    
+    def put_object(self, Bucket: str, Key: str, Body=b'', ContentType: str = 'binary/octet-stream', **kwargs) -> Dict[str, Any]:
+        if hasattr(Body, 'read'):
+            # Like botocore, send file bodies in chunks instead of reading them whole
+            digest = hashlib.md5()
+            chunks = []
+            size = 0
+            for chunk in iter(lambda: Body.read(self.STREAM_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                size += len(chunk)
+                if self.keep_bodies:
+                    chunks.append(chunk)
+            data = b''.join(chunks)
+        else:
+            data = Body.encode('utf-8') if isinstance(Body, str) else Body
+            digest = hashlib.md5(data)
+            size = len(data)
+        self._call('put_object', size)
+        etag = f'"{digest.hexdigest()}"'
+        self._store(Bucket, Key, bytes(data) if self.keep_bodies else b'', size, ContentType, etag, kwargs)
+        return {'ETag': etag}
+    
+    def _store(self, bucket: str, key: str, body: bytes, size: int, content_type: str, etag: str, params) -> None:
+        with self._lock:
+            self.objects[(bucket, key)] = {
+                'Body': body, 'Size': size, 'ContentType': content_type, 'ETag': etag,
+                'Metadata': params.get('Metadata', {}), 'CacheControl': params.get('CacheControl')
+            }
+    
+    def create_multipart_upload(
+        self, Bucket: str, Key: str, ContentType: str = 'binary/octet-stream', **kwargs
+    ) -> Dict[str, Any]:
+        self._call('create_multipart_upload')
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        with self._lock:
+            self.uploads[upload_id] = {
+                'Bucket': Bucket, 'Key': Key, 'ContentType': ContentType, 'Params': kwargs, 'Parts': {}
+            }
+        return {'Bucket': Bucket, 'Key': Key, 'UploadId': upload_id}
+    
+    def _upload(self, upload_id: str) -> Dict[str, Any]:
+        upload = self.uploads.get(upload_id)
+        if upload is None:
+            raise FakeClientError('NoSuchUpload', 'The specified upload does not exist.')
+        return upload
+    
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body=b'', **kwargs) -> Dict[str, Any]:
+        data = Body.read() if hasattr(Body, 'read') else Body
+        self._call('upload_part', len(data))
+        if PartNumber in self.fail_parts:
+            raise FakeClientError('InternalError', f"Injected failure of part {PartNumber}")
+        upload = self._upload(UploadId)
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        with self._lock:
+            upload['Parts'][PartNumber] = {
+                'Body': bytes(data) if self.keep_bodies else b'', 'Size': len(data), 'ETag': etag
+            }
+        return {'ETag': etag}
+    
+    def complete_multipart_upload(
+        self, Bucket: str, Key: str, UploadId: str, MultipartUpload: Dict[str, Any], **kwargs
+    ) -> Dict[str, Any]:
+        self._call('complete_multipart_upload')
+        upload = self._upload(UploadId)
+        listed = MultipartUpload.get('Parts', [])
+        numbers = [part['PartNumber'] for part in listed]
+        if not listed or numbers != sorted(set(numbers)):
+            raise FakeClientError('InvalidPartOrder', 'Parts must be listed in ascending order.')
+        parts = []
+        for part in listed:
+            stored = upload['Parts'].get(part['PartNumber'])
+            if stored is None or stored['ETag'] != part['ETag']:
+                raise FakeClientError('InvalidPart', f"Part {part['PartNumber']} was not uploaded.")
+            parts.append(stored)
+        if any(part['Size'] < self.min_part_size for part in parts[:-1]):
+            raise FakeClientError('EntityTooSmall', 'A part is smaller than the minimum allowed size.')
+        
+        # S3's multipart ETag: MD5 of the part MD5s, then the part count
+        digests = b''.join(bytes.fromhex(part['ETag'].strip('"')) for part in parts)
+        etag = f'"{hashlib.md5(digests).hexdigest()}-{len(parts)}"'
+        body = b''.join(part['Body'] for part in parts)
+        self._store(Bucket, Key, body, sum(part['Size'] for part in parts), upload['ContentType'], etag, upload['Params'])
+        with self._lock:
+            del self.uploads[UploadId]
+        return {'Bucket': Bucket, 'Key': Key, 'ETag': etag}
+    
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **kwargs) -> Dict[str, Any]:
+        self._call('abort_multipart_upload')
+        with self._lock:
+            if self.uploads.pop(UploadId, None) is None:
+                raise FakeClientError('NoSuchUpload', 'The specified upload does not exist.')
+        return {}
+    
+    def _object(self, bucket: str, key: str) -> Dict[str, Any]:
+        stored = self.objects.get((bucket, key))
+        if stored is None:
+            raise FakeClientError('NoSuchKey', 'The specified key does not exist.')
+        return stored
+    
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        self._call('head_object')
+        if (Bucket, Key) not in self.objects:
+            # HEAD responses have no body, so S3 reports just the status
+            raise FakeClientError('404', 'Not Found')
+        stored = self._object(Bucket, Key)
+        return {'ContentLength': stored['Size'], 'ContentType': stored['ContentType'], 'ETag': stored['ETag']}
+    
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        stored = self._object(Bucket, Key)
+        self._call('get_object', stored['Size'])
+        return {
+            'Body': io.BytesIO(stored['Body']),
+            'ContentLength': stored['Size'],
+            'ContentType': stored['ContentType'],
+            'ETag': stored['ETag']
+        }
+    
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        self._call('delete_object')
+        with self._lock:
+            self.objects.pop((Bucket, Key), None)
+        return {}
+    
+    def generate_presigned_url(self, ClientMethod: str, Params: Dict[str, Any], ExpiresIn: int = 3600, **kwargs) -> str:
+        # No request is made; the URL only has to look like one
+        return (f"https://{Params['Bucket']}.s3.{self.meta.region_name}.amazonaws.com/{Params['Key']}"
+                f"?X-Amz-Expires={ExpiresIn}&X-Amz-Signature=fake")
+    
+    def generate_presigned_post(
+        self,
+        Bucket: str,
+        Key: str,
+        Fields: Optional[Dict[str, Any]] = None,
+        Conditions: Optional[list] = None,
+        ExpiresIn: int = 3600
+    ) -> Dict[str, Any]:
+        return {
+            'url': f"https://{Bucket}.s3.{self.meta.region_name}.amazonaws.com/",
+            'fields': {**(Fields or {}), 'key': Key, 'policy': 'fake', 'x-amz-signature': 'fake'}
+        }
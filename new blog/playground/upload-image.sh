@@ -1,6 +1,6 @@
 #!/bin/bash
 
-# Script to upload an image to S3 via the API
+# Script to upload an image to S3 via the API (presigned direct upload)
 # Supports JPG, JPEG, and PNG formats
 # Usage: ./upload-image.sh <image-file> [extension]
 # Example: ./upload-image.sh images/test.jpg .jpg
@@ -64,38 +64,72 @@ if [[ ! " ${VALID_EXTENSIONS[@]} " =~ " ${EXTENSION} " ]]; then
     exit 1
 fi
 
+# Content type the upload is signed for
+if [ "${EXTENSION}" = ".png" ]; then
+    CONTENT_TYPE="image/png"
+else
+    CONTENT_TYPE="image/jpeg"
+fi
+
+# File size in bytes (macOS compatible)
+IMAGE_SIZE=$(wc -c < "${IMAGE_FILE}" | tr -d ' ')
+
 echo "📤 Uploading image: ${IMAGE_FILE}"
-echo "📎 Extension: ${EXTENSION}"
+echo "📎 Extension: ${EXTENSION} (${CONTENT_TYPE}, ${IMAGE_SIZE} bytes)"
 
-# Convert image to base64 (macOS compatible)
-echo "🔄 Encoding image to base64..."
-if ! IMAGE_BASE64=$(base64 -i "${IMAGE_FILE}" 2>/dev/null | tr -d '\n'); then
-    echo "❌ Error: Failed to encode image to base64"
+# Step 1: ask the API for a presigned upload URL
+echo "🔑 Requesting upload URL..."
+echo "   URL: ${API_BASE_URL}/image/presign"
+if ! RESPONSE=$(curl -s -w "\n%{http_code}" -X POST \
+    "${API_BASE_URL}/image/presign" \
+    -H "Content-Type: application/json" \
+    -H "x-admin-token: ${ADMIN_TOKEN}" \
+    -d "{\"contentType\": \"${CONTENT_TYPE}\", \"size\": ${IMAGE_SIZE}}" \
+    --max-time 30 \
+    --connect-timeout 10); then
+    echo "❌ Error: Failed to connect to API"
     exit 1
 fi
 
-# Create temporary file for JSON payload to avoid "Argument list too long" error
-TEMP_JSON=$(mktemp)
-trap "rm -f ${TEMP_JSON}" EXIT
-
-# Create JSON payload in temp file
-echo "📝 Creating JSON payload..."
-cat > "${TEMP_JSON}" <<EOF
-{
-  "imageBytes": "${IMAGE_BASE64}",
-  "imageFileExtension": "${EXTENSION}"
-}
-EOF
-
-# Make API call using file input
-echo "🌐 Sending request to API..."
-echo "   URL: ${API_BASE_URL}/image/upload"
+HTTP_CODE=$(echo "${RESPONSE}" | tail -n1)
+BODY=$(echo "${RESPONSE}" | sed '$d')
+
+if [ "${HTTP_CODE}" -ne 200 ]; then
+    echo ""
+    echo "Status Code: ${HTTP_CODE}"
+    echo "${BODY}" | python3 -m json.tool 2>/dev/null || echo "${BODY}"
+    echo "❌ Could not start upload"
+    exit 1
+fi
+
+UPLOAD_ID=$(echo "${BODY}" | python3 -c "import sys, json; print(json.load(sys.stdin)['uploadId'])")
+UPLOAD_URL=$(echo "${BODY}" | python3 -c "import sys, json; print(json.load(sys.stdin)['url'])")
+
+# Step 2: send the file straight to S3 (no base64, nothing through Lambda)
+echo "🌐 Uploading to S3..."
+if ! S3_CODE=$(curl -s -o /dev/null -w "%{http_code}" -X PUT \
+    "${UPLOAD_URL}" \
+    -H "Content-Type: ${CONTENT_TYPE}" \
+    --upload-file "${IMAGE_FILE}" \
+    --max-time 300 \
+    --connect-timeout 10); then
+    echo "❌ Error: Failed to connect to S3"
+    exit 1
+fi
+
+if [ "${S3_CODE}" -ne 200 ]; then
+    echo "❌ S3 rejected the upload (status ${S3_CODE})"
+    exit 1
+fi
+
+# Step 3: record the upload
+echo "📝 Finalizing upload..."
 if ! RESPONSE=$(curl -s -w "\n%{http_code}" -X POST \
-    "${API_BASE_URL}/image/upload" \
+    "${API_BASE_URL}/image/finalize" \
     -H "Content-Type: application/json" \
     -H "x-admin-token: ${ADMIN_TOKEN}" \
-    -d "@${TEMP_JSON}" \
-    --max-time 60 \
+    -d "{\"uploadId\": \"${UPLOAD_ID}\"}" \
+    --max-time 30 \
     --connect-timeout 10); then
     echo "❌ Error: Failed to connect to API"
     exit 1
@@ -124,4 +158,3 @@ else
     echo "❌ Upload failed"
     exit 1
 fi
-
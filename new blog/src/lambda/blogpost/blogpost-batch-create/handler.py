@@ -0,0 +1,186 @@
+import os
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+
+from utils.dynamodb_helper import (
+    BLOGPOST_TABLE,
+    batch_get_items,
+    batch_write_items
+)
+from utils.etag import ETAG_ATTRIBUTE, content_etag
+from utils.summary_index import date_index_attributes, update_post_indexes
+from utils.validation import format_errors, validate_blogpost
+from utils.pipeline import (
+    Request,
+    decode_records,
+    error_response,
+    run_pipeline,
+    success_response
+)
+
+# Largest accepted batch; bigger imports are split by the client (the
+# request body is also capped at 6 MB by Lambda)
+MAX_BATCH_ITEMS = int(os.environ.get('BLOGPOST_BATCH_MAX_ITEMS', '1000'))
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for creating many blogposts at once.
+    
+    Endpoint: POST /blogpost/batch
+    """
+    return run_pipeline(event, handle_batch_create, admin=True)
+
+
+def handle_batch_create(request: Request) -> Dict[str, Any]:
+    """Create the blogposts from the request body (JSON array or NDJSON)."""
+    posts = decode_records(request.event)
+    if not isinstance(posts, list):
+        return error_response(400, "Request body must be a JSON array or NDJSON of blogposts")
+    if not posts:
+        return error_response(400, "No blogposts in request body")
+    if len(posts) > MAX_BATCH_ITEMS:
+        return error_response(413, f"Batch holds {len(posts)} blogposts; the limit is {MAX_BATCH_ITEMS}")
+    
+    result = create_blogposts(posts)
+    return success_response(result['status_code'], result['data'])
+
+
+def _result(index: int, post: Any, status: int, error: Optional[str] = None) -> Dict[str, Any]:
+    result = {
+        'index': index,
+        'slug': post.get('slug') if isinstance(post, dict) else None,
+        'status': status
+    }
+    if error:
+        result['error'] = error
+    return result
+
+
+def create_blogposts(posts: List[Any]) -> Dict[str, Any]:
+    """
+    Create many blogposts.
+    
+    Each post has the structure expected by POST /blogpost. Posts are
+    validated in one pass, slug conflicts are checked with one batched
+    read (BatchGetItem, 100 keys per request) and new posts are written
+    25 per BatchWriteItem request, chunks running concurrently. The
+    indexes behind GET /blogpost are then updated once for the batch.
+    
+    Batch writes are not conditional: a post created through POST /blogpost
+    with the same slug between the check and the write is overwritten.
+    
+    Returns:
+        {'data': ..., 'status_code': 201 if every post was created and every
+        index updated, else 207} with one result per post, in request order,
+        and 'indexErrors' if an index update failed
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(posts)
+    
+    for index, errors in validate_blogpost.validate_many(posts).items():
+        results[index] = _result(index, posts[index], 400, f"Validation error: {format_errors(errors)}")
+    
+    # Slugs repeated within the batch: the first valid post wins
+    candidates = {}
+    for index, post in enumerate(posts):
+        if results[index] is not None:
+            continue
+        if post['slug'] in candidates:
+            results[index] = _result(index, post, 409, f"Duplicate slug '{post['slug']}' in batch")
+        else:
+            candidates[post['slug']] = index
+    
+    existing = set()
+    if candidates:
+        try:
+            found = batch_get_items(
+                BLOGPOST_TABLE,
+                [{'slug': slug} for slug in candidates],
+                consistent_read=True,
+                projection=['slug']
+            )
+            existing = {item['slug'] for item in found}
+        except Exception as e:
+            print(f"Error checking blogpost slugs: {str(e)}")
+            return _fail_all(posts, results, candidates, f"Failed to check existing blogposts: {str(e)}")
+    
+    created_at = datetime.utcnow().isoformat()
+    items = []
+    for slug, index in candidates.items():
+        if slug in existing:
+            results[index] = _result(index, posts[index], 409, f"Blogpost with slug '{slug}' already exists")
+            continue
+        item = dict(posts[index])
+        item['created_at'] = created_at
+        
+        # Content hash for conditional GETs (before the index attributes are added)
+        item[ETAG_ATTRIBUTE] = content_etag(item)
+        
+        # Keys of the date_index GSI used by GET /blogpost
+        item.update(date_index_attributes(item))
+        items.append(item)
+    
+    created = items
+    if items:
+        try:
+            batch_write_items(BLOGPOST_TABLE, items=items)
+        except Exception as e:
+            # Some chunks may have been written; find out which
+            print(f"Error creating blogposts: {str(e)}")
+            created = _written(items)
+            stored = {item['slug'] for item in created}
+            for item in items:
+                if item['slug'] not in stored:
+                    index = candidates[item['slug']]
+                    results[index] = _result(index, item, 500, f"Failed to create blogpost: {str(e)}")
+    
+    for item in created:
+        index = candidates[item['slug']]
+        results[index] = _result(index, item, 201)
+    
+    index_errors = update_post_indexes(created) if created else []
+    
+    return _summary(results, index_errors)
+
+
+def _written(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The items of a failed batch write that were stored."""
+    try:
+        found = batch_get_items(
+            BLOGPOST_TABLE,
+            [{'slug': item['slug']} for item in items],
+            consistent_read=True,
+            projection=['slug', 'created_at']
+        )
+    except Exception as e:
+        print(f"Error reading back blogposts: {str(e)}")
+        return []
+    stored = {item['slug'] for item in found if item.get('created_at') == items[0]['created_at']}
+    return [item for item in items if item['slug'] in stored]
+
+
+def _fail_all(
+    posts: List[Any],
+    results: List[Optional[Dict[str, Any]]],
+    candidates: Dict[str, int],
+    error: str
+) -> Dict[str, Any]:
+    for index in candidates.values():
+        results[index] = _result(index, posts[index], 500, error)
+    return _summary(results, [])
+
+
+def _summary(results: List[Dict[str, Any]], index_errors: List[Dict[str, str]]) -> Dict[str, Any]:
+    created = sum(1 for result in results if result['status'] == 201)
+    data = {
+        'message': f"{created} of {len(results)} blogposts created",
+        'created': created,
+        'failed': len(results) - created,
+        'results': results
+    }
+    if index_errors:
+        data['indexErrors'] = index_errors
+    return {
+        'data': data,
+        'status_code': 201 if created == len(results) and not index_errors else 207
+    }
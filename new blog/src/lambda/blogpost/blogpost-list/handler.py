@@ -1,60 +1,122 @@
-import json
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 
 from utils.dynamodb_helper import (
     BLOGPOST_TABLE,
-    scan_table
+    scan_table,
+    scan_pages
+)
+from utils.etag import list_etag
+from utils.pipeline import (
+    Request,
+    conditional_response,
+    error_response,
+    not_modified,
+    not_modified_response,
+    run_pipeline
+)
+from utils.summary_index import (
+    date_index_ready,
+    date_pages,
+    in_date_range,
+    read_summaries,
+    tag_index_ready,
+    tag_pages
+)
+from utils.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    InvalidCursorError,
+    Page,
+    parse_limit
 )
 
+# Only the attributes returned in the summaries (plus tags for filtering),
+# so the large content arrays are never read
+SUMMARY_PROJECTION = ['title_image_url', 'slug', 'title', 'summary', 'author', 'date', 'tags']
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for listing all blogposts.
     
     Endpoint: GET /blogpost
+    
+    Responses carry an ETag; If-None-Match is answered with 304 Not Modified
+    (see utils/etag.py).
+    
+    Without filters or pagination the list is served from the materialized
+    summary collection; ?tag= reads the tag's partition of the inverted tag
+    index, and ?limit=/?cursor=/?from=/?to= read the date_index GSI
+    (see utils/summary_index.py). Index reads are already in date order.
+    
+    Pass ?limit= and/or ?cursor= to read one page at a time; the response then
+    includes 'next_cursor' (null on the last page). sort=title applies within the page.
+    ?from= and ?to= are inclusive date prefixes (e.g. from=2024-01&to=2024-06).
     """
-    # API Gateway HTTP API v2 format
-    query_params = event.get('queryStringParameters') or {}
+    return run_pipeline(event, handle_list)
+
+
+def handle_list(request: Request) -> Dict[str, Any]:
+    """List blogposts for the query parameters."""
+    query_params = request.query_params
     
     try:
-        # List all blogposts
-        items = scan_table(BLOGPOST_TABLE)
-        
-        # Get optional tag filter
+        limit = parse_limit(query_params.get('limit'))
+    except ValueError as e:
+        return error_response(400, str(e))
+    cursor = query_params.get('cursor')
+    paginated = limit is not None or bool(cursor)
+    
+    # ETag from the table's list version: a matching If-None-Match skips the read
+    etag = list_etag(BLOGPOST_TABLE, query_params)
+    if not_modified(request.event, etag):
+        return not_modified_response(etag)
+    
+    try:
+        # Get optional tag filter and date range
         filter_tag = query_params.get('tag')
-        if filter_tag:
-            filter_tag_lower = filter_tag.lower()
-        
-        # Extract simplified information and apply tag filter if provided
-        simplified_blogposts = []
-        for item in items:
-            # Apply tag filter if provided
-            if filter_tag:
-                item_tags = item.get('tags', [])
-                # Check if any tag matches (case-insensitive)
-                tag_matches = any(
-                    tag.lower() == filter_tag_lower 
-                    for tag in item_tags 
-                    if isinstance(tag, str)
-                )
-                if not tag_matches:
-                    continue  # Skip this blogpost if tag doesn't match
-            
-            simplified = {
-                'title_image_url': item.get('title_image_url', ''),
-                'slug': item.get('slug', ''),
-                'title': item.get('title', ''),
-                'summary': item.get('summary', ''),
-                'author': item.get('author', ''),
-                'date': item.get('date', '')
-            }
-            simplified_blogposts.append(simplified)
+        date_from = query_params.get('from') or None
+        date_to = query_params.get('to') or None
         
-        # Apply sorting
         sort_by = query_params.get('sort', 'date')
         order = query_params.get('order', 'desc')
+        newest_first = order == 'desc'
         
-        if sort_by == 'date':
+        summaries = None
+        next_cursor = None
+        if filter_tag:
+            if tag_index_ready():
+                # Read only the tag's partition of the inverted index
+                summaries, next_cursor = read_index(
+                    tag_pages, paginated, limit, cursor,
+                    tag=filter_tag, newest_first=newest_first,
+                    date_from=date_from, date_to=date_to
+                )
+        elif paginated or date_from or date_to:
+            if date_index_ready():
+                # Date-ordered GSI: latest N and date ranges without a scan
+                summaries, next_cursor = read_index(
+                    date_pages, paginated, limit, cursor,
+                    newest_first=newest_first, date_from=date_from, date_to=date_to
+                )
+        else:
+            # Served from the materialized summary collection (a single Query)
+            summaries = read_summaries()
+            if summaries is not None and newest_first:
+                summaries.reverse()
+        
+        if summaries is not None:
+            # Index reads already come back in the requested date order
+            simplified_blogposts = summaries
+            date_ordered = True
+        else:
+            # Index not built yet: scan
+            simplified_blogposts, next_cursor = scan_summaries(
+                filter_tag, date_from, date_to, paginated, limit, cursor
+            )
+            date_ordered = False
+        
+        # Apply sorting
+        if sort_by == 'date' and not date_ordered:
             # Sort by date (most recent first by default)
             simplified_blogposts.sort(
                 key=lambda x: x.get('date', ''),
@@ -67,35 +129,100 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 reverse=(order == 'desc')
             )
         
-        return success_response(200, {
+        response_data = {
             'blogposts': simplified_blogposts,
             'count': len(simplified_blogposts)
-        })
+        }
+        if paginated:
+            response_data['next_cursor'] = next_cursor
+        
+        return conditional_response(request.event, response_data, etag)
     
-    except Exception as e:
-        print(f"Error processing request: {str(e)}")
-        return error_response(500, f"Internal server error: {str(e)}")
+    except InvalidCursorError as e:
+        return error_response(400, str(e))
 
 
-def success_response(status_code: int, data: Any) -> Dict[str, Any]:
-    """Create a successful API Gateway response."""
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'body': json.dumps(data, default=str)
-    }
+def read_index(
+    read_pages: Callable[..., Iterator[Page]],
+    paginated: bool,
+    limit: Optional[int],
+    cursor: Optional[str],
+    **kwargs: Any
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Read summaries from an index (tag_pages or date_pages).
+    
+    Returns:
+        (summaries in index order, next_cursor) - next_cursor is None unless paginated
+    """
+    if paginated:
+        page = next(read_pages(limit=limit or DEFAULT_PAGE_LIMIT, cursor=cursor, **kwargs))
+        return page.items, page.cursor
+    
+    summaries = []
+    for page in read_pages(**kwargs):
+        summaries.extend(page.items)
+    return summaries, None
 
 
-def error_response(status_code: int, message: str) -> Dict[str, Any]:
-    """Create an error API Gateway response."""
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'body': json.dumps({'error': message})
-    }
+def scan_summaries(
+    filter_tag: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    paginated: bool,
+    limit: Optional[int],
+    cursor: Optional[str]
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Build blogpost summaries by scanning the blogpost table.
+    
+    Returns:
+        (summaries, next_cursor) - next_cursor is None unless paginated
+    """
+    next_cursor = None
+    if paginated:
+        # Read a single page so the cost is fixed regardless of table size
+        page = next(scan_pages(
+            BLOGPOST_TABLE,
+            limit=limit or DEFAULT_PAGE_LIMIT,
+            cursor=cursor,
+            projection=SUMMARY_PROJECTION
+        ))
+        items = page.items
+        next_cursor = page.cursor
+    else:
+        # List all blogposts
+        items = scan_table(BLOGPOST_TABLE, projection=SUMMARY_PROJECTION)
+    
+    if filter_tag:
+        filter_tag_lower = filter_tag.lower()
+    
+    # Extract simplified information and apply tag / date filters if provided
+    simplified_blogposts = []
+    for item in items:
+        # Apply tag filter if provided
+        if filter_tag:
+            item_tags = item.get('tags', [])
+            # Check if any tag matches (case-insensitive)
+            tag_matches = any(
+                tag.lower() == filter_tag_lower 
+                for tag in item_tags 
+                if isinstance(tag, str)
+            )
+            if not tag_matches:
+                continue  # Skip this blogpost if tag doesn't match
+        
+        if (date_from or date_to) and not in_date_range(item.get('date', ''), date_from, date_to):
+            continue
+        
+        simplified = {
+            'title_image_url': item.get('title_image_url', ''),
+            'slug': item.get('slug', ''),
+            'title': item.get('title', ''),
+            'summary': item.get('summary', ''),
+            'author': item.get('author', ''),
+            'date': item.get('date', '')
+        }
+        simplified_blogposts.append(simplified)
+    
+    return simplified_blogposts, next_cursor
@@ -0,0 +1,89 @@
+import os
+from typing import Dict, Any
+
+from utils.pipeline import (
+    Request,
+    error_response,
+    run_pipeline,
+    success_response
+)
+from utils.image_variants import available, from_record, srcset, store_variants
+from utils.s3_helper import delete_image_from_s3, download_object, head_object, public_url
+from utils.uploads import COMPLETE, MAX_IMAGE_BYTES, complete_upload, get_upload
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for finishing a direct-to-S3 image upload.
+    
+    Endpoint: POST /image/finalize
+    Expected body: JSON with 'uploadId' (from POST /image/presign)
+    """
+    return run_pipeline(event, handle_finalize, admin=True, json_body=True)
+
+
+def handle_finalize(request: Request) -> Dict[str, Any]:
+    """Check the object S3 received against the upload record and complete it."""
+    body = request.body if isinstance(request.body, dict) else {}
+    upload_id = body.get('uploadId')
+    if not isinstance(upload_id, str) or not upload_id:
+        return error_response(400, "Missing required field: uploadId")
+    
+    bucket_name = os.environ.get('S3_BUCKET')
+    if not bucket_name:
+        return error_response(500, "S3_BUCKET environment variable not set")
+    
+    try:
+        upload = get_upload(upload_id)
+        if upload is None:
+            return error_response(404, f"Upload '{upload_id}' not found")
+        
+        # Finalizing twice returns the same result
+        if upload['status'] != COMPLETE:
+            received = head_object(bucket_name, upload['key'])
+            if received is None:
+                return error_response(409, "Image has not been uploaded to S3 yet")
+            
+            # The presigned request already pins type and size; check anyway
+            # so nothing else that can write the key gets recorded
+            size = received.get('ContentLength', 0)
+            limit = int(upload['size']) if upload.get('size') is not None else MAX_IMAGE_BYTES
+            if received.get('ContentType') != upload['content_type'] or not 0 < size <= limit:
+                delete_image_from_s3(bucket_name, upload['key'])
+                return error_response(400, "Uploaded object does not match the upload's content type or size")
+            
+            variants = make_variants(bucket_name, upload)
+            upload = complete_upload(upload_id, size, received.get('ETag', ''), variants)
+    except Exception as e:
+        print(f"Error finalizing image upload: {str(e)}")
+        return error_response(500, f"Failed to finalize upload: {str(e)}")
+    
+    variants = from_record(upload.get('variants'))
+    return success_response(200, {
+        'imageUrl': public_url(bucket_name, upload['key']),
+        'imageId': upload['id'],
+        'contentType': upload['content_type'],
+        'size': int(upload['size']),
+        'variants': variants,
+        'srcset': srcset(variants)
+    })
+
+
+def make_variants(bucket_name: str, upload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate and store the responsive variants of an uploaded image ({} on failure).
+    
+    This is the one place the upload's bytes pass through Lambda: the
+    original is downloaded once, in chunks into a temporary file that
+    spills to /tmp, and decoded from there (within IMAGE_VARIANT_MAX_PIXELS).
+    Without Pillow nothing is downloaded.
+    """
+    if not available():
+        return {}
+    try:
+        with download_object(bucket_name, upload['key']) as original:
+            return store_variants(bucket_name, upload['id'], original, upload['content_type'])
+    except Exception as e:
+        # The original is stored and usable; variants are an optimization
+        print(f"Error generating image variants: {str(e)}")
+        return {}
@@ -0,0 +1,76 @@
+import os
+import uuid
+from typing import Dict, Any
+
+from utils.pipeline import (
+    Request,
+    error_response,
+    run_pipeline,
+    success_response
+)
+from utils.s3_helper import IMAGE_CONTENT_TYPES, get_content_type, presign_post, presign_put, public_url
+from utils.uploads import MAX_IMAGE_BYTES, PRESIGN_EXPIRES_SECONDS, create_upload
+
+# Upload methods: a presigned PUT URL (fetch/XHR with the file as body) or a
+# presigned POST policy (multipart form)
+UPLOAD_METHODS = ('PUT', 'POST')
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for starting a direct-to-S3 image upload.
+    
+    Endpoint: POST /image/presign
+    Expected body: JSON with 'contentType' (or 'imageFileExtension'), 'size'
+    (bytes; required for PUT) and optional 'method' ('PUT' or 'POST')
+    """
+    return run_pipeline(event, handle_presign, admin=True, json_body=True)
+
+
+def handle_presign(request: Request) -> Dict[str, Any]:
+    """Record a pending upload and return where and how to send the bytes."""
+    body = request.body if isinstance(request.body, dict) else {}
+    
+    content_type = body.get('contentType')
+    if not content_type and body.get('imageFileExtension'):
+        content_type = get_content_type(body['imageFileExtension'])
+    if content_type not in IMAGE_CONTENT_TYPES:
+        return error_response(400, f"contentType must be one of: {', '.join(IMAGE_CONTENT_TYPES)}")
+    
+    method = str(body.get('method', 'PUT')).upper()
+    if method not in UPLOAD_METHODS:
+        return error_response(400, "method must be PUT or POST")
+    
+    size = body.get('size')
+    if size is None and method == 'PUT':
+        return error_response(400, "Missing required field: size")
+    if size is not None and (type(size) is not int or size < 1):
+        return error_response(400, "size must be a positive integer")
+    if size is not None and size > MAX_IMAGE_BYTES:
+        return error_response(413, f"Image is larger than {MAX_IMAGE_BYTES} bytes")
+    
+    bucket_name = os.environ.get('S3_BUCKET')
+    if not bucket_name:
+        return error_response(500, "S3_BUCKET environment variable not set")
+    
+    image_id = str(uuid.uuid4())
+    s3_key = f"{image_id}{IMAGE_CONTENT_TYPES[content_type]}"
+    
+    try:
+        if method == 'PUT':
+            upload = presign_put(bucket_name, s3_key, content_type, size, PRESIGN_EXPIRES_SECONDS)
+        else:
+            upload = presign_post(bucket_name, s3_key, content_type, size or MAX_IMAGE_BYTES, PRESIGN_EXPIRES_SECONDS)
+        create_upload(s3_key, content_type, size, method, image_id=image_id)
+    except Exception as e:
+        print(f"Error presigning image upload: {str(e)}")
+        return error_response(500, f"Failed to start upload: {str(e)}")
+    
+    return success_response(200, {
+        'uploadId': image_id,
+        'imageId': image_id,
+        'imageUrl': public_url(bucket_name, s3_key),
+        'method': method,
+        **upload,
+        'expiresIn': PRESIGN_EXPIRES_SECONDS
+    })
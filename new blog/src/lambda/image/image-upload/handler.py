@@ -1,11 +1,27 @@
-import json
-import base64
+import binascii
 import os
 import uuid
-import hmac
-from typing import Dict, Any
+from typing import Dict, Any, BinaryIO
 
-from utils.s3_helper import upload_image_to_s3
+from utils.pipeline import (
+    Request,
+    decode_upload_body,
+    error_response,
+    run_pipeline,
+    success_response
+)
+from utils.image_variants import load_variants, srcset, store_variants
+from utils.s3_helper import (
+    IMAGE_CONTENT_TYPES,
+    IMMUTABLE_CACHE_CONTROL,
+    get_content_type,
+    upload_content_addressed,
+    upload_image_to_s3
+)
+
+# Key images by a hash of their bytes (see upload_content_addressed) unless
+# the request says otherwise with 'contentAddressed'
+CONTENT_ADDRESSED = os.environ.get('IMAGE_CONTENT_ADDRESSED', '') in ('1', 'true', 'True')
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -13,131 +29,89 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Lambda handler for uploading images to S3.
     
     Endpoint: POST /image/upload
-    Expected body: JSON with 'imageBytes' (base64 encoded) and 'imageFileExtension'
+    Expected body: JSON with 'imageBytes' (base64 encoded), 'imageFileExtension'
+    and optional 'contentAddressed' (bool)
     """
-    # Check admin token authentication
-    headers = event.get('headers', {})
-    admin_token = headers.get('x-admin-token', '')
-    secret_token = os.environ.get('SECRET_TOKEN', '')
+    return run_pipeline(event, handle_upload, admin=True)
+
+
+def handle_upload(request: Request) -> Dict[str, Any]:
+    """Store the base64 image from the request body in S3."""
+    # The image is decoded in chunks into a temporary file, not held as
+    # base64 text and bytes at once (see decode_upload_body)
+    try:
+        body, image = decode_upload_body(request.event, 'imageBytes')
+    except binascii.Error as e:
+        return error_response(400, f"Invalid base64 encoding: {str(e)}")
     
-    if not secret_token or not admin_token:
-        return error_response(400, "")
+    if image is None:
+        return error_response(400, "Missing required field: imageBytes")
     
-    # Verify token using constant-time comparison to prevent timing attacks
-    try:
-        if not hmac.compare_digest(admin_token.encode('utf-8'), secret_token.encode('utf-8')):
-            return error_response(400, "")
-    except Exception:
-        return error_response(400, "")
+    with image:
+        return store_upload(body, image)
+
+
+def store_upload(body: Dict[str, Any], image: BinaryIO) -> Dict[str, Any]:
+    """Upload the decoded image and its variants."""
+    image_file_extension = body.get('imageFileExtension', '.jpg')
+    
+    # Validate extension
+    if not image_file_extension.startswith('.'):
+        image_file_extension = '.' + image_file_extension
+    
+    # Get bucket name from environment
+    bucket_name = os.environ.get('S3_BUCKET')
+    if not bucket_name:
+        return error_response(500, "S3_BUCKET environment variable not set")
     
-    # API Gateway HTTP API v2 format
-    body = event.get('body', '{}')
+    # Determine content type from extension (unknown ones are stored as JPEG,
+    # as they always were)
+    content_type = get_content_type(image_file_extension) or 'image/jpeg'
     
-    # Handle base64 encoded body if needed
-    if event.get('isBase64Encoded', False) and body:
-        body = base64.b64decode(body).decode('utf-8')
+    content_addressed = body.get('contentAddressed', CONTENT_ADDRESSED)
+    if not isinstance(content_addressed, bool):
+        return error_response(400, "contentAddressed must be a boolean")
     
+    # Upload to S3
+    existing = False
     try:
-        # Parse body if it's a string
-        if isinstance(body, str):
-            body = json.loads(body) if body else {}
-        
-        # Get image bytes and extension
-        image_bytes_base64 = body.get('imageBytes')
-        image_file_extension = body.get('imageFileExtension', '.jpg')
-        
-        if not image_bytes_base64:
-            return error_response(400, "Missing required field: imageBytes")
-        
-        # Decode base64 image bytes
-        try:
-            image_bytes = base64.b64decode(image_bytes_base64)
-        except Exception as e:
-            return error_response(400, f"Invalid base64 encoding: {str(e)}")
-        
-        # Validate extension
-        if not image_file_extension.startswith('.'):
-            image_file_extension = '.' + image_file_extension
-        
-        # Get bucket name from environment
-        bucket_name = os.environ.get('S3_BUCKET')
-        if not bucket_name:
-            return error_response(500, "S3_BUCKET environment variable not set")
-        
-        # Generate unique image ID (UUID)
-        image_id = str(uuid.uuid4())
-        
-        # Create file name with extension
-        file_name = f"{image_id}{image_file_extension}"
-        
-        # Determine content type from extension
-        content_type = get_content_type(image_file_extension)
-        
-        # Upload to S3
-        try:
+        if content_addressed:
+            # The image id is the content hash; re-uploads find the stored image
+            stored = upload_content_addressed(
+                image, bucket_name, IMAGE_CONTENT_TYPES[content_type], content_type
+            )
+            image_id, image_url, existing = stored['hash'], stored['url'], stored['existing']
+        else:
+            # Generate unique image ID (UUID)
+            image_id = str(uuid.uuid4())
             image_url = upload_image_to_s3(
-                file_content=image_bytes,
+                file_content=image,
                 bucket_name=bucket_name,
-                file_name=file_name,
+                file_name=f"{image_id}{image_file_extension}",
                 content_type=content_type
             )
-            
-            return success_response(200, {
-                'imageUrl': image_url,
-                'imageId': image_id
-            })
-        except Exception as e:
-            print(f"Error uploading image to S3: {str(e)}")
-            return error_response(500, f"Failed to upload image: {str(e)}")
-    
-    except json.JSONDecodeError:
-        return error_response(400, "Invalid JSON in request body")
     except Exception as e:
-        print(f"Error processing request: {str(e)}")
-        return error_response(500, f"Internal server error: {str(e)}")
-
-
-def get_content_type(extension: str) -> str:
-    """
-    Get content type from file extension.
-    
-    Args:
-        extension: File extension (e.g., '.jpg', '.png')
+        print(f"Error uploading image to S3: {str(e)}")
+        return error_response(500, f"Failed to upload image: {str(e)}")
     
-    Returns:
-        Content type string (e.g., 'image/jpeg')
-    """
-    content_types = {
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif',
-        '.webp': 'image/webp'
-    }
+    # Responsive variants; the original is usable without them. Variants of
+    # a content-addressed image are immutable too and reused when it exists.
+    try:
+        variants = load_variants(bucket_name, image_id) if existing else None
+        if variants is None:
+            image.seek(0)
+            variants = store_variants(
+                bucket_name, image_id, image, content_type,
+                extra_args={'CacheControl': IMMUTABLE_CACHE_CONTROL} if content_addressed else None
+            )
+    except Exception as e:
+        print(f"Error generating image variants: {str(e)}")
+        variants = {}
     
-    return content_types.get(extension.lower(), 'image/jpeg')
-
-
-def success_response(status_code: int, data: Any) -> Dict[str, Any]:
-    """Create a successful API Gateway response."""
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'body': json.dumps(data, default=str)
-    }
-
-
-def error_response(status_code: int, message: str) -> Dict[str, Any]:
-    """Create an error API Gateway response."""
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'body': json.dumps({'error': message})
-    }
-
+    return success_response(200, {
+        'imageUrl': image_url,
+        'imageId': image_id,
+        'deduplicated': existing,
+        'variants': variants,
+        'srcset': srcset(variants)
+    })
@@ -0,0 +1,182 @@
+import os
+import threading
+from typing import Dict, Any, Optional
+
+from utils.metrics import instrument_client
+
+# Lazily created, memoized AWS clients.
+#
+# boto3 is imported and clients are built on first use instead of at module
+# import, so a cold start that returns early (validation, auth) never pays
+# for loading the SDK. Clients are thread-safe and cached at module level,
+# so warm invocations reuse them. utils.metrics hooks into each client to
+# time its calls.
+#
+# Every client shares one tuned botocore configuration (environment variables,
+# with optional per-service overrides such as AWS_READ_TIMEOUT_S3):
+#   AWS_CONNECT_TIMEOUT         Seconds to establish a connection
+#   AWS_READ_TIMEOUT            Seconds to wait for a response on a connection
+#   AWS_MAX_POOL_CONNECTIONS    Connection pool size (default fits the scan/batch thread pools)
+#   AWS_RETRY_MODE              botocore retry mode (adaptive, standard or legacy)
+#   AWS_MAX_ATTEMPTS            Total attempts per call, including the first
+#   AWS_TCP_KEEPALIVE           Set to 0 to disable TCP keep-alive
+
+DEFAULT_CONNECT_TIMEOUT = 1.0
+DEFAULT_READ_TIMEOUT = 2.0
+DEFAULT_RETRY_MODE = 'adaptive'
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Per-service defaults that differ from the ones above (S3 calls carry image bodies)
+SERVICE_DEFAULTS = {
+    's3': {'read_timeout': 10.0}
+}
+
+# Fixed per-service Config options. Presigned S3 uploads need SigV4 (so
+# Content-Type and Content-Length are signed) and the bucket's regional
+# virtual-hosted endpoint (a redirect would break browser uploads).
+SERVICE_CONFIG = {
+    's3': {'signature_version': 's3v4', 's3': {'addressing_style': 'virtual'}}
+}
+
+_clients: Dict[str, Any] = {}
+_resources: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def _setting(name: str, service_name: str) -> Optional[str]:
+    """Read AWS_<NAME>_<SERVICE>, falling back to AWS_<NAME>."""
+    value = os.environ.get(f"AWS_{name}_{service_name.upper()}")
+    if value is None:
+        value = os.environ.get(f"AWS_{name}")
+    return value or None
+
+
+def _float_setting(name: str, service_name: str, default: float) -> float:
+    try:
+        return float(_setting(name, service_name) or default)
+    except ValueError:
+        return default
+
+
+def _int_setting(name: str, service_name: str, default: int) -> int:
+    try:
+        return int(_setting(name, service_name) or default)
+    except ValueError:
+        return default
+
+
+def _default_pool_size() -> int:
+    """One connection per worker of the largest thread pool the helpers start."""
+    workers = [10]
+    for name, default in (('DYNAMODB_SCAN_WORKERS', 16), ('DYNAMODB_BATCH_WORKERS', 8)):
+        try:
+            workers.append(int(os.environ.get(name, default)))
+        except ValueError:
+            workers.append(default)
+    return max(workers)
+
+
+def client_settings(service_name: str) -> Dict[str, Any]:
+    """
+    Resolve the client settings for a service from the environment.
+    
+    Returns:
+        Dict with connect_timeout, read_timeout, max_pool_connections,
+        retry_mode, max_attempts and tcp_keepalive
+    """
+    defaults = SERVICE_DEFAULTS.get(service_name, {})
+    return {
+        'connect_timeout': _float_setting(
+            'CONNECT_TIMEOUT', service_name, defaults.get('connect_timeout', DEFAULT_CONNECT_TIMEOUT)
+        ),
+        'read_timeout': _float_setting(
+            'READ_TIMEOUT', service_name, defaults.get('read_timeout', DEFAULT_READ_TIMEOUT)
+        ),
+        'max_pool_connections': _int_setting(
+            'MAX_POOL_CONNECTIONS', service_name, defaults.get('max_pool_connections', _default_pool_size())
+        ),
+        'retry_mode': _setting('RETRY_MODE', service_name) or defaults.get('retry_mode', DEFAULT_RETRY_MODE),
+        'max_attempts': _int_setting(
+            'MAX_ATTEMPTS', service_name, defaults.get('max_attempts', DEFAULT_MAX_ATTEMPTS)
+        ),
+        'tcp_keepalive': _setting('TCP_KEEPALIVE', service_name) not in ('0', 'false', 'False')
+    }
+
+
+def client_config(service_name: str):
+    """Build the botocore Config for a service."""
+    from botocore.config import Config
+    
+    settings = client_settings(service_name)
+    return Config(
+        connect_timeout=settings['connect_timeout'],
+        read_timeout=settings['read_timeout'],
+        max_pool_connections=settings['max_pool_connections'],
+        retries={'mode': settings['retry_mode'], 'total_max_attempts': settings['max_attempts']},
+        tcp_keepalive=settings['tcp_keepalive'],
+        **SERVICE_CONFIG.get(service_name, {})
+    )
+
+
+def create_client(service_name: str, **kwargs: Any):
+    """
+    Build a new client with the shared configuration (not memoized).
+    
+    Args:
+        service_name: AWS service name (e.g. 'dynamodb', 's3')
+        **kwargs: Extra boto3.client arguments, e.g. endpoint_url
+    """
+    import boto3
+    return instrument_client(boto3.client(service_name, config=client_config(service_name), **kwargs))
+
+
+def get_client(service_name: str):
+    """
+    Get the low-level client for a service, creating it on first use.
+    
+    Args:
+        service_name: AWS service name (e.g. 'dynamodb', 's3')
+    
+    Returns:
+        boto3 client
+    """
+    client = _clients.get(service_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = create_client(service_name)
+                _clients[service_name] = client
+    return client
+
+
+def get_resource(service_name: str):
+    """
+    Get the boto3 resource for a service, creating it on first use.
+    
+    Optional: the helpers use the low-level clients; the resource model is
+    only loaded if something asks for it.
+    """
+    resource = _resources.get(service_name)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service_name)
+            if resource is None:
+                import boto3
+                resource = boto3.resource(service_name, config=client_config(service_name))
+                instrument_client(resource.meta.client)
+                _resources[service_name] = resource
+    return resource
+
+
+def set_client(service_name: str, client: Any) -> None:
+    """Use a pre-built client for a service (benchmarks, local endpoints)."""
+    with _lock:
+        _clients[service_name] = client
+
+
+def reset_clients() -> None:
+    """Forget all created clients and resources."""
+    with _lock:
+        _clients.clear()
+        _resources.clear()
@@ -0,0 +1,370 @@
+from decimal import Decimal
+from typing import Dict, Any, Callable, Optional
+
+# Field shapes for the known tables. Fields listed here are converted by a
+# cheap type check that leaves already-plain values untouched; anything else
+# (unknown fields, unexpected types) falls back to the generic recursive pass.
+STRING = 'string'
+STRING_LIST = 'string_list'
+CONTENT_BLOCKS = 'content_blocks'
+
+TABLE_SHAPES = {
+    'blogpost': {
+        'slug': STRING,
+        'id': STRING,
+        'title': STRING,
+        'title_image_url': STRING,
+        'summary': STRING,
+        'content': CONTENT_BLOCKS,
+        'date': STRING,
+        'author': STRING,
+        'tags': STRING_LIST,
+        'created_at': STRING
+    },
+    'portfolio': {
+        'id': STRING,
+        'slug': STRING,
+        'title': STRING,
+        'summary': STRING,
+        'content': CONTENT_BLOCKS,
+        'created_at': STRING,
+        'updated_at': STRING
+    },
+    'experience': {
+        'id': STRING,
+        'title': STRING,
+        'company_name': STRING,
+        'image_url': STRING,
+        'start_month': STRING,
+        'end_month': STRING,
+        'description': STRING,
+        'created_at': STRING
+    },
+    'image_upload': {
+        'id': STRING,
+        'key': STRING,
+        'content_type': STRING,
+        'method': STRING,
+        'status': STRING,
+        'etag': STRING,
+        'created_at': STRING,
+        'completed_at': STRING
+    }
+}
+
+
+def to_python(value: Any) -> Any:
+    """
+    Convert a value read from DynamoDB to plain JSON-serializable Python types.
+    
+    Decimals become floats and sets become lists, matching the previous
+    json.dumps(default=decimal_default) / json.loads round trip.
+    """
+    value_type = type(value)
+    if value_type is str or value_type is bool or value is None or value_type is int:
+        return value
+    if value_type is Decimal:
+        return float(value)
+    if value_type is dict:
+        return {
+            (k if type(k) is str else str(k)): to_python(v)
+            for k, v in value.items()
+        }
+    if value_type is list or value_type is tuple:
+        return [to_python(v) for v in value]
+    if value_type is float:
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return [to_python(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): to_python(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_python(v) for v in value]
+    return value
+
+
+def to_dynamodb(value: Any) -> Any:
+    """
+    Convert a plain Python value to types accepted by the DynamoDB resource layer.
+    
+    Floats become Decimals (via repr, as json.loads(parse_float=Decimal) did).
+    """
+    value_type = type(value)
+    if value_type is str or value_type is bool or value is None or value_type is int:
+        return value
+    if value_type is float:
+        return Decimal(repr(value))
+    if value_type is dict:
+        return {
+            (k if type(k) is str else str(k)): to_dynamodb(v)
+            for k, v in value.items()
+        }
+    if value_type is list or value_type is tuple:
+        return [to_dynamodb(v) for v in value]
+    if isinstance(value, float):
+        return Decimal(repr(float(value)))
+    if isinstance(value, dict):
+        return {str(k): to_dynamodb(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_dynamodb(v) for v in value]
+    return value
+
+
+def to_attribute_value(value: Any) -> Dict[str, Any]:
+    """
+    Convert a plain Python value straight to a DynamoDB AttributeValue.
+    
+    Used with the low-level client; numbers are sent as their string form
+    (floats via repr) so no Decimal is created on the way.
+    """
+    value_type = type(value)
+    if value_type is str:
+        return {'S': value}
+    if value_type is bool:
+        return {'BOOL': value}
+    if value is None:
+        return {'NULL': True}
+    if value_type is int:
+        return {'N': str(value)}
+    if value_type is float:
+        return {'N': repr(value)}
+    if value_type is dict:
+        return {'M': {
+            (k if type(k) is str else str(k)): to_attribute_value(v)
+            for k, v in value.items()
+        }}
+    if value_type is list or value_type is tuple:
+        return {'L': [to_attribute_value(v) for v in value]}
+    if isinstance(value, Decimal):
+        return {'N': str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {'B': bytes(value)}
+    if isinstance(value, (set, frozenset)):
+        if value and all(isinstance(v, str) for v in value):
+            return {'SS': list(value)}
+        if value and all(isinstance(v, (int, float, Decimal)) and not isinstance(v, bool) for v in value):
+            return {'NS': [str(v) for v in value]}
+        return {'L': [to_attribute_value(v) for v in value]}
+    if isinstance(value, dict):
+        return {'M': {str(k): to_attribute_value(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {'L': [to_attribute_value(v) for v in value]}
+    if isinstance(value, float):
+        return {'N': repr(float(value))}
+    raise TypeError(f"Unsupported DynamoDB attribute type: {type(value).__name__}")
+
+
+def _number(value: str) -> float:
+    return float(value)
+
+
+def from_attribute_value(attribute: Dict[str, Any]) -> Any:
+    """
+    Convert a DynamoDB AttributeValue straight to plain Python types.
+    
+    Numbers become floats, as serialize_item does for Decimals.
+    """
+    if 'S' in attribute:
+        return attribute['S']
+    if 'M' in attribute:
+        return {k: from_attribute_value(v) for k, v in attribute['M'].items()}
+    if 'L' in attribute:
+        return [from_attribute_value(v) for v in attribute['L']]
+    if 'N' in attribute:
+        return _number(attribute['N'])
+    if 'BOOL' in attribute:
+        return attribute['BOOL']
+    if 'NULL' in attribute:
+        return None
+    if 'SS' in attribute:
+        return list(attribute['SS'])
+    if 'NS' in attribute:
+        return [_number(v) for v in attribute['NS']]
+    if 'B' in attribute:
+        return attribute['B']
+    if 'BS' in attribute:
+        return list(attribute['BS'])
+    raise TypeError(f"Unsupported DynamoDB attribute: {list(attribute)}")
+
+
+def _wire_string_field(value):
+    return value['S'] if 'S' in value else from_attribute_value(value)
+
+
+def _wire_string_list_field(value):
+    if 'L' in value:
+        result = []
+        for v in value['L']:
+            if 'S' not in v:
+                return from_attribute_value(value)
+            result.append(v['S'])
+        return result
+    return from_attribute_value(value)
+
+
+def _wire_content_blocks_field(value):
+    if 'L' in value:
+        result = []
+        for block in value['L']:
+            fields = block.get('M')
+            if fields is None:
+                return from_attribute_value(value)
+            decoded = {}
+            for k, v in fields.items():
+                if 'S' not in v:
+                    return from_attribute_value(value)
+                decoded[k] = v['S']
+            result.append(decoded)
+        return result
+    return from_attribute_value(value)
+
+
+def _wire_encode_string_field(value):
+    return {'S': value} if type(value) is str else to_attribute_value(value)
+
+
+def _wire_encode_string_list_field(value):
+    if type(value) is list:
+        result = []
+        for v in value:
+            if type(v) is not str:
+                return to_attribute_value(value)
+            result.append({'S': v})
+        return {'L': result}
+    return to_attribute_value(value)
+
+
+def _wire_encode_content_blocks_field(value):
+    if type(value) is list:
+        result = []
+        for block in value:
+            if type(block) is not dict:
+                return to_attribute_value(value)
+            fields = {}
+            for k, v in block.items():
+                if type(v) is not str:
+                    return to_attribute_value(value)
+                fields[k] = {'S': v}
+            result.append({'M': fields})
+        return {'L': result}
+    return to_attribute_value(value)
+
+
+_WIRE_DECODERS = {
+    STRING: _wire_string_field,
+    STRING_LIST: _wire_string_list_field,
+    CONTENT_BLOCKS: _wire_content_blocks_field
+}
+
+_WIRE_ENCODERS = {
+    STRING: _wire_encode_string_field,
+    STRING_LIST: _wire_encode_string_list_field,
+    CONTENT_BLOCKS: _wire_encode_content_blocks_field
+}
+
+
+def _string_field(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def field(value):
+        return value if type(value) is str else convert(value)
+    return field
+
+
+def _string_list_field(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def field(value):
+        if type(value) is list:
+            for v in value:
+                if type(v) is not str:
+                    return convert(value)
+            return value
+        return convert(value)
+    return field
+
+
+def _content_blocks_field(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def field(value):
+        if type(value) is list:
+            for block in value:
+                if type(block) is not dict:
+                    return convert(value)
+                for v in block.values():
+                    if type(v) is not str:
+                        return convert(value)
+            return value
+        return convert(value)
+    return field
+
+
+_FIELD_BUILDERS = {
+    STRING: _string_field,
+    STRING_LIST: _string_list_field,
+    CONTENT_BLOCKS: _content_blocks_field
+}
+
+
+class ItemCodec:
+    """
+    Converts whole items between DynamoDB and plain Python types in one pass.
+    
+    Built once per table from TABLE_SHAPES; fields with a known shape skip
+    the recursive walk when they already hold plain values.
+    """
+    
+    def __init__(self, shape: Optional[Dict[str, str]] = None):
+        shape = shape or {}
+        self._decoders = {
+            name: _FIELD_BUILDERS[kind](to_python) for name, kind in shape.items()
+        }
+        self._encoders = {
+            name: _FIELD_BUILDERS[kind](to_dynamodb) for name, kind in shape.items()
+        }
+        self._wire_decoders = {name: _WIRE_DECODERS[kind] for name, kind in shape.items()}
+        self._wire_encoders = {name: _WIRE_ENCODERS[kind] for name, kind in shape.items()}
+    
+    def decode(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a DynamoDB item to a JSON-serializable dict."""
+        decoders = self._decoders
+        result = {}
+        for key, value in item.items():
+            decoder = decoders.get(key)
+            result[key] = decoder(value) if decoder else to_python(value)
+        return result
+    
+    def encode(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a plain dict to a DynamoDB item (floats as Decimal)."""
+        encoders = self._encoders
+        result = {}
+        for key, value in item.items():
+            encoder = encoders.get(key)
+            result[key] = encoder(value) if encoder else to_dynamodb(value)
+        return result
+    
+    def decode_wire(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a low-level client item (AttributeValues) to a JSON-serializable dict."""
+        decoders = self._wire_decoders
+        result = {}
+        for key, value in item.items():
+            decoder = decoders.get(key)
+            result[key] = decoder(value) if decoder else from_attribute_value(value)
+        return result
+    
+    def encode_wire(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a plain dict to a low-level client item (AttributeValues)."""
+        encoders = self._wire_encoders
+        result = {}
+        for key, value in item.items():
+            encoder = encoders.get(key)
+            result[key] = encoder(value) if encoder else to_attribute_value(value)
+        return result
+
+
+_GENERIC_CODEC = ItemCodec()
+_TABLE_CODECS = {name: ItemCodec(shape) for name, shape in TABLE_SHAPES.items()}
+
+
+def get_codec(table_name: Optional[str] = None) -> ItemCodec:
+    """Get the compiled codec for a table (generic codec for unknown tables)."""
+    if table_name is None:
+        return _GENERIC_CODEC
+    return _TABLE_CODECS.get(table_name, _GENERIC_CODEC)
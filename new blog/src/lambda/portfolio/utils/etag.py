@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from utils.dynamodb_helper import (
+    BLOGPOST_TABLE,
+    BLOGPOST_INDEX_TABLE,
+    get_item,
+    update_item
+)
+from utils.pipeline import if_none_match, not_modified
+from utils.read_cache import read_cache
+
+# Entity tags for conditional GETs.
+#
+# Every item gets a content hash ('etag' attribute) when it is created, so
+# the get handlers can answer If-None-Match with a projected read of that one
+# attribute instead of the full item.
+#
+# Each table's list responses share a version stored in the blogpost_index
+# table and replaced on every create (after the list indexes are updated):
+#
+#   pk = 'LIST_ETAG', sk = '<table name>'   etag, updated_at
+#
+# A list ETag is the hash of that version and the query string, so
+# If-None-Match is answered without running the list. A container reads the
+# version at most once every LIST_VERSION_TTL_SECONDS (default 5, 0 reads it
+# on every list request), so warm list requests served from the read cache
+# make no DynamoDB call; other containers' creates show up within that time.
+# When the version differs from the one this container saw last, its cached
+# reads for the table are dropped, so a list is never older than its ETag.
+
+ETAG_ATTRIBUTE = 'etag'
+LIST_ETAG_PARTITION = 'LIST_ETAG'
+
+# Tables whose cached reads make up a table's list responses
+LIST_SOURCES = {
+    BLOGPOST_TABLE: [BLOGPOST_TABLE, BLOGPOST_INDEX_TABLE]
+}
+
+try:
+    LIST_VERSION_TTL_SECONDS = float(os.environ.get('LIST_VERSION_TTL_SECONDS', '5'))
+except ValueError:
+    LIST_VERSION_TTL_SECONDS = 5.0
+
+_seen_versions: Dict[str, Optional[str]] = {}
+_read_versions: Dict[str, Tuple[float, Optional[str]]] = {}  # table -> (expires_at, version)
+_lock = threading.Lock()
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()[:32]
+
+
+def content_etag(item: Dict[str, Any]) -> str:
+    """Hash an item's content (every attribute except the stored etag)."""
+    content = {k: v for k, v in item.items() if k != ETAG_ATTRIBUTE}
+    return _digest(json.dumps(content, sort_keys=True, separators=(',', ':'), default=str))
+
+
+def strip_etag(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove the stored etag attribute from an item before returning it."""
+    return {k: v for k, v in item.items() if k != ETAG_ATTRIBUTE}
+
+
+def read_item_etag(table_name: str, key: Dict[str, Any]) -> Optional[str]:
+    """
+    Read only the stored etag of an item (bypasses the read cache).
+    
+    Returns:
+        The etag, '' if the item has none (created before etags), None if the item doesn't exist
+    """
+    item = get_item(table_name, key, use_cache=False, projection=[ETAG_ATTRIBUTE])
+    if item is None:
+        return None
+    return item.get(ETAG_ATTRIBUTE, '')
+
+
+def get_item_conditional(
+    table_name: str,
+    key: Dict[str, Any],
+    event: Dict[str, Any]
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Read an item for a conditional GET.
+    
+    With If-None-Match, the stored etag is compared first and the item is
+    only read when the client's copy is out of date.
+    
+    Returns:
+        (item, etag) - (None, etag) if the client's copy is current (answer 304),
+        (None, None) if the item doesn't exist; etag is None for items without one
+    """
+    stored = None
+    if if_none_match(event):
+        stored = read_item_etag(table_name, key)
+        if stored is None:
+            return None, None
+        if not_modified(event, stored):
+            return None, stored
+    
+    item = get_item(table_name, key)
+    if item is not None and stored and item.get(ETAG_ATTRIBUTE) != stored:
+        # The container's cached copy is older than the stored item
+        item = get_item(table_name, key, use_cache=False)
+    if item is None:
+        return None, None
+    return item, item.get(ETAG_ATTRIBUTE) or None
+
+
+def _list_key(table_name: str) -> Dict[str, str]:
+    return {'pk': LIST_ETAG_PARTITION, 'sk': table_name}
+
+
+def touch_list_etag(table_name: str, item: Dict[str, Any]) -> str:
+    """
+    Replace the list version of a table after a write.
+    
+    Call it after the item and any list indexes have been written.
+    
+    Returns:
+        The new version
+    """
+    version = _digest(f"{table_name}:{item.get(ETAG_ATTRIBUTE, '')}:{time.time_ns()}")
+    update_item(
+        BLOGPOST_INDEX_TABLE,
+        _list_key(table_name),
+        'SET #etag = :etag, updated_at = :updated_at',
+        {':etag': version, ':updated_at': datetime.utcnow().isoformat()},
+        {'#etag': ETAG_ATTRIBUTE}
+    )
+    # This container's next list request reads the new version
+    with _lock:
+        _read_versions.pop(table_name, None)
+    return version
+
+
+def list_version(table_name: str) -> Optional[str]:
+    """
+    Read the list version of a table (None until the first create).
+    
+    The version read is reused for LIST_VERSION_TTL_SECONDS. Drops the
+    container's cached reads for the table when the version changed since
+    the last read.
+    """
+    now = time.monotonic()
+    with _lock:
+        cached = _read_versions.get(table_name)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    item = get_item(BLOGPOST_INDEX_TABLE, _list_key(table_name), use_cache=False, projection=[ETAG_ATTRIBUTE])
+    version = item.get(ETAG_ATTRIBUTE) if item else None
+    
+    with _lock:
+        changed = _seen_versions.get(table_name) != version
+        _seen_versions[table_name] = version
+        if LIST_VERSION_TTL_SECONDS > 0:
+            _read_versions[table_name] = (now + LIST_VERSION_TTL_SECONDS, version)
+    if changed:
+        for source in LIST_SOURCES.get(table_name, [table_name]):
+            read_cache.invalidate_table(source)
+    return version
+
+
+def list_etag(table_name: str, query_params: Dict[str, Any]) -> Optional[str]:
+    """
+    Build the ETag of a list response.
+    
+    Args:
+        table_name: Table being listed
+        query_params: Query string parameters of the request
+    
+    Returns:
+        The ETag, or None if the table has no list version yet
+    """
+    version = list_version(table_name)
+    if version is None:
+        return None
+    query = '&'.join(f"{k}={v}" for k, v in sorted(query_params.items()))
+    return _digest(f"{version}?{query}")
@@ -0,0 +1,280 @@
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+# Per-invocation timings written in CloudWatch Embedded Metric Format (EMF).
+#
+# run_pipeline starts an invocation, times its phases and, at the end, prints
+# one EMF JSON line; CloudWatch Logs extracts the metrics from it, so nothing
+# calls PutMetricData. Clients created by aws_clients are instrumented through
+# botocore's event hooks: each AWS call adds its latency, retries and errors
+# to the running invocation, per service and per operation.
+#
+# Metrics (namespace METRICS_NAMESPACE, default 'BlogBackend'; dimensions
+# Function and Route):
+#   Duration                 Pipeline time of the invocation
+#   ColdStart                1 on the first invocation of a container
+#   InitCpuTime              CPU time spent before it (imports, init; cold starts only)
+#   <Phase>Time              Each timed phase: Parse, Endpoint (includes the AWS
+#                            calls, Validate and Encode), Validate, Encode,
+#                            Compress, Import (router), Upload (s3_helper
+#                            streaming uploads), Variants (image derivatives)
+#   <Service>Time / Calls / Retries / Errors, e.g. DynamoDBTime
+#   DynamoDBReadCapacity / DynamoDBWriteCapacity
+#                            Consumed units, when the data layer requests them
+#                            (DYNAMODB_CONSUMED_CAPACITY, see dynamodb_helper)
+#   <Name>                   Counts added by endpoints with add_count, e.g.
+#                            IndexUpdateErrors (blogpost create and batch create)
+# Per-operation details, capacity per table and index, the request id and
+# the status code are plain properties of the line (searchable with Logs
+# Insights, not billed as metrics).
+#
+# METRICS_SAMPLE_RATE (0-1, default 1) bounds the log volume: that fraction of
+# warm, successful invocations is written, cold starts, 5xx responses and
+# invocations with counts always are. Each line carries its SampleRate so counts can be scaled back.
+
+DEFAULT_NAMESPACE = 'BlogBackend'
+MILLISECONDS = 'Milliseconds'
+COUNT = 'Count'
+
+# Metric name prefixes for AWS services
+SERVICE_LABELS = {
+    'dynamodb': 'DynamoDB',
+    's3': 'S3'
+}
+
+
+def _sample_rate() -> float:
+    try:
+        return min(1.0, max(0.0, float(os.environ.get('METRICS_SAMPLE_RATE', '1'))))
+    except ValueError:
+        return 1.0
+
+
+NAMESPACE = os.environ.get('METRICS_NAMESPACE') or DEFAULT_NAMESPACE
+SAMPLE_RATE = _sample_rate()
+
+_cold_start = True
+_current: Optional['Invocation'] = None
+# Phases timed while no invocation was running (e.g. imports), added to the next one
+_pending_phases: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+class Invocation:
+    """Timings collected during one invocation."""
+    
+    def __init__(self, route: str, request_id: Optional[str], cold_start: bool):
+        self.route = route
+        self.request_id = request_id
+        self.cold_start = cold_start
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        # 'service.Operation' -> [calls, ms, retries, errors]
+        self.calls: Dict[str, List[float]] = {}
+        # 'table' or 'table/index' -> [read units, write units]
+        self.capacity: Dict[str, List[float]] = {}
+        self.counts: Dict[str, float] = {}
+    
+    def add_phase(self, name: str, ms: float) -> None:
+        with _lock:
+            self.phases[name] = self.phases.get(name, 0.0) + ms
+    
+    def add_call(self, service: str, operation: str, ms: float, retries: int, error: bool) -> None:
+        # AWS calls can come from the helpers' thread pools
+        with _lock:
+            stats = self.calls.setdefault(f"{service}.{operation}", [0, 0.0, 0, 0])
+            stats[0] += 1
+            stats[1] += ms
+            stats[2] += retries
+            stats[3] += int(error)
+    
+    def add_capacity(self, name: str, read_units: float, write_units: float) -> None:
+        with _lock:
+            units = self.capacity.setdefault(name, [0.0, 0.0])
+            units[0] += read_units
+            units[1] += write_units
+    
+    def add_count(self, name: str, value: float) -> None:
+        with _lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+
+def current() -> Optional[Invocation]:
+    """The running invocation, if any."""
+    return _current
+
+
+def start_invocation(event: Dict[str, Any]) -> Invocation:
+    """Start timing an invocation (called by run_pipeline)."""
+    global _current, _cold_start
+    request_context = event.get('requestContext') or {}
+    invocation = Invocation(
+        event.get('routeKey') or event.get('rawPath') or '',
+        request_context.get('requestId'),
+        _cold_start
+    )
+    with _lock:
+        invocation.phases.update(_pending_phases)
+        _pending_phases.clear()
+    _cold_start = False
+    _current = invocation
+    return invocation
+
+
+def add_capacity(name: str, read_units: float, write_units: float) -> None:
+    """Add consumed DynamoDB capacity of a table or index to the running invocation."""
+    invocation = _current
+    if invocation is not None:
+        invocation.add_capacity(name, read_units, write_units)
+
+
+def add_count(name: str, value: float = 1) -> None:
+    """Add to a count metric of the running invocation."""
+    invocation = _current
+    if invocation is not None:
+        invocation.add_count(name, value)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block as a phase of the running invocation (times add up)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        invocation = _current
+        if invocation is not None:
+            invocation.add_phase(name, ms)
+        else:
+            with _lock:
+                _pending_phases[name] = _pending_phases.get(name, 0.0) + ms
+
+
+def init_cpu_ms() -> float:
+    """CPU time the process used so far (on a cold start: runtime and handler init)."""
+    return time.process_time() * 1000
+
+
+def build_record(invocation: Invocation, status_code: int, duration_ms: float) -> Dict[str, Any]:
+    """Build the EMF record of a finished invocation."""
+    values: Dict[str, float] = {'Duration': duration_ms, 'ColdStart': int(invocation.cold_start)}
+    units = {'Duration': MILLISECONDS, 'ColdStart': COUNT}
+    if invocation.cold_start:
+        values['InitCpuTime'] = init_cpu_ms()
+        units['InitCpuTime'] = MILLISECONDS
+    
+    for name, ms in invocation.phases.items():
+        metric = f"{name.capitalize()}Time"
+        values[metric] = ms
+        units[metric] = MILLISECONDS
+    
+    operations = {}
+    for key, (calls, ms, retries, errors) in invocation.calls.items():
+        service, operation = key.split('.', 1)
+        label = SERVICE_LABELS.get(service, service.capitalize())
+        for suffix, value, unit in (('Time', ms, MILLISECONDS), ('Calls', calls, COUNT),
+                                    ('Retries', retries, COUNT), ('Errors', errors, COUNT)):
+            values[label + suffix] = values.get(label + suffix, 0) + value
+            units[label + suffix] = unit
+        operations[key] = {'calls': calls, 'ms': round(ms, 2), 'retries': retries, 'errors': errors}
+    
+    for name, value in invocation.counts.items():
+        values[name] = value
+        units[name] = COUNT
+    
+    capacity = {}
+    if invocation.capacity:
+        values['DynamoDBReadCapacity'] = sum(read for read, _ in invocation.capacity.values())
+        values['DynamoDBWriteCapacity'] = sum(write for _, write in invocation.capacity.values())
+        units['DynamoDBReadCapacity'] = units['DynamoDBWriteCapacity'] = COUNT
+        capacity = {name: {'read': read, 'write': write} for name, (read, write) in invocation.capacity.items()}
+    
+    record: Dict[str, Any] = {
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': NAMESPACE,
+                'Dimensions': [['Function', 'Route']],
+                'Metrics': [{'Name': name, 'Unit': unit} for name, unit in units.items()]
+            }]
+        },
+        'Function': os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'local'),
+        'Route': invocation.route,
+        'RequestId': invocation.request_id,
+        'StatusCode': status_code,
+        'SampleRate': SAMPLE_RATE,
+        'AwsCalls': operations
+    }
+    if capacity:
+        record['ConsumedCapacity'] = capacity
+    if invocation.cold_start:
+        record['InitType'] = os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE', 'on-demand')
+    record.update({name: round(value, 2) for name, value in values.items()})
+    return record
+
+
+def finish_invocation(status_code: int) -> Optional[Dict[str, Any]]:
+    """
+    Stop timing the running invocation and write its EMF line.
+    
+    Returns:
+        The record written, or None if the invocation was not sampled
+    """
+    global _current
+    invocation = _current
+    if invocation is None:
+        return None
+    _current = None
+    
+    duration_ms = (time.perf_counter() - invocation.start) * 1000
+    if not (invocation.cold_start or status_code >= 500 or invocation.counts or random.random() < SAMPLE_RATE):
+        return None
+    record = build_record(invocation, status_code, duration_ms)
+    print(json.dumps(record, separators=(',', ':'), default=str))
+    return record
+
+
+def _before_call(model: Any = None, context: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+    if context is not None:
+        context['metrics_call'] = (model, time.perf_counter())
+
+
+def _record_call(context: Optional[Dict[str, Any]], retries: int, error: bool) -> None:
+    call = context.pop('metrics_call', None) if context else None
+    invocation = _current
+    if call is None or invocation is None:
+        return
+    model, start = call
+    ms = (time.perf_counter() - start) * 1000
+    invocation.add_call(model.service_model.service_name, model.name, ms, retries, error)
+
+
+def _after_call(
+    http_response: Any = None,
+    parsed: Optional[Dict[str, Any]] = None,
+    context: Optional[Dict[str, Any]] = None,
+    **kwargs: Any
+) -> None:
+    metadata = (parsed or {}).get('ResponseMetadata') or {}
+    error = http_response is not None and http_response.status_code >= 300
+    _record_call(context, metadata.get('RetryAttempts', 0), error)
+
+
+def _after_call_error(context: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+    # The request got no response (connection errors, timeouts after the last attempt)
+    _record_call(context, 0, True)
+
+
+def instrument_client(client: Any) -> Any:
+    """Register the timing hooks on a botocore client; returns the client."""
+    events = client.meta.events
+    events.register('before-call.*.*', _before_call, unique_id='metrics-before-call')
+    events.register('after-call.*.*', _after_call, unique_id='metrics-after-call')
+    events.register('after-call-error.*.*', _after_call_error, unique_id='metrics-after-call-error')
+    return client
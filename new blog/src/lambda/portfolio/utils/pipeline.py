@@ -0,0 +1,593 @@
+import base64
+import binascii
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import re
+import tempfile
+from typing import Dict, Any, BinaryIO, Callable, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+from utils.metrics import finish_invocation, phase, start_invocation
+
+# Shared request pipeline for the Lambda handlers:
+#
+#   parse event -> authenticate (admin endpoints) -> decode JSON body
+#   -> endpoint function -> encode response
+#
+# Responses are encoded by a pluggable encoder. The stdlib encoder is the
+# default; orjson is used when it is installed (JSON_ENCODER=auto), and
+# JSON_ENCODER=stdlib / orjson forces one. Values JSON can't represent
+# (datetimes, Decimals) are encoded with str(), as json.dumps(default=str) did.
+#
+# GET endpoints answer conditionally: conditional_response sends an ETag
+# (the endpoint's, or a hash of the body) and a bodyless 304 when it matches
+# If-None-Match. Endpoints that know their ETag before reading the data call
+# not_modified / not_modified_response first and skip the read.
+#
+# API Gateway HTTP APIs don't compress responses, so the pipeline does:
+# bodies of at least COMPRESSION_MIN_BYTES (default 1024) are compressed with
+# the first coding in COMPRESSION_ENCODINGS (default 'br,gzip'; empty turns
+# compression off) that the client's Accept-Encoding allows, and returned
+# base64-encoded. GZIP_LEVEL (1-9, default 6) and BROTLI_QUALITY (0-11,
+# default 4) set the levels; br needs the optional brotli package.
+#
+# Uploads sent as base64 in a JSON field are decoded by decode_upload_body
+# in UPLOAD_CHUNK_CHARS pieces into a temporary file that stays in memory up
+# to UPLOAD_SPOOL_MAX_BYTES (default 1 MB) and moves to /tmp beyond, so
+# neither the decoded bytes nor a second copy of the base64 text is held.
+#
+# Every run is timed by utils.metrics (parse, endpoint, encode and compress
+# phases, AWS calls) and reported as one CloudWatch EMF log line.
+
+# Precomputed response headers (shared, treat as read-only)
+JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Vary': 'Accept-Encoding'
+}
+
+# Browsers store responses with an ETag and revalidate them on every use
+CONDITIONAL_HEADERS = {
+    **JSON_HEADERS,
+    'Cache-Control': 'no-cache'
+}
+
+# Request bodies read line by line by decode_records
+NDJSON_CONTENT_TYPES = frozenset({'application/x-ndjson', 'application/ndjson', 'application/jsonl'})
+
+# Base64 characters decoded at a time by decode_upload_body (a multiple of 4)
+UPLOAD_CHUNK_CHARS = 64 * 1024
+
+_stdlib_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+
+def stdlib_encode(data: Any) -> str:
+    """Encode with the stdlib C encoder (reused instance, compact separators)."""
+    return _stdlib_encoder.encode(data)
+
+
+def _orjson_encoder() -> Optional[Callable[[Any], str]]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    
+    options = orjson.OPT_NON_STR_KEYS
+    
+    def orjson_encode(data: Any) -> str:
+        return orjson.dumps(data, default=str, option=options).decode('utf-8')
+    
+    return orjson_encode
+
+
+def _select_encoder() -> Callable[[Any], str]:
+    choice = os.environ.get('JSON_ENCODER', 'auto').lower()
+    if choice in ('auto', 'orjson'):
+        encoder = _orjson_encoder()
+        if encoder is not None:
+            return encoder
+    return stdlib_encode
+
+
+_encode = _select_encoder()
+
+
+def set_encoder(encoder: Callable[[Any], str]) -> None:
+    """Replace the response encoder (a callable returning a JSON string)."""
+    global _encode
+    _encode = encoder
+
+
+def get_encoder() -> Callable[[Any], str]:
+    """Get the response encoder in use."""
+    return _encode
+
+
+def encode_json(data: Any) -> str:
+    """Encode a response body with the configured encoder."""
+    return _encode(data)
+
+
+def success_response(status_code: int, data: Any) -> Dict[str, Any]:
+    """Create a successful API Gateway response."""
+    with phase('encode'):
+        body = _encode(data)
+    return {
+        'statusCode': status_code,
+        'headers': JSON_HEADERS,
+        'body': body
+    }
+
+
+def error_response(status_code: int, message: str) -> Dict[str, Any]:
+    """Create an error API Gateway response."""
+    return {
+        'statusCode': status_code,
+        'headers': JSON_HEADERS,
+        'body': _encode({'error': message})
+    }
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+COMPRESSION_MIN_BYTES = _env_int('COMPRESSION_MIN_BYTES', 1024)
+GZIP_LEVEL = _env_int('GZIP_LEVEL', 6)
+BROTLI_QUALITY = _env_int('BROTLI_QUALITY', 4)
+UPLOAD_SPOOL_MAX_BYTES = _env_int('UPLOAD_SPOOL_MAX_BYTES', 1024 * 1024)
+
+
+def gzip_compress(data: bytes) -> bytes:
+    """gzip at GZIP_LEVEL (mtime 0, so equal bodies compress to equal bytes)."""
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _brotli_compressor() -> Optional[Callable[[bytes], bytes]]:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    
+    def brotli_compress(data: bytes) -> bytes:
+        return brotli.compress(data, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+    
+    return brotli_compress
+
+
+def _select_compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    available = {'gzip': gzip_compress}
+    brotli_compress = _brotli_compressor()
+    if brotli_compress is not None:
+        available['br'] = brotli_compress
+    
+    names = os.environ.get('COMPRESSION_ENCODINGS', 'br,gzip').split(',')
+    return {
+        name.strip(): available[name.strip()]
+        for name in names if name.strip() in available
+    }
+
+
+# Content codings offered, in preference order
+COMPRESSORS = _select_compressors()
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    codings = {}
+    for part in value.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, number = param.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def negotiate_encoding(event: Dict[str, Any], offered: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Pick the content coding for a response.
+    
+    Args:
+        event: API Gateway event (for Accept-Encoding)
+        offered: Codings in preference order (default: COMPRESSORS)
+    
+    Returns:
+        The accepted coding with the highest q (ties go to the earlier
+        offered one), or None for an uncompressed response
+    """
+    headers = event.get('headers') or {}
+    accepted = parse_accept_encoding(headers.get('accept-encoding') or '')
+    if not accepted:
+        return None
+    
+    best, best_q = None, 0.0
+    for coding in COMPRESSORS if offered is None else offered:
+        q = accepted.get(coding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_response(event: Dict[str, Any], response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compress a response body if it is large enough and the client accepts it.
+    
+    Returns:
+        The response, base64-encoded with Content-Encoding set if compressed
+    """
+    body = response.get('body')
+    if (
+        not COMPRESSORS
+        or not isinstance(body, str)
+        or response.get('isBase64Encoded')
+        or len(body) < COMPRESSION_MIN_BYTES
+    ):
+        return response
+    
+    coding = negotiate_encoding(event)
+    if coding is None:
+        return response
+    
+    with phase('compress'):
+        raw = body.encode('utf-8')
+        compressed = COMPRESSORS[coding](raw)
+    if len(compressed) >= len(raw):
+        return response
+    
+    headers = {**response.get('headers', {}), 'Content-Encoding': coding}
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        # Same entity, different bytes: only weakly equal to the identity response
+        headers['ETag'] = f"W/{etag}"
+    
+    return {
+        **response,
+        'headers': headers,
+        'body': base64.b64encode(compressed).decode('ascii'),
+        'isBase64Encoded': True
+    }
+
+
+def format_etag(etag: str) -> str:
+    """Quote an entity tag for the ETag header."""
+    return f'"{etag}"'
+
+
+def body_etag(body: str) -> str:
+    """Hash an encoded response body (ETag for responses without a stored one)."""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+
+
+def if_none_match(event: Dict[str, Any]) -> FrozenSet[str]:
+    """
+    Parse the If-None-Match header.
+    
+    Returns:
+        Unquoted entity tags (weak tags compare equal to strong ones), or {'*'}
+    """
+    headers = event.get('headers') or {}
+    value = headers.get('if-none-match') or ''
+    tags = set()
+    for tag in value.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag:
+            tags.add(tag)
+    return frozenset(tags)
+
+
+def not_modified(event: Dict[str, Any], etag: Optional[str]) -> bool:
+    """Check whether the client's cached copy matches etag."""
+    if not etag:
+        return False
+    tags = if_none_match(event)
+    return etag in tags or '*' in tags
+
+
+def not_modified_response(etag: str) -> Dict[str, Any]:
+    """Create a bodyless 304 Not Modified response."""
+    return {
+        'statusCode': 304,
+        'headers': {**CONDITIONAL_HEADERS, 'ETag': format_etag(etag)},
+        'body': ''
+    }
+
+
+def conditional_response(
+    event: Dict[str, Any],
+    data: Any,
+    etag: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Create a 200 response with an ETag, or a 304 if the client already has it.
+    
+    Args:
+        event: API Gateway event (for If-None-Match)
+        data: Response data
+        etag: Entity tag of the data; a hash of the encoded body if None
+    
+    Returns:
+        API Gateway response
+    """
+    with phase('encode'):
+        body = _encode(data)
+    if etag is None:
+        etag = body_etag(body)
+    if not_modified(event, etag):
+        return not_modified_response(etag)
+    return {
+        'statusCode': 200,
+        'headers': {**CONDITIONAL_HEADERS, 'ETag': format_etag(etag)},
+        'body': body
+    }
+
+
+def is_admin(event: Dict[str, Any]) -> bool:
+    """Check the x-admin-token header against SECRET_TOKEN (constant-time comparison)."""
+    headers = event.get('headers') or {}
+    admin_token = headers.get('x-admin-token', '')
+    secret_token = os.environ.get('SECRET_TOKEN', '')
+    
+    if not secret_token or not admin_token:
+        return False
+    
+    try:
+        return hmac.compare_digest(admin_token.encode('utf-8'), secret_token.encode('utf-8'))
+    except Exception:
+        return False
+
+
+def decode_body(event: Dict[str, Any]) -> Any:
+    """
+    Decode the JSON request body (base64-decoding it first if needed).
+    
+    Returns:
+        Parsed body ({} when empty)
+    
+    Raises:
+        json.JSONDecodeError: If the body is not valid JSON
+    """
+    body = _body_text(event, '{}')
+    
+    # Parse body if it's a string
+    if isinstance(body, str):
+        body = json.loads(body) if body else {}
+    return body
+
+
+def _body_text(event: Dict[str, Any], default: str) -> Any:
+    body = event.get('body', default)
+    
+    # Handle base64 encoded body if needed
+    if event.get('isBase64Encoded', False) and body:
+        body = base64.b64decode(body).decode('utf-8')
+    return body
+
+
+def decode_records(event: Dict[str, Any]) -> Any:
+    """
+    Decode a request body holding many JSON records: a JSON array, or NDJSON
+    (one JSON value per line) when the Content-Type says so or the body is
+    more than one JSON value.
+    
+    Returns:
+        List of records for NDJSON, otherwise the parsed body ([] when empty;
+        callers check that it is a list)
+    
+    Raises:
+        json.JSONDecodeError: If the body (or an NDJSON line) is not valid JSON
+    """
+    body = _body_text(event, '')
+    if not isinstance(body, str):
+        return body
+    
+    headers = event.get('headers') or {}
+    content_type = headers.get('content-type', '').split(';', 1)[0].strip().lower()
+    if content_type not in NDJSON_CONTENT_TYPES:
+        try:
+            return json.loads(body) if body.strip() else []
+        except json.JSONDecodeError as e:
+            if not e.msg.startswith('Extra data'):
+                raise
+    return [json.loads(line) for line in body.splitlines() if line.strip()]
+
+
+def decode_upload_body(event: Dict[str, Any], field: str) -> Tuple[Any, Optional[BinaryIO]]:
+    """
+    Decode a JSON request body carrying a base64 upload in one of its fields.
+    
+    The body (base64-decoded first if needed) is read in chunks: the field's
+    value is decoded straight into a spooled temporary file and only the
+    rest of the body is parsed as JSON. Bodies the chunked reader can't
+    handle (escaped characters or non-base64 text in the value, the field
+    not at the top level) are decoded the usual way, with the same result.
+    
+    Args:
+        event: API Gateway HTTP API (v2) event
+        field: Name of the base64 field, e.g. 'imageBytes'
+    
+    Returns:
+        (parsed body without the field, the decoded field as a binary file
+        at position 0 - None when the field is missing or empty); the caller
+        closes the file
+    
+    Raises:
+        json.JSONDecodeError: If the body is not valid JSON
+        binascii.Error: If the field is not valid base64
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_BYTES)
+    try:
+        body = _stream_upload_body(event, field, spool)
+        if body is None:
+            spool.seek(0)
+            spool.truncate()
+            body = decode_body(event)
+            value = body.pop(field, None) if isinstance(body, dict) else None
+            if value:
+                if not isinstance(value, str):
+                    raise binascii.Error(f"{field} must be a base64 string")
+                spool.write(base64.b64decode(value))
+    except BaseException:
+        spool.close()
+        raise
+    
+    if not spool.tell():
+        spool.close()
+        return body, None
+    spool.seek(0)
+    return body, spool
+
+
+def _stream_upload_body(event: Dict[str, Any], field: str, spool: BinaryIO) -> Any:
+    # The parsed body, with the field decoded into spool; None to fall back
+    if not isinstance(event.get('body'), str):
+        return None
+    try:
+        text = _split_field(_body_chunks(event), field, spool)
+    except binascii.Error:
+        return None
+    if text is None:
+        return None
+    
+    body = json.loads(text.decode('utf-8'))
+    # The key matched at another level if the top level has no emptied field
+    if not isinstance(body, dict) or body.get(field) != '':
+        return None
+    del body[field]
+    return body
+
+
+def _body_chunks(event: Dict[str, Any]) -> Iterator[bytes]:
+    body = event['body']
+    encoded = event.get('isBase64Encoded', False)
+    for offset in range(0, len(body), UPLOAD_CHUNK_CHARS):
+        piece = body[offset:offset + UPLOAD_CHUNK_CHARS]
+        yield binascii.a2b_base64(piece, strict_mode=True) if encoded else piece.encode('utf-8')
+
+
+def _split_field(chunks: Iterator[bytes], field: str, spool: BinaryIO) -> Optional[bytes]:
+    """
+    Decode the string value of `"field": "..."` into spool while reading the
+    body; return the body text with the value emptied (None if the field
+    was not found or its value holds escapes).
+    
+    Raises:
+        binascii.Error: If the value is not strict base64
+    """
+    key = re.compile(b'"' + re.escape(field.encode('utf-8')) + rb'"\s*:\s*"')
+    text = bytearray()
+    pending = b''
+    state = 'key'
+    for chunk in chunks:
+        if state == 'key':
+            # Only the tail of what was searched already can start a match
+            searched = max(0, len(text) - 64)
+            text += chunk
+            match = key.search(text, searched)
+            if match is None:
+                continue
+            chunk = bytes(text[match.end():])
+            del text[match.end():]
+            state = 'value'
+        
+        if state == 'value':
+            # Base64 needs no escapes, so the first quote ends the value
+            end = chunk.find(b'"')
+            value = pending + (chunk if end < 0 else chunk[:end])
+            if b'\\' in value:
+                return None
+            usable = len(value) if end >= 0 else len(value) - len(value) % 4
+            spool.write(binascii.a2b_base64(value[:usable], strict_mode=True))
+            pending = value[usable:]
+            if end < 0:
+                continue
+            chunk = chunk[end:]
+            state = 'rest'
+        
+        text += chunk
+    
+    return bytes(text) if state == 'rest' else None
+
+
+class Request(NamedTuple):
+    """A parsed API Gateway HTTP API (v2) event."""
+    event: Dict[str, Any]
+    headers: Dict[str, Any]
+    path_params: Dict[str, Any]
+    query_params: Dict[str, Any]
+    body: Any
+
+
+def parse_event(event: Dict[str, Any], json_body: bool = False) -> Request:
+    """Extract the parts of the event the handlers use."""
+    return Request(
+        event=event,
+        headers=event.get('headers') or {},
+        path_params=event.get('pathParameters') or {},
+        query_params=event.get('queryStringParameters') or {},
+        body=decode_body(event) if json_body else None
+    )
+
+
+def run_pipeline(
+    event: Dict[str, Any],
+    endpoint: Callable[[Request], Dict[str, Any]],
+    admin: bool = False,
+    json_body: bool = False
+) -> Dict[str, Any]:
+    """
+    Run a request through the shared pipeline.
+    
+    Args:
+        event: API Gateway HTTP API (v2) event
+        endpoint: Function taking the Request and returning a response
+            (built with success_response / error_response)
+        admin: Require a valid x-admin-token header
+        json_body: Decode the request body as JSON
+    
+    Returns:
+        API Gateway response (compressed when large, see compress_response)
+    """
+    start_invocation(event)
+    response = _dispatch(event, endpoint, admin, json_body)
+    finish_invocation(response.get('statusCode', 200))
+    return response
+
+
+def _dispatch(
+    event: Dict[str, Any],
+    endpoint: Callable[[Request], Dict[str, Any]],
+    admin: bool,
+    json_body: bool
+) -> Dict[str, Any]:
+    if admin and not is_admin(event):
+        return error_response(400, "")
+    
+    try:
+        with phase('parse'):
+            request = parse_event(event, json_body)
+        with phase('endpoint'):
+            response = endpoint(request)
+    except json.JSONDecodeError:
+        return error_response(400, "Invalid JSON in request body")
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        return error_response(500, f"Internal server error: {str(e)}")
+    
+    return compress_response(event, response)
@@ -0,0 +1,229 @@
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+# Warm-container read-through cache for the data layer.
+#
+# Lives at module level next to the DynamoDB resource so it survives across
+# invocations of the same container. Each Lambda container has its own copy,
+# so writes only invalidate the local container; other containers serve
+# cached data until the entry's TTL expires.
+#
+# Values are stored pickled: every hit unpickles a private copy, so callers
+# may modify what they get (nested content lists included) without changing
+# the cached read, and the pickle's length is the entry's size.
+#
+# Configuration (environment variables):
+#   READ_CACHE_TTL_SECONDS      Default TTL for all tables (0 disables the cache)
+#   READ_CACHE_TTL_<TABLE>      Per-table TTL override, e.g. READ_CACHE_TTL_BLOGPOST=300
+#   READ_CACHE_MAX_ENTRIES      Maximum number of cached reads (LRU eviction)
+#   READ_CACHE_MAX_BYTES        Maximum estimated size of all cached values
+#   READ_CACHE_BYPASS           Set to 1 to skip the cache entirely (for measurements)
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+_MISSING = object()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class ReadCache:
+    """
+    Bounded LRU cache with per-table TTLs and byte-size accounting.
+    
+    Values are kept pickled, so get() returns a new copy every time.
+    Keys are (table_name, read_key) tuples, where read_key is any hashable
+    that identifies the read (item key, scan/query parameters).
+    """
+    
+    def __init__(
+        self,
+        default_ttl: float = 0,
+        table_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.default_ttl = default_ttl
+        self.table_ttls = dict(table_ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bypass = False
+        self._entries = OrderedDict()  # (table, read_key) -> (expires_at, size, pickled value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def ttl_for(self, table_name: str) -> float:
+        """Get the TTL in seconds for a table (0 means not cached)."""
+        return self.table_ttls.get(table_name, self.default_ttl)
+    
+    def enabled_for(self, table_name: str) -> bool:
+        """Check whether reads from a table go through the cache."""
+        return not self.bypass and self.ttl_for(table_name) > 0
+    
+    def get(self, table_name: str, read_key: Any) -> Any:
+        """
+        Look up a cached read.
+        
+        Returns:
+            A copy of the cached value, or the module-level _MISSING sentinel on a miss
+        """
+        cache_key = (table_name, read_key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            
+            expires_at, size, blob = entry
+            if expires_at <= time.monotonic():
+                del self._entries[cache_key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return _MISSING
+            
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+        return pickle.loads(blob)
+    
+    def put(self, table_name: str, read_key: Any, value: Any) -> None:
+        """Store a read result, evicting least recently used entries as needed."""
+        ttl = self.ttl_for(table_name)
+        if ttl <= 0:
+            return
+        
+        # A snapshot: later changes to value by the caller are not cached
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        size = len(blob)
+        if size > self.max_bytes:
+            return
+        
+        cache_key = (table_name, read_key)
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            
+            self._entries[cache_key] = (time.monotonic() + ttl, size, blob)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+    
+    def invalidate_table(self, table_name: str) -> None:
+        """Drop every cached read for a table (called after local writes)."""
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == table_name]:
+                self._bytes -= self._entries.pop(cache_key)[1]
+    
+    def clear(self) -> None:
+        """Drop all cached reads and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.expirations = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'bypass': self.bypass
+            }
+
+
+def _table_ttls_from_env() -> Dict[str, float]:
+    ttls = {}
+    prefix = 'READ_CACHE_TTL_'
+    for name, value in os.environ.items():
+        if name.startswith(prefix) and name != 'READ_CACHE_TTL_SECONDS':
+            try:
+                ttls[name[len(prefix):].lower()] = float(value)
+            except ValueError:
+                continue
+    return ttls
+
+
+def _cache_from_env() -> ReadCache:
+    cache = ReadCache(
+        default_ttl=_env_float('READ_CACHE_TTL_SECONDS', 0),
+        table_ttls=_table_ttls_from_env(),
+        max_entries=_env_int('READ_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES),
+        max_bytes=_env_int('READ_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+    )
+    cache.bypass = os.environ.get('READ_CACHE_BYPASS', '') in ('1', 'true', 'True')
+    return cache
+
+
+read_cache = _cache_from_env()
+
+
+def make_read_key(*parts: Any) -> str:
+    """Build a stable cache key from read parameters."""
+    return json.dumps(parts, default=str, sort_keys=True, separators=(',', ':'))
+
+
+def is_miss(value: Any) -> bool:
+    """Check whether a value returned by ReadCache.get is a miss."""
+    return value is _MISSING
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Get the counters of the container's read cache."""
+    return read_cache.stats()
+
+
+def cached_read(table_name: str, read_key: Any, loader) -> Tuple[Any, bool]:
+    """
+    Read through the cache.
+    
+    Args:
+        table_name: Table the read belongs to (selects the TTL)
+        read_key: Key identifying the read
+        loader: Zero-argument callable performing the read on a miss
+            (a None result, e.g. item not found, is not cached)
+    
+    Returns:
+        (value, hit); the value is the caller's own (see ReadCache.get)
+    """
+    if not read_cache.enabled_for(table_name):
+        return loader(), False
+    
+    value = read_cache.get(table_name, read_key)
+    if not is_miss(value):
+        return value, True
+    
+    value = loader()
+    if value is not None:
+        read_cache.put(table_name, read_key, value)
+    return value, False
@@ -1,7 +1,4 @@
-import json
-import os
-import hmac
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any
 from datetime import datetime
 
 from utils.dynamodb_helper import (
@@ -9,6 +6,14 @@ from utils.dynamodb_helper import (
     create_item,
     get_item
 )
+from utils.etag import ETAG_ATTRIBUTE, content_etag, touch_list_etag
+from utils.validation import format_errors, validate_resume
+from utils.pipeline import (
+    Request,
+    error_response,
+    run_pipeline,
+    success_response
+)
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -17,89 +22,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     
     Endpoint: POST /resume
     """
-    # Check admin token authentication
-    headers = event.get('headers', {})
-    admin_token = headers.get('x-admin-token', '')
-    secret_token = os.environ.get('SECRET_TOKEN', '')
-    
-    if not secret_token or not admin_token:
-        return error_response(400, "")
-    
-    # Verify token using constant-time comparison to prevent timing attacks
-    try:
-        if not hmac.compare_digest(admin_token.encode('utf-8'), secret_token.encode('utf-8')):
-            return error_response(400, "")
-    except Exception:
-        return error_response(400, "")
-    
-    # API Gateway HTTP API v2 format
-    body = event.get('body', '{}')
-    
-    # Handle base64 encoded body if needed
-    if event.get('isBase64Encoded', False) and body:
-        import base64
-        body = base64.b64decode(body).decode('utf-8')
-    
-    try:
-        # Parse body if it's a string
-        if isinstance(body, str):
-            body = json.loads(body) if body else {}
-        
-        # Create resume item
-        result = create_resume(body)
-        if 'error' in result:
-            return error_response(result['status_code'], result['error'])
-        return success_response(result['status_code'], result['data'])
-    
-    except json.JSONDecodeError:
-        return error_response(400, "Invalid JSON in request body")
-    except Exception as e:
-        print(f"Error processing request: {str(e)}")
-        return error_response(500, f"Internal server error: {str(e)}")
+    return run_pipeline(event, handle_create, admin=True, json_body=True)
 
 
-def validate_resume(data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
-    """
-    Validate resume data structure.
-    
-    Returns:
-        (is_valid, error_message)
-    """
-    # Required fields
-    required_fields = ['id', 'title', 'company_name', 'image_url', 'start_month', 'end_month', 'description']
-    for field in required_fields:
-        if field not in data:
-            return False, f"Missing required field: {field}"
-    
-    # Validate id is a string
-    if not isinstance(data['id'], str) or not data['id'].strip():
-        return False, "id must be a non-empty string"
-    
-    # Validate title is a string
-    if not isinstance(data['title'], str) or not data['title'].strip():
-        return False, "title must be a non-empty string"
-    
-    # Validate company_name is a string
-    if not isinstance(data['company_name'], str) or not data['company_name'].strip():
-        return False, "company_name must be a non-empty string"
-    
-    # Validate image_url is a string
-    if not isinstance(data['image_url'], str) or not data['image_url'].strip():
-        return False, "image_url must be a non-empty string"
-    
-    # Validate start_month is a string
-    if not isinstance(data['start_month'], str) or not data['start_month'].strip():
-        return False, "start_month must be a non-empty string"
-    
-    # Validate end_month is a string (can be empty for current positions)
-    if not isinstance(data['end_month'], str):
-        return False, "end_month must be a string"
-    
-    # Validate description is a string
-    if not isinstance(data['description'], str) or not data['description'].strip():
-        return False, "description must be a non-empty string"
-    
-    return True, None
+def handle_create(request: Request) -> Dict[str, Any]:
+    """Create the resume item from the decoded request body."""
+    result = create_resume(request.body)
+    if 'error' in result:
+        return error_response(result['status_code'], result['error'])
+    return success_response(result['status_code'], result['data'])
 
 
 def create_resume(body: Dict[str, Any]) -> Dict[str, Any]:
@@ -118,53 +49,38 @@ def create_resume(body: Dict[str, Any]) -> Dict[str, Any]:
     }
     """
     # Validate the resume data
-    is_valid, error_message = validate_resume(body)
-    if not is_valid:
-        return {'error': f"Validation error: {error_message}", 'status_code': 400}
+    errors = validate_resume.errors(body)
+    if errors:
+        return {'error': f"Validation error: {format_errors(errors)}", 'status_code': 400}
     
     # Check if resume item with this id already exists
-    existing = get_item(EXPERIENCE_TABLE, {'id': body['id']})
+    existing = get_item(EXPERIENCE_TABLE, {'id': body['id']}, use_cache=False)
     if existing:
         return {'error': f"Resume item with id '{body['id']}' already exists", 'status_code': 409}
     
     # Add created_at timestamp
     body['created_at'] = datetime.utcnow().isoformat()
     
+    # Content hash for conditional GETs
+    body[ETAG_ATTRIBUTE] = content_etag(body)
+    
     # Store in DynamoDB (using id as the key)
     try:
         item = create_item(EXPERIENCE_TABLE, body)
-        return {
-            'data': {
-                'message': 'Resume item created successfully',
-                'id': item['id']
-            },
-            'status_code': 201
-        }
     except Exception as e:
         print(f"Error creating resume item: {str(e)}")
         return {'error': f"Failed to create resume item: {str(e)}", 'status_code': 500}
-
-
-def success_response(status_code: int, data: Any) -> Dict[str, Any]:
-    """Create a successful API Gateway response."""
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'body': json.dumps(data, default=str)
-    }
-
-
-def error_response(status_code: int, message: str) -> Dict[str, Any]:
-    """Create an error API Gateway response."""
+    
+    # The item is already stored, so a failure here is only logged
+    try:
+        touch_list_etag(EXPERIENCE_TABLE, item)
+    except Exception as e:
+        print(f"Error updating resume list version: {str(e)}")
+    
     return {
-        'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
+        'data': {
+            'message': 'Resume item created successfully',
+            'id': item['id']
         },
-        'body': json.dumps({'error': message})
+        'status_code': 201
     }
-
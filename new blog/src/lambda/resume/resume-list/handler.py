@@ -1,9 +1,23 @@
-import json
 from typing import Dict, Any
 
 from utils.dynamodb_helper import (
     EXPERIENCE_TABLE,
-    scan_table
+    scan_table,
+    scan_pages
+)
+from utils.etag import list_etag, strip_etag
+from utils.pipeline import (
+    Request,
+    conditional_response,
+    error_response,
+    not_modified,
+    not_modified_response,
+    run_pipeline
+)
+from utils.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    InvalidCursorError,
+    parse_limit
 )
 
 
@@ -12,13 +26,43 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Lambda handler for listing all resume items.
     
     Endpoint: GET /resume
+    
+    Responses carry an ETag; If-None-Match is answered with 304 Not Modified
+    (see utils/etag.py).
+    
+    Pass ?limit= and/or ?cursor= to read one page at a time; the response then
+    includes 'next_cursor' (null on the last page). Sorting applies within the page.
     """
-    # API Gateway HTTP API v2 format
-    query_params = event.get('queryStringParameters') or {}
+    return run_pipeline(event, handle_list)
+
+
+def handle_list(request: Request) -> Dict[str, Any]:
+    """List resume items for the query parameters."""
+    query_params = request.query_params
+    
+    try:
+        limit = parse_limit(query_params.get('limit'))
+    except ValueError as e:
+        return error_response(400, str(e))
+    cursor = query_params.get('cursor')
+    paginated = limit is not None or bool(cursor)
+    
+    # ETag from the table's list version: a matching If-None-Match skips the read
+    etag = list_etag(EXPERIENCE_TABLE, query_params)
+    if not_modified(request.event, etag):
+        return not_modified_response(etag)
     
     try:
-        # List all resume items
-        items = scan_table(EXPERIENCE_TABLE)
+        if paginated:
+            # Read a single page so the cost is fixed regardless of table size
+            page = next(scan_pages(EXPERIENCE_TABLE, limit=limit or DEFAULT_PAGE_LIMIT, cursor=cursor))
+            items = page.items
+        else:
+            # List all resume items
+            items = scan_table(EXPERIENCE_TABLE)
+        
+        # The stored etag is not part of the response
+        items = [strip_etag(item) for item in items]
         
         # Apply sorting
         sort_by = query_params.get('sort', 'start_month')
@@ -43,36 +87,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 reverse=(order == 'desc')
             )
         
-        return success_response(200, {
+        response_data = {
             'resume': items,
             'count': len(items)
-        })
+        }
+        if paginated:
+            response_data['next_cursor'] = page.cursor
+        
+        return conditional_response(request.event, response_data, etag)
     
-    except Exception as e:
-        print(f"Error processing request: {str(e)}")
-        return error_response(500, f"Internal server error: {str(e)}")
-
-
-def success_response(status_code: int, data: Any) -> Dict[str, Any]:
-    """Create a successful API Gateway response."""
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'body': json.dumps(data, default=str)
-    }
-
-
-def error_response(status_code: int, message: str) -> Dict[str, Any]:
-    """Create an error API Gateway response."""
-    return {
-        'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'body': json.dumps({'error': message})
-    }
-
+    except InvalidCursorError as e:
+        return error_response(400, str(e))
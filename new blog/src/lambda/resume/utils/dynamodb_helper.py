@@ -1,19 +1,129 @@
-import boto3
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+from typing import Dict, Any, Optional, Iterator, Tuple, List
 from decimal import Decimal
+import hashlib
 import json
+import os
+import random
+import time
 
-dynamodb = boto3.resource('dynamodb')
+from utils import aws_clients, metrics
+from utils.codec import get_codec
+from utils.pagination import Page, encode_cursor, decode_cursor
+from utils.read_cache import read_cache, cached_read, make_read_key
 
 # Table names
 BLOGPOST_TABLE = 'blogpost'
 PORTFOLIO_TABLE = 'portfolio'
 EXPERIENCE_TABLE = 'experience'
+BLOGPOST_INDEX_TABLE = 'blogpost_index'
+IMAGE_UPLOAD_TABLE = 'image_upload'
+
+# Batch limits (fixed by DynamoDB) and retry settings
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_WRITE_CHUNK_SIZE = 25
+BATCH_MAX_WORKERS = int(os.environ.get('DYNAMODB_BATCH_WORKERS', '8'))
+BATCH_MAX_ATTEMPTS = 8
+BATCH_BACKOFF_BASE = 0.05
+BATCH_BACKOFF_CAP = 2.0
+
+# Parallel scan settings
+SCAN_SEGMENTS = int(os.environ.get('DYNAMODB_SCAN_SEGMENTS', '1'))
+SCAN_MAX_WORKERS = int(os.environ.get('DYNAMODB_SCAN_WORKERS', '16'))
+
+# Capacity accounting: DYNAMODB_CONSUMED_CAPACITY=TOTAL or INDEXES (per table
+# and index) makes every call that supports it return ConsumedCapacity, and
+# the units are added to the invocation's metrics. Off by default.
+CONSUMED_CAPACITY = os.environ.get('DYNAMODB_CONSUMED_CAPACITY', '').upper()
+CAPACITY_MODES = ('TOTAL', 'INDEXES')
+WRITE_OPERATIONS = frozenset({
+    'PutItem', 'UpdateItem', 'DeleteItem', 'BatchWriteItem', 'TransactWriteItems'
+})
+
+_capacity_client = None
+
+
+class BatchOperationError(Exception):
+    """Raised when a batch request still has unprocessed keys/items after all retries."""
+    
+    def __init__(self, message: str, unprocessed: list):
+        super().__init__(message)
+        self.unprocessed = unprocessed
 
 
 def get_table(table_name: str):
-    """Get a DynamoDB table resource."""
-    return dynamodb.Table(table_name)
+    """
+    Get a DynamoDB table resource.
+    
+    Optional: the helpers in this module use the low-level client, so the
+    boto3 resource model is only loaded if this is called.
+    """
+    return aws_clients.get_resource('dynamodb').Table(table_name)
+
+
+def get_client():
+    """Get the low-level DynamoDB client (created on first use, thread-safe)."""
+    client = aws_clients.get_client('dynamodb')
+    if CONSUMED_CAPACITY in CAPACITY_MODES and client is not _capacity_client:
+        _track_capacity(client)
+    return client
+
+
+def _track_capacity(client) -> None:
+    """Register the consumed-capacity hooks on a client (idempotent)."""
+    global _capacity_client
+    events = getattr(getattr(client, 'meta', None), 'events', None)
+    if events is not None:
+        events.register('provide-client-params.dynamodb.*', _request_capacity,
+                        unique_id='dynamodb-request-capacity')
+        events.register('after-call.dynamodb.*', _collect_capacity, unique_id='dynamodb-collect-capacity')
+    _capacity_client = client
+
+
+def _request_capacity(params: Dict[str, Any], model: Any = None, **kwargs: Any) -> None:
+    if model is not None and 'ReturnConsumedCapacity' in model.input_shape.members:
+        params.setdefault('ReturnConsumedCapacity', CONSUMED_CAPACITY)
+
+
+def _collect_capacity(parsed: Optional[Dict[str, Any]] = None, model: Any = None, **kwargs: Any) -> None:
+    consumed = (parsed or {}).get('ConsumedCapacity')
+    if consumed:
+        write = model is not None and model.name in WRITE_OPERATIONS
+        for entry in consumed if isinstance(consumed, list) else [consumed]:
+            record_consumed_capacity(entry, write)
+
+
+def record_consumed_capacity(consumed: Dict[str, Any], write: bool = False) -> None:
+    """
+    Add a ConsumedCapacity entry to the running invocation's metrics.
+    
+    With INDEXES the table and each index are recorded separately (as
+    'table' and 'table/index'); with TOTAL the total goes to the table.
+    
+    Args:
+        consumed: ConsumedCapacity from a DynamoDB response
+        write: The call was a write (used when the entry has no read/write split)
+    """
+    table_name = consumed.get('TableName', '')
+    parts = [(table_name, consumed.get('Table') or consumed)]
+    for kind in ('GlobalSecondaryIndexes', 'LocalSecondaryIndexes'):
+        for index_name, capacity in (consumed.get(kind) or {}).items():
+            parts.append((f"{table_name}/{index_name}", capacity))
+    
+    for name, capacity in parts:
+        read_units = capacity.get('ReadCapacityUnits')
+        write_units = capacity.get('WriteCapacityUnits')
+        if read_units is None and write_units is None:
+            units = float(capacity.get('CapacityUnits', 0))
+            read_units, write_units = (0.0, units) if write else (units, 0.0)
+        metrics.add_capacity(name, float(read_units or 0), float(write_units or 0))
+
+
+def _wire_values(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert expression attribute values to AttributeValues."""
+    return get_codec().encode_wire(values)
 
 
 def decimal_default(obj):
@@ -23,14 +133,61 @@ def decimal_default(obj):
     raise TypeError
 
 
-def serialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+def serialize_item(item: Dict[str, Any], table_name: Optional[str] = None) -> Dict[str, Any]:
     """Convert DynamoDB item to JSON-serializable format."""
-    return json.loads(json.dumps(item, default=decimal_default))
+    return get_codec(table_name).decode(item)
 
 
-def deserialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+def deserialize_item(item: Dict[str, Any], table_name: Optional[str] = None) -> Dict[str, Any]:
     """Convert JSON item to DynamoDB format (handles Decimal conversion)."""
-    return json.loads(json.dumps(item), parse_float=Decimal)
+    return get_codec(table_name).encode(item)
+
+
+def build_projection(projection: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Build ProjectionExpression parameters for a list of attribute names.
+    
+    Every name (and every segment of dotted paths such as 'a.b') is aliased
+    through ExpressionAttributeNames, so reserved words like 'date' or
+    'content' need no special handling.
+    
+    Args:
+        projection: Attribute names to read, or None for all attributes
+    
+    Returns:
+        Dict with ProjectionExpression and ExpressionAttributeNames (empty if no projection)
+    """
+    if not projection:
+        return {}
+    
+    names = {}
+    aliases = {}
+    paths = []
+    for attribute in projection:
+        segments = []
+        for segment in attribute.split('.'):
+            if segment not in aliases:
+                aliases[segment] = f"#p{len(aliases)}"
+                names[aliases[segment]] = segment
+            segments.append(aliases[segment])
+        paths.append('.'.join(segments))
+    
+    return {
+        'ProjectionExpression': ', '.join(paths),
+        'ExpressionAttributeNames': names
+    }
+
+
+def _with_projection(params: Dict[str, Any], projection: Optional[List[str]]) -> Dict[str, Any]:
+    """Add projection parameters to scan/query/get parameters."""
+    projection_params = build_projection(projection)
+    if projection_params:
+        params['ProjectionExpression'] = projection_params['ProjectionExpression']
+        params['ExpressionAttributeNames'] = {
+            **params.get('ExpressionAttributeNames', {}),
+            **projection_params['ExpressionAttributeNames']
+        }
+    return params
 
 
 def create_item(table_name: str, item: Dict[str, Any]) -> Dict[str, Any]:
@@ -44,29 +201,46 @@ def create_item(table_name: str, item: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Created item
     """
-    table = get_table(table_name)
-    item = deserialize_item(item)
-    table.put_item(Item=item)
-    return serialize_item(item)
+    codec = get_codec(table_name)
+    wire_item = codec.encode_wire(item)
+    get_client().put_item(TableName=table_name, Item=wire_item)
+    read_cache.invalidate_table(table_name)
+    return codec.decode_wire(wire_item)
 
 
-def get_item(table_name: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def get_item(
+    table_name: str,
+    key: Dict[str, Any],
+    use_cache: bool = True,
+    projection: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
     """
     Get an item from DynamoDB by key.
     
     Args:
         table_name: Name of the DynamoDB table
         key: Dictionary containing the key attributes
+        use_cache: Read through the warm-container cache (pass False for
+            existence checks before writes)
+        projection: Optional list of attribute names to read
     
     Returns:
         Item if found, None otherwise
     """
-    table = get_table(table_name)
-    response = table.get_item(Key=key)
+    codec = get_codec(table_name)
+    get_params = _with_projection({'TableName': table_name, 'Key': codec.encode_wire(key)}, projection)
+    
+    def load():
+        response = get_client().get_item(**get_params)
+        if 'Item' in response:
+            return codec.decode_wire(response['Item'])
+        return None
+    
+    if not use_cache:
+        return load()
     
-    if 'Item' in response:
-        return serialize_item(response['Item'])
-    return None
+    item, _ = cached_read(table_name, make_read_key('get_item', get_params), load)
+    return item
 
 
 def update_item(
@@ -89,21 +263,22 @@ def update_item(
     Returns:
         Updated item
     """
-    table = get_table(table_name)
-    expression_attribute_values = deserialize_item(expression_attribute_values)
+    codec = get_codec(table_name)
     
     update_params = {
-        'Key': key,
+        'TableName': table_name,
+        'Key': codec.encode_wire(key),
         'UpdateExpression': update_expression,
-        'ExpressionAttributeValues': expression_attribute_values,
+        'ExpressionAttributeValues': _wire_values(expression_attribute_values),
         'ReturnValues': 'ALL_NEW'
     }
     
     if expression_attribute_names:
         update_params['ExpressionAttributeNames'] = expression_attribute_names
     
-    response = table.update_item(**update_params)
-    return serialize_item(response['Attributes'])
+    response = get_client().update_item(**update_params)
+    read_cache.invalidate_table(table_name)
+    return codec.decode_wire(response['Attributes'])
 
 
 def delete_item(table_name: str, key: Dict[str, Any]) -> bool:
@@ -118,80 +293,482 @@ def delete_item(table_name: str, key: Dict[str, Any]) -> bool:
         True if successful, False otherwise
     """
     try:
-        table = get_table(table_name)
-        table.delete_item(Key=key)
+        get_client().delete_item(TableName=table_name, Key=get_codec(table_name).encode_wire(key))
+        read_cache.invalidate_table(table_name)
         return True
     except Exception as e:
         print(f"Error deleting item: {str(e)}")
         return False
 
 
-def scan_table(table_name: str, filter_expression: Optional[str] = None) -> list:
+def _paginate(
+    operation,
+    params: Dict[str, Any],
+    table_name: Optional[str] = None,
+    use_cache: bool = True
+) -> Iterator[Tuple[list, Optional[Dict[str, Any]]]]:
+    """
+    Run a scan or query one DynamoDB page at a time.
+    
+    Pages are read through the warm-container cache when it is enabled
+    for the table.
+    
+    Yields:
+        (serialized items, LastEvaluatedKey or None) for each page
+    """
+    decode = get_codec(table_name).decode_wire
+    params = dict(params)
+    
+    def load():
+        response = operation(**params)
+        items = [decode(item) for item in response.get('Items', [])]
+        return items, response.get('LastEvaluatedKey')
+    
+    while True:
+        if use_cache and table_name:
+            (items, last_key), _ = cached_read(
+                table_name,
+                make_read_key(operation.__name__, params),
+                load
+            )
+        else:
+            items, last_key = load()
+        yield items, last_key
+        if not last_key:
+            return
+        params['ExclusiveStartKey'] = last_key
+
+
+def _pages(
+    operation,
+    params: Dict[str, Any],
+    scope: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+    table_name: Optional[str] = None
+) -> Iterator[Page]:
+    """Wrap _paginate with Limit and signed cursors."""
+    params = dict(params)
+    if limit:
+        params['Limit'] = limit
+    if cursor:
+        params['ExclusiveStartKey'] = decode_cursor(cursor, scope)
+    
+    for items, last_key in _paginate(operation, params, table_name):
+        yield Page(items, encode_cursor(last_key, scope) if last_key else None)
+
+
+def _query_scope(
+    table_name: str,
+    key_condition_expression: str,
+    expression_attribute_values: Dict[str, Any],
+    index_name: Optional[str]
+) -> str:
+    """Build the cursor scope for a query so cursors cannot be replayed on another query."""
+    condition = json.dumps(
+        [key_condition_expression, expression_attribute_values],
+        default=str,
+        sort_keys=True
+    )
+    digest = hashlib.sha256(condition.encode('utf-8')).hexdigest()[:16]
+    return f"query:{table_name}:{index_name or ''}:{digest}"
+
+
+def scan_pages(
+    table_name: str,
+    filter_expression: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    projection: Optional[List[str]] = None
+) -> Iterator[Page]:
+    """
+    Scan a DynamoDB table one page at a time.
+    
+    Args:
+        table_name: Name of the DynamoDB table
+        filter_expression: Optional filter expression
+        limit: Optional maximum number of items evaluated per page
+        cursor: Optional cursor returned with a previous page
+        projection: Optional list of attribute names to read
+    
+    Yields:
+        Page of items with the cursor for the next page (None on the last page)
+    
+    Raises:
+        InvalidCursorError: If the cursor is invalid
+    """
+    scan_params = {'TableName': table_name}
+    if filter_expression:
+        scan_params['FilterExpression'] = filter_expression
+    _with_projection(scan_params, projection)
+    
+    return _pages(get_client().scan, scan_params, f"scan:{table_name}", limit, cursor, table_name)
+
+
+def _scan_segment(client, params: Dict[str, Any], decode) -> Iterator[list]:
+    """Scan one segment of a parallel scan page by page (low-level client)."""
+    params = dict(params)
+    while True:
+        response = client.scan(**params)
+        yield [decode(item) for item in response.get('Items', [])]
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return
+        params['ExclusiveStartKey'] = last_key
+
+
+def parallel_scan_pages(
+    table_name: str,
+    segments: int,
+    filter_expression: Optional[str] = None,
+    ordered: bool = True,
+    max_workers: Optional[int] = None,
+    projection: Optional[List[str]] = None
+) -> Iterator[list]:
+    """
+    Scan a table with DynamoDB parallel scan (Segment/TotalSegments).
+    
+    Each segment is read by its own worker thread on a bounded pool.
+    
+    Args:
+        table_name: Name of the DynamoDB table
+        segments: Number of segments (TotalSegments)
+        filter_expression: Optional filter expression
+        ordered: If True, yield segment 0's items, then segment 1's, and so on
+            (deterministic order, segments are buffered until their turn).
+            If False, yield each page as soon as any worker reads it.
+        max_workers: Optional thread pool size (default: min(segments, DYNAMODB_SCAN_WORKERS))
+        projection: Optional list of attribute names to read
+    
+    Yields:
+        Lists of serialized items
+    """
+    client = get_client()
+    decode = get_codec(table_name).decode_wire
+    workers = max(1, min(max_workers or SCAN_MAX_WORKERS, segments))
+    
+    def segment_params(segment: int) -> Dict[str, Any]:
+        params = {'TableName': table_name, 'Segment': segment, 'TotalSegments': segments}
+        if filter_expression:
+            params['FilterExpression'] = filter_expression
+        return _with_projection(params, projection)
+    
+    if ordered:
+        def read_segment(segment: int) -> list:
+            items = []
+            for page in _scan_segment(client, segment_params(segment), decode):
+                items.extend(page)
+            return items
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(read_segment, segment) for segment in range(segments)]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+        return
+    
+    # Unordered: workers push pages to a bounded queue so memory stays flat
+    # even when the consumer is slower than DynamoDB.
+    pages = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+    done = object()
+    
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def stream_segment(segment: int) -> None:
+        try:
+            for page in _scan_segment(client, segment_params(segment), decode):
+                if not put(page):
+                    return
+            put(done)
+        except Exception as e:
+            put(e)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for segment in range(segments):
+            executor.submit(stream_segment, segment)
+        try:
+            remaining = segments
+            while remaining:
+                entry = pages.get()
+                if entry is done:
+                    remaining -= 1
+                elif isinstance(entry, Exception):
+                    raise entry
+                else:
+                    yield entry
+        finally:
+            stop.set()
+
+
+def scan_table(
+    table_name: str,
+    filter_expression: Optional[str] = None,
+    segments: Optional[int] = None,
+    projection: Optional[List[str]] = None
+) -> list:
     """
     Scan a DynamoDB table (use sparingly, prefer query for large tables).
     
+    Reads every page into memory; prefer scan_pages for anything user-facing.
+    
     Args:
         table_name: Name of the DynamoDB table
         filter_expression: Optional filter expression
+        segments: Optional number of parallel scan segments
+            (default: DYNAMODB_SCAN_SEGMENTS, 1 = sequential scan)
+        projection: Optional list of attribute names to read
     
     Returns:
         List of items
     """
-    table = get_table(table_name)
+    segments = segments or SCAN_SEGMENTS
+    if segments > 1:
+        def load():
+            items = []
+            for page_items in parallel_scan_pages(table_name, segments, filter_expression, projection=projection):
+                items.extend(page_items)
+            return items
+        
+        items, _ = cached_read(
+            table_name,
+            make_read_key('parallel_scan', segments, filter_expression, projection),
+            load
+        )
+        return items
     
-    scan_params = {}
+    scan_params = {'TableName': table_name}
     if filter_expression:
         scan_params['FilterExpression'] = filter_expression
+    _with_projection(scan_params, projection)
     
-    response = table.scan(**scan_params)
-    items = [serialize_item(item) for item in response.get('Items', [])]
-    
-    # Handle pagination
-    while 'LastEvaluatedKey' in response:
-        scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
-        response = table.scan(**scan_params)
-        items.extend([serialize_item(item) for item in response.get('Items', [])])
+    items = []
+    for page_items, _ in _paginate(get_client().scan, scan_params, table_name):
+        items.extend(page_items)
     
     return items
 
 
+def query_pages(
+    table_name: str,
+    key_condition_expression: str,
+    expression_attribute_values: Dict[str, Any],
+    index_name: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    projection: Optional[List[str]] = None,
+    scan_index_forward: bool = True
+) -> Iterator[Page]:
+    """
+    Query a DynamoDB table one page at a time.
+    
+    Args:
+        table_name: Name of the DynamoDB table
+        key_condition_expression: DynamoDB key condition expression
+        expression_attribute_values: Values for the condition expression
+        index_name: Optional GSI name
+        limit: Optional maximum number of items per page
+        cursor: Optional cursor returned with a previous page
+        projection: Optional list of attribute names to read
+        scan_index_forward: False to read in descending sort key order
+    
+    Yields:
+        Page of items with the cursor for the next page (None on the last page)
+    
+    Raises:
+        InvalidCursorError: If the cursor is invalid
+    """
+    scope = _query_scope(table_name, key_condition_expression, expression_attribute_values, index_name)
+    
+    query_params = {
+        'TableName': table_name,
+        'KeyConditionExpression': key_condition_expression,
+        'ExpressionAttributeValues': _wire_values(expression_attribute_values)
+    }
+    
+    if index_name:
+        query_params['IndexName'] = index_name
+    if not scan_index_forward:
+        query_params['ScanIndexForward'] = False
+    _with_projection(query_params, projection)
+    
+    return _pages(get_client().query, query_params, scope, limit, cursor, table_name)
+
+
 def query_table(
     table_name: str,
     key_condition_expression: str,
     expression_attribute_values: Dict[str, Any],
-    index_name: Optional[str] = None
+    index_name: Optional[str] = None,
+    projection: Optional[List[str]] = None,
+    scan_index_forward: bool = True,
+    limit: Optional[int] = None
 ) -> list:
     """
     Query a DynamoDB table.
     
+    Sort key ranges are expressed in the key condition, e.g.
+    'pk = :pk AND sk BETWEEN :low AND :high'.
+    
     Args:
         table_name: Name of the DynamoDB table
         key_condition_expression: DynamoDB key condition expression
         expression_attribute_values: Values for the condition expression
         index_name: Optional GSI name
+        projection: Optional list of attribute names to read
+        scan_index_forward: False to read in descending sort key order
+        limit: Optional maximum number of items to return (stops reading early)
     
     Returns:
         List of items
     """
-    table = get_table(table_name)
-    expression_attribute_values = deserialize_item(expression_attribute_values)
-    
     query_params = {
+        'TableName': table_name,
         'KeyConditionExpression': key_condition_expression,
-        'ExpressionAttributeValues': expression_attribute_values
+        'ExpressionAttributeValues': _wire_values(expression_attribute_values)
     }
     
     if index_name:
         query_params['IndexName'] = index_name
+    if not scan_index_forward:
+        query_params['ScanIndexForward'] = False
+    _with_projection(query_params, projection)
+    if limit:
+        query_params['Limit'] = limit
+    
+    items = []
+    for page_items, _ in _paginate(get_client().query, query_params, table_name):
+        items.extend(page_items)
+        if limit and len(items) >= limit:
+            return items[:limit]
+    
+    return items
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(BATCH_BACKOFF_CAP, BATCH_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _chunks(values: list, size: int) -> List[list]:
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+def _run_chunks(worker, chunks: List[list], max_workers: Optional[int]) -> list:
+    """Run worker over chunks on a bounded thread pool and return the results in order."""
+    if len(chunks) <= 1:
+        return [worker(chunk) for chunk in chunks]
+    
+    workers = min(max_workers or BATCH_MAX_WORKERS, len(chunks))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(worker, chunks))
+
+
+def batch_get_items(
+    table_name: str,
+    keys: List[Dict[str, Any]],
+    consistent_read: bool = False,
+    max_workers: Optional[int] = None,
+    projection: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get many items by key with BatchGetItem.
+    
+    Keys are de-duplicated and split into chunks of 100; chunks run
+    concurrently and UnprocessedKeys are retried with jittered backoff.
+    
+    Args:
+        table_name: Name of the DynamoDB table
+        keys: List of key dictionaries
+        consistent_read: Use strongly consistent reads
+        max_workers: Optional thread pool size (default: DYNAMODB_BATCH_WORKERS)
+        projection: Optional list of attribute names to read (must include
+            the key attributes if results are matched back to keys)
+    
+    Returns:
+        Found items (in no particular order; missing keys are omitted)
+    
+    Raises:
+        BatchOperationError: If keys are still unprocessed after all retries
+    """
+    codec = get_codec(table_name)
+    client = get_client()
     
-    response = table.query(**query_params)
-    items = [serialize_item(item) for item in response.get('Items', [])]
+    unique_keys = list({make_read_key(key): key for key in keys}.values())
+    wire_keys = [codec.encode_wire(key) for key in unique_keys]
     
-    # Handle pagination
-    while 'LastEvaluatedKey' in response:
-        query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
-        response = table.query(**query_params)
-        items.extend([serialize_item(item) for item in response.get('Items', [])])
+    def fetch(chunk: list) -> list:
+        items = []
+        request = {table_name: _with_projection({'Keys': chunk, 'ConsistentRead': consistent_read}, projection)}
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            response = client.batch_get_item(RequestItems=request)
+            items.extend(codec.decode_wire(item) for item in response.get('Responses', {}).get(table_name, []))
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                return items
+            time.sleep(_backoff_delay(attempt))
+        unprocessed = request.get(table_name, {}).get('Keys', [])
+        raise BatchOperationError(f"{len(unprocessed)} keys unprocessed after {BATCH_MAX_ATTEMPTS} attempts", unprocessed)
     
+    items = []
+    for chunk_items in _run_chunks(fetch, _chunks(wire_keys, BATCH_GET_CHUNK_SIZE), max_workers):
+        items.extend(chunk_items)
     return items
 
+
+def batch_write_items(
+    table_name: str,
+    items: Optional[List[Dict[str, Any]]] = None,
+    delete_keys: Optional[List[Dict[str, Any]]] = None,
+    max_workers: Optional[int] = None
+) -> int:
+    """
+    Put and/or delete many items with BatchWriteItem.
+    
+    Requests are split into chunks of 25; chunks run concurrently and
+    UnprocessedItems are retried with jittered backoff. Batch writes are
+    not conditional: existing items with the same key are overwritten.
+    
+    Args:
+        table_name: Name of the DynamoDB table
+        items: Items to put
+        delete_keys: Keys of items to delete
+        max_workers: Optional thread pool size (default: DYNAMODB_BATCH_WORKERS)
+    
+    Returns:
+        Number of write requests processed
+    
+    Raises:
+        BatchOperationError: If items are still unprocessed after all retries
+    """
+    codec = get_codec(table_name)
+    client = get_client()
+    
+    requests = [{'PutRequest': {'Item': codec.encode_wire(item)}} for item in items or []]
+    requests.extend({'DeleteRequest': {'Key': codec.encode_wire(key)}} for key in delete_keys or [])
+    
+    def write(chunk: list) -> int:
+        request = {table_name: chunk}
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            response = client.batch_write_item(RequestItems=request)
+            request = response.get('UnprocessedItems') or {}
+            if not request:
+                return len(chunk)
+            time.sleep(_backoff_delay(attempt))
+        unprocessed = request.get(table_name, [])
+        raise BatchOperationError(f"{len(unprocessed)} items unprocessed after {BATCH_MAX_ATTEMPTS} attempts", unprocessed)
+    
+    try:
+        return sum(_run_chunks(write, _chunks(requests, BATCH_WRITE_CHUNK_SIZE), max_workers))
+    finally:
+        read_cache.invalidate_table(table_name)
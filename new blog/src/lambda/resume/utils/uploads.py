@@ -0,0 +1,104 @@
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from utils.dynamodb_helper import IMAGE_UPLOAD_TABLE, create_item, get_item, update_item
+
+# Direct-to-S3 image uploads.
+#
+# POST /image/presign records a pending upload in the image_upload table
+# and returns a presigned PUT URL or POST policy for a new key; the client
+# sends the bytes straight to S3. POST /image/finalize checks the object
+# S3 received against the record and marks the upload complete:
+#
+#   id = <image id>   key, content_type, size (PUT: exact; POST: null),
+#                     method, status (pending / complete), created_at,
+#                     expires_at (epoch seconds, DynamoDB TTL; pending only),
+#                     etag, completed_at, variants (complete only; see
+#                     utils.image_variants)
+#
+# Pending records expire UPLOAD_RECORD_TTL_SECONDS after their URL does.
+
+PENDING = 'pending'
+COMPLETE = 'complete'
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# Largest accepted image (bytes) and lifetime of presigned URLs (seconds)
+MAX_IMAGE_BYTES = _env_int('IMAGE_MAX_BYTES', 10 * 1024 * 1024)
+PRESIGN_EXPIRES_SECONDS = _env_int('IMAGE_PRESIGN_EXPIRES_SECONDS', 300)
+UPLOAD_RECORD_TTL_SECONDS = 24 * 60 * 60
+
+
+def create_upload(
+    key: str,
+    content_type: str,
+    size: Optional[int],
+    method: str,
+    image_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Record a pending upload.
+    
+    Args:
+        key: S3 key the client uploads to
+        content_type: Content-Type the upload is signed for
+        size: Exact size the upload is signed for (None: any size up to MAX_IMAGE_BYTES)
+        method: 'PUT' or 'POST'
+        image_id: Id of the upload (default: a new UUID)
+    
+    Returns:
+        The stored record
+    """
+    return create_item(IMAGE_UPLOAD_TABLE, {
+        'id': image_id or str(uuid.uuid4()),
+        'key': key,
+        'content_type': content_type,
+        'size': size,
+        'method': method,
+        'status': PENDING,
+        'created_at': datetime.utcnow().isoformat(),
+        'expires_at': int(time.time()) + PRESIGN_EXPIRES_SECONDS + UPLOAD_RECORD_TTL_SECONDS
+    })
+
+
+def get_upload(upload_id: str) -> Optional[Dict[str, Any]]:
+    """Read an upload record (not cached: finalize must see the latest status)."""
+    return get_item(IMAGE_UPLOAD_TABLE, {'id': upload_id}, use_cache=False)
+
+
+def complete_upload(
+    upload_id: str,
+    size: int,
+    etag: str,
+    variants: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Mark an upload complete with the size and ETag S3 reports and the
+    image's variants, and drop its TTL so the record is kept.
+    
+    Returns:
+        The updated record
+    """
+    return update_item(
+        IMAGE_UPLOAD_TABLE,
+        {'id': upload_id},
+        'SET #status = :status, #size = :size, etag = :etag, completed_at = :completed_at, '
+        'variants = :variants REMOVE expires_at',
+        {
+            ':status': COMPLETE,
+            ':size': size,
+            ':etag': etag,
+            ':completed_at': datetime.utcnow().isoformat(),
+            ':variants': variants or {}
+        },
+        {'#status': 'status', '#size': 'size'}
+    )
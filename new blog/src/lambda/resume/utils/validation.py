@@ -0,0 +1,250 @@
+from itertools import chain
+from typing import Dict, Any, Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.metrics import phase
+
+# Declarative request validation.
+#
+# A schema maps field names to Field specs; compile_schema turns it into a
+# Validator once, at import, so a request only runs prebuilt check functions
+# (no per-call sets or branching on the spec). Checks run in schema order:
+# first the required fields, then each present field's type. A Validator can
+# stop at the first error (the single-item endpoints' behavior) or collect
+# every error, and validate_many checks a batch of documents in one call.
+#
+# Messages match the hand-written validators they replace, e.g.
+# "Missing required field: slug", "content item at index 3 must be an object".
+
+STRING = 'string'
+STRING_LIST = 'string_list'
+BLOCKS = 'blocks'
+
+BODY_ERROR = "request body must be a JSON object"
+
+# Errors listed in a response message; the rest are counted
+MAX_REPORTED_ERRORS = 20
+
+# Block lists from this length are checked with set operations first
+BULK_CHECK_MIN_ITEMS = 32
+
+
+class Field(NamedTuple):
+    """
+    Spec of one field.
+    
+    kind: STRING, STRING_LIST (list of strings) or BLOCKS (content blocks:
+        objects with exactly one of `allowed` as key and a string value)
+    required: Missing fields are an error
+    non_empty: Strings must not be empty or whitespace
+    item_label: Name of list items in messages (STRING_LIST)
+    allowed: Allowed block field names (BLOCKS)
+    """
+    kind: str
+    required: bool = True
+    non_empty: bool = False
+    item_label: str = 'item'
+    allowed: Tuple[str, ...] = ()
+
+
+Check = Callable[[Any, List[str], bool], None]
+
+_DICT_ONLY = frozenset([dict])
+_STR_ONLY = frozenset([str])
+_ONE_ONLY = frozenset([1])
+
+
+def _one_of(names: Tuple[str, ...]) -> str:
+    if len(names) < 3:
+        return ' or '.join(names)
+    return f"{', '.join(names[:-1])}, or {names[-1]}"
+
+
+def _compile_string(name: str, field: Field) -> Check:
+    message = f"{name} must be a non-empty string" if field.non_empty else f"{name} must be a string"
+    
+    if field.non_empty:
+        def check(value: Any, errors: List[str], collect_all: bool) -> None:
+            if not isinstance(value, str) or not value.strip():
+                errors.append(message)
+    else:
+        def check(value: Any, errors: List[str], collect_all: bool) -> None:
+            if not isinstance(value, str):
+                errors.append(message)
+    return check
+
+
+def _compile_string_list(name: str, field: Field) -> Check:
+    not_list = f"{name} must be a list"
+    label = field.item_label
+    
+    def check(value: Any, errors: List[str], collect_all: bool) -> None:
+        if not isinstance(value, list):
+            errors.append(not_list)
+            return
+        for index, item in enumerate(value):
+            if not isinstance(item, str):
+                errors.append(f"{label} at index {index} must be a string")
+                if not collect_all:
+                    return
+    return check
+
+
+def _compile_blocks(name: str, field: Field) -> Check:
+    not_list = f"{name} must be a list"
+    allowed = frozenset(field.allowed)
+    choices = _one_of(field.allowed)
+    
+    def block_error(index: int, block: Any) -> Optional[str]:
+        if not isinstance(block, dict):
+            return f"{name} item at index {index} must be an object"
+        if len(block) != 1:
+            return f"{name} item at index {index} must have exactly one field"
+        ((key, value),) = block.items()
+        if key not in allowed:
+            return f"{name} item at index {index}: field name '{key}' is not allowed. Must be one of: {choices}"
+        if not isinstance(value, str):
+            return f"{name} item at index {index}: {key} must be a string"
+        return None
+    
+    def check(value: Any, errors: List[str], collect_all: bool) -> None:
+        if not isinstance(value, list):
+            errors.append(not_list)
+            return
+        # Whole-list fast path for long lists: the per-block work runs in C
+        # (map, set.union), so valid lists of thousands of blocks skip the
+        # Python loop below
+        if (len(value) >= BULK_CHECK_MIN_ITEMS
+                and _DICT_ONLY.issuperset(map(type, value))
+                and _ONE_ONLY.issuperset(map(len, value))
+                and allowed.issuperset(set().union(*value))
+                and _STR_ONLY.issuperset(map(type, chain.from_iterable(map(dict.values, value))))):
+            return
+        for index, block in enumerate(value):
+            if type(block) is dict and len(block) == 1:
+                ((key, text),) = block.items()
+                if key in allowed and type(text) is str:
+                    continue
+            error = block_error(index, block)
+            if error is not None:
+                errors.append(error)
+                if not collect_all:
+                    return
+    return check
+
+
+_COMPILERS = {
+    STRING: _compile_string,
+    STRING_LIST: _compile_string_list,
+    BLOCKS: _compile_blocks
+}
+
+
+class Validator:
+    """A compiled schema (see compile_schema)."""
+    
+    def __init__(self, required: List[str], checks: List[Tuple[str, Check]]):
+        self.required = required
+        self.checks = checks
+    
+    def _errors(self, data: Any, collect_all: bool) -> List[str]:
+        if not isinstance(data, dict):
+            return [BODY_ERROR]
+        errors: List[str] = []
+        for name in self.required:
+            if name not in data:
+                errors.append(f"Missing required field: {name}")
+                if not collect_all:
+                    return errors
+        for name, check in self.checks:
+            if name in data:
+                check(data[name], errors, collect_all)
+                if errors and not collect_all:
+                    return errors
+        return errors
+    
+    def errors(self, data: Any, collect_all: bool = True) -> List[str]:
+        """
+        Validate a document.
+        
+        Args:
+            data: Decoded request body
+            collect_all: False to stop at the first error
+        
+        Returns:
+            Error messages (empty if valid)
+        """
+        with phase('validate'):
+            return self._errors(data, collect_all)
+    
+    def __call__(self, data: Any) -> Tuple[bool, Optional[str]]:
+        """Validate up to the first error; returns (is_valid, error_message)."""
+        errors = self.errors(data, collect_all=False)
+        return (False, errors[0]) if errors else (True, None)
+    
+    def validate_many(self, documents: Iterable[Any], collect_all: bool = True) -> Dict[int, List[str]]:
+        """
+        Validate a batch of documents in one pass.
+        
+        Returns:
+            Errors of the invalid documents, by position in the batch
+        """
+        with phase('validate'):
+            invalid = {}
+            for index, document in enumerate(documents):
+                errors = self._errors(document, collect_all)
+                if errors:
+                    invalid[index] = errors
+            return invalid
+
+
+def format_errors(errors: List[str], limit: int = MAX_REPORTED_ERRORS) -> str:
+    """Join error messages for a response (the first `limit`, then a count of the rest)."""
+    message = '; '.join(errors[:limit])
+    if len(errors) > limit:
+        message += f" (and {len(errors) - limit} more)"
+    return message
+
+
+def compile_schema(schema: Dict[str, Field]) -> Validator:
+    """Compile a schema ({field name: Field}, in check order) into a Validator."""
+    required = [name for name, field in schema.items() if field.required]
+    checks = [(name, _COMPILERS[field.kind](name, field)) for name, field in schema.items()]
+    return Validator(required, checks)
+
+
+CONTENT_FIELDS = ('paragraph', 'image_url', 'title')
+
+BLOGPOST_SCHEMA = {
+    'slug': Field(STRING, non_empty=True),
+    'id': Field(STRING, non_empty=True),
+    'title': Field(STRING, non_empty=True),
+    'title_image_url': Field(STRING, required=False),
+    'summary': Field(STRING, required=False),
+    'content': Field(BLOCKS, allowed=CONTENT_FIELDS),
+    'date': Field(STRING, non_empty=True),
+    'author': Field(STRING, non_empty=True),
+    'tags': Field(STRING_LIST, item_label='tag')
+}
+
+PORTFOLIO_SCHEMA = {
+    'id': Field(STRING, non_empty=True),
+    'slug': Field(STRING, non_empty=True),
+    'title': Field(STRING, non_empty=True),
+    'summary': Field(STRING, non_empty=True),
+    'content': Field(BLOCKS, allowed=CONTENT_FIELDS)
+}
+
+RESUME_SCHEMA = {
+    'id': Field(STRING, non_empty=True),
+    'title': Field(STRING, non_empty=True),
+    'company_name': Field(STRING, non_empty=True),
+    'image_url': Field(STRING, non_empty=True),
+    'start_month': Field(STRING, non_empty=True),
+    # Empty for current positions
+    'end_month': Field(STRING),
+    'description': Field(STRING, non_empty=True)
+}
+
+validate_blogpost = compile_schema(BLOGPOST_SCHEMA)
+validate_portfolio = compile_schema(PORTFOLIO_SCHEMA)
+validate_resume = compile_schema(RESUME_SCHEMA)
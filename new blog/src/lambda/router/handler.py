@@ -0,0 +1,118 @@
+import importlib
+import re
+from typing import Dict, Any, Callable, NamedTuple, Optional, Pattern, Tuple
+
+from utils.metrics import phase
+from utils.pipeline import error_response
+
+# Single-function ("router") deployment: one Lambda serves every route, so
+# all endpoints share warm containers and AWS clients instead of each
+# function going cold on its own (terraform deployment_mode = "router").
+#
+# The package holds this module, src/utils and each endpoint's handler.py
+# copied to functions/<name>.py (see terraform/package-lambdas.sh). API
+# Gateway passes the matched route as event['routeKey']; the route table maps
+# it to the endpoint's lambda_handler. Endpoint modules are imported on first
+# use, so a cold start only loads what its request needs; the import time is
+# reported with the invocation's metrics.
+
+FUNCTIONS_PACKAGE = 'functions'
+
+# routeKey -> endpoint module (the function's directory name with underscores)
+ROUTES = {
+    'POST /blogpost': 'blogpost_create',
+    'POST /blogpost/batch': 'blogpost_batch_create',
+    'GET /blogpost/{slug}': 'blogpost_get',
+    'GET /blogpost': 'blogpost_list',
+    'POST /portfolio': 'portfolio_create',
+    'GET /portfolio/{slug}': 'portfolio_get',
+    'GET /portfolio': 'portfolio_list',
+    'POST /resume': 'resume_create',
+    'GET /resume': 'resume_list',
+    'POST /image/upload': 'image_upload',
+    'POST /image/presign': 'image_presign',
+    'POST /image/finalize': 'image_finalize'
+}
+
+_PATH_PARAMETER = re.compile(r'\{(\w+)\}')
+
+
+class Route(NamedTuple):
+    """A compiled route: the endpoint module and a matcher for its path."""
+    module_name: str
+    method: str
+    pattern: Pattern
+
+
+def compile_routes(routes: Dict[str, str]) -> Dict[str, Route]:
+    """Compile the route table (done once, at import)."""
+    compiled = {}
+    for route_key, module_name in routes.items():
+        method, path = route_key.split(' ', 1)
+        segments = [
+            f"(?P<{parameter.group(1)}>[^/]+)" if parameter else re.escape(segment)
+            for segment, parameter in ((s, _PATH_PARAMETER.fullmatch(s)) for s in path.split('/'))
+        ]
+        compiled[route_key] = Route(module_name, method, re.compile('^' + '/'.join(segments) + '$'))
+    return compiled
+
+
+ROUTE_TABLE = compile_routes(ROUTES)
+
+# Endpoint lambda_handler functions, by module name (imported on first use)
+_handlers: Dict[str, Callable[[Dict[str, Any], Any], Dict[str, Any]]] = {}
+
+
+def load_handler(module_name: str) -> Callable[[Dict[str, Any], Any], Dict[str, Any]]:
+    """Import an endpoint module (once per container) and return its lambda_handler."""
+    handler = _handlers.get(module_name)
+    if handler is None:
+        with phase('import'):
+            module = importlib.import_module(f"{FUNCTIONS_PACKAGE}.{module_name}")
+        handler = module.lambda_handler
+        _handlers[module_name] = handler
+    return handler
+
+
+def match_route(event: Dict[str, Any]) -> Optional[Tuple[Route, Dict[str, Any]]]:
+    """
+    Find the route for an event.
+    
+    Returns:
+        (route, event) - the event gets pathParameters when matched by path -
+        or None if no route matches
+    """
+    route = ROUTE_TABLE.get(event.get('routeKey', ''))
+    if route is not None:
+        return route, event
+    
+    # Events without one of our routeKeys ($default route, direct invocations)
+    request_context = event.get('requestContext') or {}
+    http = request_context.get('http') or {}
+    method = (http.get('method') or '').upper()
+    path = event.get('rawPath') or http.get('path') or ''
+    stage = request_context.get('stage')
+    if stage and stage != '$default' and path.startswith(f"/{stage}/"):
+        path = path[len(stage) + 1:]
+    
+    for candidate in ROUTE_TABLE.values():
+        if candidate.method != method:
+            continue
+        match = candidate.pattern.match(path)
+        if match:
+            return candidate, {**event, 'pathParameters': {**(event.get('pathParameters') or {}), **match.groupdict()}}
+    return None
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for every endpoint (router deployment).
+    
+    Dispatches on the API Gateway routeKey to the endpoint's lambda_handler.
+    """
+    matched = match_route(event)
+    if matched is None:
+        return error_response(404, f"No route for {event.get('routeKey') or event.get('rawPath', '')}")
+    
+    route, event = matched
+    return load_handler(route.module_name)(event, context)
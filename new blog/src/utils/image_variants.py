@@ -0,0 +1,291 @@
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, BinaryIO, List, NamedTuple, Optional, Union
+
+from utils import metrics
+from utils.s3_helper import is_missing_object, public_url, read_object, upload_stream
+
+# Responsive derivatives of uploaded images.
+#
+# An upload is decoded once, turned upright from its EXIF orientation and
+# re-encoded at every configured width below its own (plus its own width if
+# that is below the largest configured one) in every configured format.
+# EXIF and XMP metadata are dropped; the ICC profile is kept so colours do
+# not shift. Variants are stored under predictable keys:
+#
+#   variants/<image id>/<width>.<ext>        e.g. variants/3f2a.../640.webp
+#   variants/<image id>/index.json           the map below
+#
+# and described by a map of content type to variants (width, height, URL,
+# size), from which srcset strings are built. The stored map lets a
+# content-addressed upload of an image that already exists reuse its
+# variants instead of encoding them again.
+#
+# IMAGE_VARIANT_WIDTHS (default 320,640,1024,1600) and IMAGE_VARIANT_FORMATS
+# (default avif,webp,original; 'original' is the upload's own format, PNG
+# for GIFs) choose what is generated; formats the installed Pillow cannot
+# write are skipped. Pillow is optional (packaged as a Lambda layer, see the
+# README): without it, and for animated images, no variants are made.
+#
+# Memory follows the pixel count, not the file size: a 48 MP PNG of a few
+# hundred KB peaks at about 8 bytes per pixel while it is converted and
+# resized. Images over IMAGE_VARIANT_MAX_PIXELS (default 50 million) get no
+# variants; Terraform sizes the image functions' memory from that limit.
+
+VARIANT_PREFIX = 'variants'
+MANIFEST_NAME = 'index.json'
+VARIANT_WIDTHS = sorted({
+    int(width) for width in os.environ.get('IMAGE_VARIANT_WIDTHS', '320,640,1024,1600').split(',') if width.strip()
+})
+VARIANT_FORMATS = [
+    name.strip().lower() for name in os.environ.get('IMAGE_VARIANT_FORMATS', 'avif,webp,original').split(',')
+    if name.strip()
+]
+VARIANT_MAX_WORKERS = int(os.environ.get('IMAGE_VARIANT_WORKERS', '4'))
+MAX_SOURCE_PIXELS = int(os.environ.get('IMAGE_VARIANT_MAX_PIXELS', '50000000'))
+EXIF_ORIENTATION = 0x0112
+
+# Pillow format, content type, key extension and encoder options per format
+FORMATS = {
+    'avif': ('AVIF', 'image/avif', '.avif', {'quality': 55, 'speed': 8}),
+    'webp': ('WEBP', 'image/webp', '.webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', '.jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'png': ('PNG', 'image/png', '.png', {'optimize': True})
+}
+
+# Format of the 'original' variants per upload content type
+ORIGINAL_FORMATS = {
+    'image/jpeg': 'jpeg',
+    'image/png': 'png',
+    'image/gif': 'png',
+    'image/webp': 'webp'
+}
+
+_pillow = None
+
+
+class Variant(NamedTuple):
+    """One encoded derivative."""
+    width: int
+    height: int
+    content_type: str
+    extension: str
+    body: bytes
+
+
+def _load_pillow():
+    """Pillow's Image module, or None if it isn't installed (imported on first use)."""
+    global _pillow
+    if _pillow is None:
+        try:
+            from PIL import Image, ImageOps, features
+        except ImportError:
+            _pillow = False
+        else:
+            _pillow = (Image, ImageOps, features)
+    return _pillow or None
+
+
+def available() -> bool:
+    """Whether variants can be generated (Pillow is installed)."""
+    return _load_pillow() is not None
+
+
+def variant_key(image_id: str, width: int, extension: str) -> str:
+    """S3 key of an image's variant."""
+    return f"{VARIANT_PREFIX}/{image_id}/{width}{extension}"
+
+
+def manifest_key(image_id: str) -> str:
+    """S3 key of the stored variant map of an image."""
+    return f"{VARIANT_PREFIX}/{image_id}/{MANIFEST_NAME}"
+
+
+def target_widths(width: int, widths: Optional[List[int]] = None) -> List[int]:
+    """Widths to generate for an image `width` pixels wide (never upscaled)."""
+    widths = sorted(widths or VARIANT_WIDTHS)
+    targets = [target for target in widths if target < width]
+    if not widths or width <= widths[-1]:
+        targets.append(width)
+    return targets
+
+
+def _formats(content_type: str, formats: Optional[List[str]], features) -> List[str]:
+    names = []
+    for name in formats or VARIANT_FORMATS:
+        if name == 'original':
+            name = ORIGINAL_FORMATS.get(content_type, 'jpeg')
+        if name not in FORMATS or name in names:
+            continue
+        if name in ('avif', 'webp') and not features.check(name):
+            continue
+        names.append(name)
+    return names
+
+
+def _encode(Image, image, name: str, icc_profile: Optional[bytes]) -> bytes:
+    pillow_format, _, _, options = FORMATS[name]
+    if pillow_format == 'JPEG' and image.mode != 'RGB':
+        # No alpha in JPEG: flatten onto white
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A') if 'A' in image.mode else None)
+        image = background
+    output = io.BytesIO()
+    # No exif/xmp arguments: the encoders write no metadata but the ICC profile
+    image.save(output, pillow_format, icc_profile=icc_profile, **options)
+    return output.getvalue()
+
+
+def generate_variants(
+    data: Union[bytes, BinaryIO],
+    content_type: str,
+    widths: Optional[List[int]] = None,
+    formats: Optional[List[str]] = None,
+    max_workers: Optional[int] = None
+) -> List[Variant]:
+    """
+    Encode the responsive variants of an image.
+    
+    Args:
+        data: Original image bytes, or a binary file positioned at its start
+        content_type: Content type of the original
+        widths: Widths to generate (default: IMAGE_VARIANT_WIDTHS)
+        formats: Formats to generate (default: IMAGE_VARIANT_FORMATS)
+        max_workers: Widths encoded at a time (default: IMAGE_VARIANT_WORKERS)
+    
+    Returns:
+        Variants ordered by format, then width; empty without Pillow, for
+        animated images and for images over IMAGE_VARIANT_MAX_PIXELS
+    
+    Raises:
+        PIL.UnidentifiedImageError: If the data is not an image Pillow can read
+    """
+    pillow = _load_pillow()
+    if pillow is None:
+        return []
+    Image, ImageOps, features = pillow
+    
+    with metrics.phase('variants'):
+        image = Image.open(io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data)
+        if getattr(image, 'n_frames', 1) > 1:
+            return []
+        # Only the header has been read so far
+        if image.width * image.height > MAX_SOURCE_PIXELS:
+            print(f"Image of {image.width}x{image.height} pixels is over IMAGE_VARIANT_MAX_PIXELS; no variants")
+            return []
+        names = _formats(content_type, formats, features)
+        # Orientations 5-8 are stored rotated by 90 degrees
+        upright = image.getexif().get(EXIF_ORIENTATION, 1) not in (5, 6, 7, 8)
+        width = image.width if upright else image.height
+        targets = target_widths(width, widths)
+        if not names or not targets:
+            return []
+        
+        # JPEGs are decoded at a reduced scale when every target is smaller
+        scale = targets[-1] / width
+        image.draft('RGB', (max(1, round(image.width * scale)), max(1, round(image.height * scale))))
+        icc_profile = image.info.get('icc_profile')
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            has_alpha = 'A' in image.mode or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+        # Decode now: the widths are resized from it concurrently
+        image.load()
+        
+        def encode_width(width: int) -> List[Variant]:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize(
+                (width, height), Image.Resampling.LANCZOS, reducing_gap=3.0
+            )
+            return [
+                Variant(width, height, FORMATS[name][1], FORMATS[name][2], _encode(Image, resized, name, icc_profile))
+                for name in names
+            ]
+        
+        workers = max(1, min(max_workers or VARIANT_MAX_WORKERS, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            by_width = list(executor.map(encode_width, targets))
+    
+    return [variants[index] for index in range(len(names)) for variants in by_width]
+
+
+def store_variants(
+    bucket_name: str,
+    image_id: str,
+    data: Union[bytes, BinaryIO],
+    content_type: str,
+    extra_args: Optional[Dict[str, Any]] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate an image's variants and upload them next to it, with their map.
+    
+    Args:
+        bucket_name: Name of the S3 bucket
+        image_id: Id of the image (the key prefix of its variants)
+        data: Original image bytes, or a binary file positioned at its start
+        content_type: Content type of the original
+        extra_args: Additional PutObject parameters of the variants (e.g. CacheControl)
+    
+    Returns:
+        Content type -> [{'width', 'height', 'url', 'size'}, ...] by width
+        (see srcset()); empty if no variants were made
+    """
+    variants = generate_variants(data, content_type)
+    if not variants:
+        return {}
+    
+    def store(variant: Variant) -> Dict[str, Any]:
+        s3_key = variant_key(image_id, variant.width, variant.extension)
+        upload_stream(variant.body, bucket_name, s3_key, content_type=variant.content_type, extra_args=extra_args)
+        return {
+            'width': variant.width,
+            'height': variant.height,
+            'url': public_url(bucket_name, s3_key),
+            'size': len(variant.body)
+        }
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(VARIANT_MAX_WORKERS, len(variants)))) as executor:
+        stored = list(executor.map(store, variants))
+    
+    result: Dict[str, List[Dict[str, Any]]] = {}
+    for variant, entry in zip(variants, stored):
+        result.setdefault(variant.content_type, []).append(entry)
+    
+    upload_stream(json.dumps(result).encode('utf-8'), bucket_name, manifest_key(image_id), content_type='application/json')
+    return result
+
+
+def load_variants(bucket_name: str, image_id: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Read the variant map stored by store_variants().
+    
+    Returns:
+        The map, or None if the image has no stored variants
+    """
+    try:
+        return json.loads(read_object(bucket_name, manifest_key(image_id)))
+    except Exception as e:
+        if is_missing_object(e):
+            return None
+        raise
+
+
+def srcset(variants: Dict[str, List[Dict[str, Any]]]) -> Dict[str, str]:
+    """srcset attribute value per content type, e.g. {'image/webp': 'https://... 320w, https://... 640w'}."""
+    return {
+        content_type: ', '.join(f"{entry['url']} {int(entry['width'])}w" for entry in entries)
+        for content_type, entries in variants.items()
+    }
+
+
+def from_record(variants: Optional[Dict[str, List[Dict[str, Any]]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Variants read back from DynamoDB, with whole numbers as ints again."""
+    return {
+        content_type: [
+            {name: int(value) if isinstance(value, float) else value for name, value in entry.items()}
+            for entry in entries
+        ]
+        for content_type, entries in (variants or {}).items()
+    }
@@ -0,0 +1,143 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+from decimal import Decimal
+from typing import Dict, Any, Optional, NamedTuple
+
+# Page size limits for list endpoints
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or has been tampered with."""
+
+
+class CursorSecretError(RuntimeError):
+    """Raised when cursors are signed or verified without a configured key."""
+
+
+class Page(NamedTuple):
+    """A single page of results and the opaque cursor for the next one."""
+    items: list
+    cursor: Optional[str]
+
+
+def _cursor_secret() -> bytes:
+    """
+    Get the key used to sign cursors.
+    
+    Raises:
+        CursorSecretError: If neither CURSOR_SECRET nor SECRET_TOKEN is set
+            (an empty key would let anyone forge cursors)
+    """
+    secret = os.environ.get('CURSOR_SECRET') or os.environ.get('SECRET_TOKEN')
+    if not secret:
+        raise CursorSecretError("CURSOR_SECRET or SECRET_TOKEN must be set to sign pagination cursors")
+    return secret.encode('utf-8')
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def _encode_key_value(obj):
+    """JSON serializer for numeric key attributes."""
+    if isinstance(obj, Decimal):
+        return {'$n': str(obj)}
+    raise TypeError(f"Unsupported key attribute type: {type(obj).__name__}")
+
+
+def _decode_key_value(obj: Dict[str, Any]):
+    """JSON object hook restoring numeric key attributes."""
+    if len(obj) == 1 and '$n' in obj:
+        return Decimal(obj['$n'])
+    return obj
+
+
+def _sign(scope: str, payload: str) -> str:
+    digest = hmac.new(_cursor_secret(), f"{scope}|{payload}".encode('utf-8'), hashlib.sha256).digest()
+    return _b64encode(digest[:16])
+
+
+def encode_cursor(last_evaluated_key: Dict[str, Any], scope: str) -> str:
+    """
+    Wrap a DynamoDB LastEvaluatedKey in an opaque, signed cursor.
+    
+    Args:
+        last_evaluated_key: LastEvaluatedKey returned by a scan or query
+        scope: Identifies the read the cursor belongs to (table, index, key condition)
+    
+    Returns:
+        URL-safe cursor string
+    
+    Raises:
+        CursorSecretError: If no signing key is configured
+    """
+    payload = _b64encode(json.dumps(
+        last_evaluated_key,
+        default=_encode_key_value,
+        separators=(',', ':'),
+        sort_keys=True
+    ).encode('utf-8'))
+    return f"{payload}.{_sign(scope, payload)}"
+
+
+def decode_cursor(cursor: str, scope: str) -> Dict[str, Any]:
+    """
+    Verify a cursor and unwrap the ExclusiveStartKey it carries.
+    
+    Args:
+        cursor: Cursor previously returned by encode_cursor
+        scope: Scope the cursor must have been issued for
+    
+    Returns:
+        ExclusiveStartKey for the next read
+    
+    Raises:
+        InvalidCursorError: If the cursor is malformed, forged or from another read
+        CursorSecretError: If no signing key is configured
+    """
+    try:
+        payload, signature = cursor.split('.', 1)
+    except (AttributeError, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+    
+    if not hmac.compare_digest(signature.encode('ascii', 'replace'), _sign(scope, payload).encode('ascii')):
+        raise InvalidCursorError("Invalid cursor")
+    
+    try:
+        key = json.loads(_b64decode(payload), object_hook=_decode_key_value)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+    
+    if not isinstance(key, dict) or not key:
+        raise InvalidCursorError("Invalid cursor")
+    return key
+
+
+def parse_limit(value: Optional[str]) -> Optional[int]:
+    """
+    Parse the ?limit= query parameter.
+    
+    Returns:
+        None if not provided, otherwise the limit clamped to MAX_PAGE_LIMIT
+    
+    Raises:
+        ValueError: If the value is not a positive integer
+    """
+    if value is None or value == '':
+        return None
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be a positive integer")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_LIMIT)
@@ -1,32 +1,131 @@
-import boto3
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import hashlib
+import io
+from itertools import chain
 import os
+import tempfile
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Any, BinaryIO, Optional, Iterable, Iterator, NamedTuple, Union
 import uuid
 
-s3_client = boto3.client('s3')
+from utils import metrics
+from utils.aws_clients import get_client
+
+# Image types accepted for upload, with the extension their keys get
+IMAGE_CONTENT_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp'
+}
+
+# Error codes of a missing object (HeadObject only returns the status code).
+# S3 reports a missing key as 403 to callers without s3:ListBucket on the
+# bucket (terraform/iam.tf grants it); 403 stays an error, since it also
+# means access to an object that exists is denied.
+MISSING_OBJECT_CODES = ('404', 'NoSuchKey', 'NotFound')
+
+# Streaming uploads: objects up to S3_MULTIPART_THRESHOLD bytes are sent with
+# one PutObject, larger ones as a multipart upload of S3_MULTIPART_PART_SIZE
+# parts, up to S3_UPLOAD_WORKERS of them at a time. S3 requires parts of at
+# least 5 MB (except the last) and at most 10,000 parts.
+MULTIPART_THRESHOLD = int(os.environ.get('S3_MULTIPART_THRESHOLD', str(8 * 1024 * 1024)))
+MULTIPART_PART_SIZE = int(os.environ.get('S3_MULTIPART_PART_SIZE', str(8 * 1024 * 1024)))
+UPLOAD_MAX_WORKERS = int(os.environ.get('S3_UPLOAD_WORKERS', '4'))
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+
+# Content-addressed objects (keyed by the SHA-256 of their bytes) never
+# change, so browsers and CDNs may cache them for good
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# download_object() reads objects in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# What upload_stream() accepts
+UploadSource = Union[bytes, bytearray, io.IOBase, Iterable[bytes]]
+
+
+class UploadResult(NamedTuple):
+    """Outcome of upload_stream()."""
+    key: str
+    size: int
+    parts: int  # 0: sent with a single PutObject
+    etag: str
+    seconds: float
+    
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+def get_content_type(extension: str) -> str:
+    """
+    Get the image content type of a file extension.
+    
+    Args:
+        extension: File extension (e.g., '.jpg', 'png')
+    
+    Returns:
+        Content type string (e.g., 'image/jpeg'), or '' if not an image type
+    """
+    extension = extension.lower()
+    if not extension.startswith('.'):
+        extension = '.' + extension
+    if extension == '.jpeg':
+        return 'image/jpeg'
+    for content_type, type_extension in IMAGE_CONTENT_TYPES.items():
+        if type_extension == extension:
+            return content_type
+    return ''
+
+
+def get_s3_client():
+    """Get the S3 client (created on first use)."""
+    return get_client('s3')
+
+
+def public_url(bucket_name: str, s3_key: str) -> str:
+    """Public URL of an object (the bucket policy allows public reads)."""
+    region = get_s3_client().meta.region_name
+    return f"https://{bucket_name}.s3.{region}.amazonaws.com/{s3_key}"
 
 
 def upload_image_to_s3(
-    file_content: bytes,
+    file_content: UploadSource,
     bucket_name: str,
     file_name: Optional[str] = None,
     content_type: str = 'image/jpeg',
-    folder: Optional[str] = None
+    folder: Optional[str] = None,
+    content_addressed: bool = False
 ) -> str:
     """
     Upload an image to S3 and return its public URL.
     
+    With content_addressed, the key is the SHA-256 of the content instead
+    (see upload_content_addressed) and an image that is already stored is
+    not written again.
+    
     Args:
-        file_content: Binary content of the image file
+        file_content: Binary content of the image file, or a file-like object
+            or iterator of bytes (streamed, see upload_stream)
         bucket_name: Name of the S3 bucket
         file_name: Optional custom file name. If not provided, generates a UUID-based name
         content_type: MIME type of the image (default: image/jpeg)
         folder: Optional folder path within the bucket (e.g., 'blog-images', 'portfolio-images')
+        content_addressed: Key the object by a hash of file_content (bytes or a
+            seekable file); file_name then only supplies the extension
     
     Returns:
         Public URL of the uploaded image
     """
+    if content_addressed:
+        extension = os.path.splitext(file_name)[1] if file_name else IMAGE_CONTENT_TYPES.get(content_type, '')
+        return upload_content_addressed(file_content, bucket_name, extension, content_type, folder)['url']
+    
     # Generate file name if not provided
     if not file_name:
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
@@ -40,19 +139,337 @@ def upload_image_to_s3(
         s3_key = file_name
     
     # Upload to S3
-    s3_client.put_object(
-        Bucket=bucket_name,
-        Key=s3_key,
-        Body=file_content,
-        ContentType=content_type,
-        ACL='public-read'  # Make the image publicly accessible
-    )
+    # Note: ACLs are disabled on new S3 buckets, so we rely on bucket policy for public access
+    upload_stream(file_content, bucket_name, s3_key, content_type=content_type)
     
     # Construct and return the public URL
-    region = s3_client.meta.region_name
-    url = f"https://{bucket_name}.s3.{region}.amazonaws.com/{s3_key}"
+    return public_url(bucket_name, s3_key)
+
+
+def content_hash(data: Union[bytes, bytearray, io.IOBase]) -> str:
+    """
+    Hex SHA-256 of content, used as its key by content-addressed uploads.
     
-    return url
+    Files are hashed from their position in chunks and seeked back to it.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return hashlib.sha256(data).hexdigest()
+    digest = hashlib.sha256()
+    position = data.tell()
+    for chunk in iter(lambda: data.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    data.seek(position)
+    return digest.hexdigest()
+
+
+def upload_content_addressed(
+    file_content: Union[bytes, bytearray, io.IOBase],
+    bucket_name: str,
+    extension: str,
+    content_type: str,
+    folder: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Store content under a key derived from its bytes, unless it is stored already.
+    
+    The key is [folder/]<sha256><extension>. An existing object under that
+    key holds the same bytes, so it is found with a HEAD and not written
+    again; new objects are written with an immutable Cache-Control. Two
+    concurrent uploads of the same content both write it, which is harmless.
+    The HEAD needs s3:ListBucket to see a missing key as 404 (see
+    MISSING_OBJECT_CODES).
+    
+    Args:
+        file_content: Content, as bytes or a seekable file (the key must be
+            known before the upload)
+        bucket_name: Name of the S3 bucket
+        extension: Key extension, e.g. '.jpg' (one per content type, so the
+            same image always gets the same key)
+        content_type: MIME type of the content
+        folder: Optional folder path within the bucket
+    
+    Returns:
+        {'url': ..., 'key': ..., 'hash': <sha256 hex>, 'existing': True if
+        the object was already stored}
+    """
+    if not isinstance(file_content, (bytes, bytearray)) and not _seekable(file_content):
+        raise TypeError("Content-addressed uploads need the content as bytes or a seekable file")
+    
+    digest = content_hash(file_content)
+    s3_key = f"{digest}{extension}"
+    if folder:
+        s3_key = f"{folder}/{s3_key}"
+    
+    existing = head_object(bucket_name, s3_key) is not None
+    if not existing:
+        upload_stream(
+            file_content, bucket_name, s3_key,
+            content_type=content_type,
+            extra_args={'CacheControl': IMMUTABLE_CACHE_CONTROL}
+        )
+    return {'url': public_url(bucket_name, s3_key), 'key': s3_key, 'hash': digest, 'existing': existing}
+
+
+def _read_parts(source: UploadSource, part_size: int) -> Iterator[bytes]:
+    """Split bytes, a file-like object or an iterator of bytes into part_size pieces (the last may be shorter)."""
+    if isinstance(source, (bytes, bytearray)):
+        # Slices are only copied when the buffer is split
+        for offset in range(0, len(source), part_size):
+            yield source[offset:offset + part_size]
+        return
+    
+    if hasattr(source, 'read'):
+        while True:
+            part = source.read(part_size)
+            # Pipes and sockets may return less than asked for before the end
+            while part and len(part) < part_size:
+                more = source.read(part_size - len(part))
+                if not more:
+                    break
+                part += more
+            if part:
+                yield part
+            if len(part) < part_size:
+                return
+    
+    # Iterators: fill each part in place; parts are handed out as bytearrays
+    part = bytearray()
+    for chunk in source:
+        view = memoryview(chunk)
+        while len(view):
+            room = part_size - len(part)
+            part += view[:room]
+            view = view[room:]
+            if len(part) == part_size:
+                yield part
+                part = bytearray()
+    if part:
+        yield part
+
+
+def _seekable(source: Any) -> bool:
+    return hasattr(source, 'seekable') and source.seekable()
+
+
+def _drain(parts: list) -> Iterator[bytes]:
+    # Hand out buffered parts without keeping them alive
+    while parts:
+        yield parts.pop(0)
+
+
+def upload_stream(
+    source: UploadSource,
+    bucket_name: str,
+    s3_key: str,
+    content_type: str = 'application/octet-stream',
+    part_size: Optional[int] = None,
+    threshold: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    extra_args: Optional[Dict[str, Any]] = None
+) -> UploadResult:
+    """
+    Upload an object from bytes, a file-like object or an iterator of bytes.
+    
+    The source is read once, part by part. Objects up to `threshold` bytes
+    are sent with one PutObject (a seekable file as it is, so the client
+    streams it from the file instead of a copy in memory); larger ones as a multipart upload whose
+    parts are sent concurrently on a bounded pool while the next ones are
+    read, so memory stays around (max_workers + 2) parts whatever the size.
+    A failed multipart upload is aborted, so no orphaned parts are billed.
+    
+    Args:
+        source: Object content
+        bucket_name: Name of the S3 bucket
+        s3_key: S3 key (path) of the object
+        content_type: MIME type of the object
+        part_size: Multipart part size in bytes (default: S3_MULTIPART_PART_SIZE, minimum 5 MB)
+        threshold: Largest object sent with one PutObject (default: S3_MULTIPART_THRESHOLD)
+        max_workers: Parts uploaded at a time (default: S3_UPLOAD_WORKERS)
+        extra_args: Additional PutObject/CreateMultipartUpload parameters (e.g. CacheControl)
+    
+    Returns:
+        UploadResult with the size, part count, ETag, time and throughput
+    
+    Raises:
+        ValueError: If part_size is below the S3 minimum or the object needs more than 10,000 parts
+    """
+    part_size = part_size or MULTIPART_PART_SIZE
+    if part_size < MIN_PART_SIZE:
+        raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+    threshold = MULTIPART_THRESHOLD if threshold is None else threshold
+    params = {'Bucket': bucket_name, 'Key': s3_key, 'ContentType': content_type, **(extra_args or {})}
+    client = get_s3_client()
+    
+    start = time.perf_counter()
+    with metrics.phase('upload'):
+        if _seekable(source):
+            position = source.tell()
+            size = source.seek(0, io.SEEK_END) - position
+            source.seek(position)
+            if size <= threshold:
+                response = client.put_object(Body=source, **params)
+                return UploadResult(s3_key, size, 0, response.get('ETag', ''), time.perf_counter() - start)
+        
+        # Read until the object is known to be over the threshold
+        parts = _read_parts(source, part_size)
+        head = []
+        size = 0
+        for part in parts:
+            head.append(part)
+            size += len(part)
+            if size > threshold:
+                break
+        
+        if size <= threshold:
+            body = head[0] if len(head) == 1 else b''.join(head)
+            response = client.put_object(Body=body, **params)
+            return UploadResult(s3_key, size, 0, response.get('ETag', ''), time.perf_counter() - start)
+        
+        size, count, etag = _multipart_upload(client, params, chain(_drain(head), parts), max_workers)
+    return UploadResult(s3_key, size, count, etag, time.perf_counter() - start)
+
+
+def _multipart_upload(client, params: Dict[str, Any], parts: Iterator[bytes], max_workers: Optional[int]) -> tuple:
+    """Send parts as a multipart upload; returns (size, part count, ETag)."""
+    bucket_name, s3_key = params['Bucket'], params['Key']
+    upload_id = client.create_multipart_upload(**params)['UploadId']
+    
+    def send(number: int, body: bytes) -> Dict[str, Any]:
+        response = client.upload_part(
+            Bucket=bucket_name, Key=s3_key, UploadId=upload_id, PartNumber=number, Body=body
+        )
+        return {'ETag': response['ETag'], 'PartNumber': number}
+    
+    workers = max(1, max_workers or UPLOAD_MAX_WORKERS)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    in_flight = set()
+    completed = []
+    size = 0
+    try:
+        for number, body in enumerate(parts, 1):
+            if number > MAX_PARTS:
+                raise ValueError(f"Object needs more than {MAX_PARTS} parts; use a larger part_size")
+            size += len(body)
+            # Bounded: wait for a slot before reading further ahead
+            if len(in_flight) >= workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                completed.extend(future.result() for future in done)
+            in_flight.add(executor.submit(send, number, body))
+            # Only the pool holds the part now, not the loop while it reads the next
+            body = None
+        completed.extend(future.result() for future in in_flight)
+        
+        completed.sort(key=lambda part: part['PartNumber'])
+        response = client.complete_multipart_upload(
+            Bucket=bucket_name, Key=s3_key, UploadId=upload_id, MultipartUpload={'Parts': completed}
+        )
+    except BaseException:
+        executor.shutdown(wait=True, cancel_futures=True)
+        try:
+            client.abort_multipart_upload(Bucket=bucket_name, Key=s3_key, UploadId=upload_id)
+        except Exception as e:
+            print(f"Error aborting multipart upload of {s3_key}: {str(e)}")
+        raise
+    finally:
+        executor.shutdown(wait=True)
+    
+    return size, len(completed), response.get('ETag', '')
+
+
+def presign_put(
+    bucket_name: str,
+    s3_key: str,
+    content_type: str,
+    size: int,
+    expires_in: int
+) -> Dict[str, Any]:
+    """
+    Presign a PUT of exactly `size` bytes of `content_type` to s3_key.
+    
+    Content-Type and Content-Length are signed, so S3 rejects any other
+    type or size.
+    
+    Returns:
+        {'url': ..., 'headers': {...}} - the headers the PUT must send
+    """
+    url = get_s3_client().generate_presigned_url(
+        'put_object',
+        Params={'Bucket': bucket_name, 'Key': s3_key, 'ContentType': content_type, 'ContentLength': size},
+        ExpiresIn=expires_in
+    )
+    return {'url': url, 'headers': {'Content-Type': content_type}}
+
+
+def presign_post(
+    bucket_name: str,
+    s3_key: str,
+    content_type: str,
+    max_size: int,
+    expires_in: int
+) -> Dict[str, Any]:
+    """
+    Create a presigned POST policy for a browser form upload to s3_key.
+    
+    The policy pins the key and Content-Type and limits the size to
+    1..max_size bytes.
+    
+    Returns:
+        {'url': ..., 'fields': {...}} - the form fields to send before the file
+    """
+    return get_s3_client().generate_presigned_post(
+        bucket_name,
+        s3_key,
+        Fields={'Content-Type': content_type},
+        Conditions=[{'Content-Type': content_type}, ['content-length-range', 1, max_size]],
+        ExpiresIn=expires_in
+    )
+
+
+def head_object(bucket_name: str, s3_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Read an object's metadata.
+    
+    Returns:
+        HeadObject response, or None if the object doesn't exist
+    """
+    try:
+        return get_s3_client().head_object(Bucket=bucket_name, Key=s3_key)
+    except Exception as e:
+        if is_missing_object(e):
+            return None
+        raise
+
+
+def is_missing_object(error: Exception) -> bool:
+    """Whether an S3 client error means the object doesn't exist."""
+    return getattr(error, 'response', {}).get('Error', {}).get('Code', '') in MISSING_OBJECT_CODES
+
+
+def read_object(bucket_name: str, s3_key: str) -> bytes:
+    """Read an object's content."""
+    return get_s3_client().get_object(Bucket=bucket_name, Key=s3_key)['Body'].read()
+
+
+def download_object(bucket_name: str, s3_key: str, spool_max_bytes: int = DOWNLOAD_CHUNK_SIZE) -> BinaryIO:
+    """
+    Copy an object into a temporary file, chunk by chunk.
+    
+    The file stays in memory up to spool_max_bytes and moves to /tmp
+    beyond, so a large object is never held in memory as a whole.
+    
+    Returns:
+        The file, positioned at its start (close it when done)
+    """
+    body = get_s3_client().get_object(Bucket=bucket_name, Key=s3_key)['Body']
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_max_bytes)
+    try:
+        for chunk in iter(lambda: body.read(DOWNLOAD_CHUNK_SIZE), b''):
+            spool.write(chunk)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
 
 
 def delete_image_from_s3(bucket_name: str, s3_key: str) -> bool:
@@ -67,7 +484,7 @@ def delete_image_from_s3(bucket_name: str, s3_key: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        s3_client.delete_object(Bucket=bucket_name, Key=s3_key)
+        get_s3_client().delete_object(Bucket=bucket_name, Key=s3_key)
         return True
     except Exception as e:
         print(f"Error deleting image from S3: {str(e)}")
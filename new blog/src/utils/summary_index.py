@@ -0,0 +1,733 @@
+import hashlib
+import json
+import random
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable, Iterator, Tuple
+
+from utils.codec import get_codec
+from utils.metrics import add_count
+from utils.dynamodb_helper import (
+    BLOGPOST_TABLE,
+    BLOGPOST_INDEX_TABLE,
+    batch_write_items,
+    get_client,
+    get_item,
+    query_pages,
+    scan_table,
+    update_item
+)
+from utils.etag import touch_list_etag
+from utils.pagination import Page
+from utils.read_cache import read_cache, cached_read, make_read_key
+
+# Materialized blogpost summary collection.
+#
+# All summaries live in one partition of the blogpost_index table so
+# GET /blogpost can be answered with a single Query instead of a full scan:
+#
+#   pk = 'SUMMARY', sk = 'HEAD'        version, shard hashes, count, digest
+#   pk = 'SUMMARY', sk = 'SHARD#0000'  'posts': summaries sorted by (date, slug) ascending
+#   pk = 'SUMMARY', sk = 'SHARD#0001'  ...
+#
+# Summaries are kept oldest first so a new post normally only changes the
+# last shard. Writers read the collection, apply their change and write the
+# changed shards plus HEAD in one transaction, conditioned on HEAD's version
+# (optimistic locking). Readers check every shard against the hashes in HEAD
+# and retry if they caught a write half-way.
+#
+# A change too big for one transaction (100 actions, 4 MB), e.g. a batch
+# import spanning many dates, is written in steps: HEAD is first marked
+# stale, so readers get no collection and GET /blogpost scans, then the
+# shards are written in transactions that each check HEAD is still the
+# stale version, and a last transaction writes the new HEAD. A writer that
+# finds a stale HEAD (a stepped write that failed half-way) rebuilds the
+# collection from the blogpost table.
+#
+# The same table holds an inverted tag index, one partition per tag:
+#
+#   pk = 'TAG#<tag lowercased>', sk = '<date>#<slug>'   summary fields
+#   pk = 'TAG_INDEX', sk = 'HEAD'                       marker: index is complete
+#
+# so ?tag= reads only the matching partition, already ordered by date.
+# DATE_INDEX/HEAD marks that all blogposts carry the date_index GSI keys.
+
+SUMMARY_PARTITION = 'SUMMARY'
+HEAD_SORT_KEY = 'HEAD'
+SHARD_PREFIX = 'SHARD#'
+TAG_PREFIX = 'TAG#'
+TAG_INDEX_PARTITION = 'TAG_INDEX'
+DATE_INDEX_MARKER_PARTITION = 'DATE_INDEX'
+
+# date_index GSI on the blogpost table: every post shares one partition and
+# is sorted by '<date>#<slug>', so date ordering and ranges are index reads
+DATE_INDEX_NAME = 'date_index'
+DATE_INDEX_PARTITION_KEY = 'list_pk'
+DATE_INDEX_SORT_KEY = 'date_slug'
+DATE_INDEX_PARTITION = 'POST'
+INDEX_ATTRIBUTES = [DATE_INDEX_PARTITION_KEY, DATE_INDEX_SORT_KEY]
+
+# Appended to an inclusive upper date bound so '<to>#<slug>' sorts below it
+DATE_RANGE_END = '\uffff'
+
+# Fields kept per post (what GET /blogpost returns)
+SUMMARY_FIELDS = ['title_image_url', 'slug', 'title', 'summary', 'author', 'date']
+
+# Shards stay well below DynamoDB's 400 KB item limit
+MAX_SHARD_BYTES = 300 * 1024
+
+# TransactWriteItems limits: 100 actions and 4 MB per request (sizes are
+# estimated from the wire JSON, which is larger than DynamoDB counts)
+MAX_TRANSACTION_ITEMS = 100
+MAX_TRANSACTION_BYTES = 4 * 1024 * 1024
+MAX_WRITE_ATTEMPTS = 5
+MAX_READ_ATTEMPTS = 3
+
+
+class SummaryIndexError(Exception):
+    """Raised when the summary collection cannot be updated."""
+
+
+def summarize(post: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the summary stored for a blogpost."""
+    return {field: post.get(field, '') for field in SUMMARY_FIELDS}
+
+
+def _sort_key(summary: Dict[str, Any]) -> Tuple[str, str]:
+    return summary.get('date', ''), summary.get('slug', '')
+
+
+def _hash(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def _shard(summaries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Split sorted summaries into shards of at most MAX_SHARD_BYTES (estimated)."""
+    shards = [[]]
+    size = 0
+    for summary in summaries:
+        summary_size = len(json.dumps(summary, separators=(',', ':')))
+        if shards[-1] and size + summary_size > MAX_SHARD_BYTES:
+            shards.append([])
+            size = 0
+        shards[-1].append(summary)
+        size += summary_size
+    return shards
+
+
+def _shard_sort_key(index: int) -> str:
+    return f"{SHARD_PREFIX}{index:04d}"
+
+
+def _read_partition(consistent: bool) -> Optional[Dict[str, Any]]:
+    """
+    Read HEAD and all shards with one Query (more only if over 1 MB).
+    
+    Returns:
+        {'head': item, 'shards': {sk: item}} or None if the collection does not exist
+    """
+    client = get_client()
+    decode = get_codec(BLOGPOST_INDEX_TABLE).decode_wire
+    params = {
+        'TableName': BLOGPOST_INDEX_TABLE,
+        'KeyConditionExpression': 'pk = :pk',
+        'ExpressionAttributeValues': {':pk': {'S': SUMMARY_PARTITION}},
+        'ConsistentRead': consistent
+    }
+    
+    head = None
+    shards = {}
+    while True:
+        response = client.query(**params)
+        for item in response.get('Items', []):
+            item = decode(item)
+            if item['sk'] == HEAD_SORT_KEY:
+                head = item
+            else:
+                shards[item['sk']] = item
+        if not response.get('LastEvaluatedKey'):
+            break
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    if head is None:
+        return None
+    return {'head': head, 'shards': shards}
+
+
+def _assemble(state: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Join shards in order, or return None if they don't match HEAD (write in progress)."""
+    summaries = []
+    for index, expected_hash in enumerate(state['head'].get('shard_hashes', [])):
+        shard = state['shards'].get(_shard_sort_key(index))
+        if shard is None or shard.get('hash') != expected_hash:
+            return None
+        summaries.extend(shard.get('posts', []))
+    return summaries
+
+
+def _load_summaries() -> Optional[Dict[str, Any]]:
+    for attempt in range(MAX_READ_ATTEMPTS):
+        state = _read_partition(consistent=False)
+        if state is None or state['head'].get('stale'):
+            return None
+        summaries = _assemble(state)
+        if summaries is not None:
+            return {'posts': summaries, 'digest': state['head'].get('digest', '')}
+        time.sleep(0.02 * (attempt + 1))
+    return None
+
+
+def read_summary_collection(use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Read the materialized summary collection.
+    
+    Returns:
+        {'posts': summaries sorted by (date, slug) ascending, 'digest': content hash}
+        or None if the collection has not been built yet or is being rewritten
+    """
+    if not use_cache:
+        return _load_summaries()
+    collection, _ = cached_read(BLOGPOST_INDEX_TABLE, make_read_key('summaries'), _load_summaries)
+    return collection
+
+
+def read_summaries(use_cache: bool = True) -> Optional[List[Dict[str, Any]]]:
+    """
+    Read all blogpost summaries sorted by (date, slug) ascending.
+    
+    Returns:
+        List of summaries, or None if the collection has not been built yet
+        or is being rewritten
+    """
+    collection = read_summary_collection(use_cache)
+    if collection is None:
+        return None
+    return collection['posts']
+
+
+def _bootstrap() -> List[Dict[str, Any]]:
+    """Build summaries from a projected scan of the blogpost table."""
+    return [summarize(post) for post in scan_table(BLOGPOST_TABLE, projection=SUMMARY_FIELDS)]
+
+
+def _is_conflict(error: Exception) -> bool:
+    code = getattr(error, 'response', {}).get('Error', {}).get('Code', '')
+    return code in ('TransactionCanceledException', 'ConditionalCheckFailedException')
+
+
+def _action_bytes(action: Dict[str, Any]) -> int:
+    return len(json.dumps(action, separators=(',', ':')))
+
+
+def _head_put(head: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """Put of HEAD, conditioned on the version it replaces (0: none yet)."""
+    put = {
+        'TableName': BLOGPOST_INDEX_TABLE,
+        'Item': get_codec(BLOGPOST_INDEX_TABLE).encode_wire(head)
+    }
+    if version:
+        put.update(_version_condition(version))
+    else:
+        put['ConditionExpression'] = 'attribute_not_exists(pk)'
+    return put
+
+
+def _version_condition(version: int) -> Dict[str, Any]:
+    return {
+        'ConditionExpression': '#version = :version',
+        'ExpressionAttributeNames': {'#version': 'version'},
+        'ExpressionAttributeValues': {':version': {'N': str(version)}}
+    }
+
+
+def _chunk_actions(actions: List[Dict[str, Any]], reserved: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Split actions into transactions that fit the limits next to the reserved action."""
+    budget = MAX_TRANSACTION_BYTES - _action_bytes(reserved)
+    chunk = []
+    size = 0
+    for action in actions:
+        action_size = _action_bytes(action)
+        if chunk and (len(chunk) + 1 >= MAX_TRANSACTION_ITEMS or size + action_size > budget):
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(action)
+        size += action_size
+    if chunk:
+        yield chunk
+
+
+def _write(mutate: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]) -> None:
+    """Apply mutate to the collection with optimistic locking on HEAD's version."""
+    client = get_client()
+    codec = get_codec(BLOGPOST_INDEX_TABLE)
+    
+    for attempt in range(MAX_WRITE_ATTEMPTS):
+        state = _read_partition(consistent=True)
+        if state is None:
+            version = 0
+            stored = {}
+            summaries = _bootstrap()
+        else:
+            version = int(state['head'].get('version', 0))
+            stored = state['shards']
+            # A stale HEAD means shards from a stepped write that did not finish
+            summaries = _bootstrap() if state['head'].get('stale') else _assemble(state)
+            if summaries is None:
+                time.sleep(random.uniform(0, 0.05 * (2 ** attempt)))
+                continue
+        
+        summaries = sorted(mutate(summaries), key=_sort_key)
+        shards = _shard(summaries) if summaries else []
+        hashes = [_hash(shard) for shard in shards]
+        
+        head = {
+            'pk': SUMMARY_PARTITION,
+            'sk': HEAD_SORT_KEY,
+            'version': version + 1,
+            'shard_hashes': hashes,
+            'count': len(summaries),
+            'digest': _hash(hashes),
+            'updated_at': datetime.utcnow().isoformat()
+        }
+        
+        # Shards whose stored content already matches are not written again
+        actions = []
+        for index, (shard, shard_hash) in enumerate(zip(shards, hashes)):
+            sort_key = _shard_sort_key(index)
+            if stored.get(sort_key, {}).get('hash') == shard_hash:
+                continue
+            actions.append({'Put': {
+                'TableName': BLOGPOST_INDEX_TABLE,
+                'Item': codec.encode_wire({
+                    'pk': SUMMARY_PARTITION,
+                    'sk': sort_key,
+                    'hash': shard_hash,
+                    'posts': shard
+                })
+            }})
+        valid = {_shard_sort_key(index) for index in range(len(shards))}
+        for sort_key in sorted(set(stored) - valid):
+            actions.append({'Delete': {
+                'TableName': BLOGPOST_INDEX_TABLE,
+                'Key': {'pk': {'S': SUMMARY_PARTITION}, 'sk': {'S': sort_key}}
+            }})
+        
+        head_put = _head_put(head, version)
+        fits = (
+            len(actions) < MAX_TRANSACTION_ITEMS
+            and sum(map(_action_bytes, actions)) + _action_bytes(head_put) <= MAX_TRANSACTION_BYTES
+        )
+        try:
+            if fits:
+                client.transact_write_items(TransactItems=[{'Put': head_put}] + actions)
+            else:
+                _write_in_steps(client, head, version, actions)
+            read_cache.invalidate_table(BLOGPOST_INDEX_TABLE)
+            return
+        except Exception as e:
+            if not _is_conflict(e):
+                raise
+            time.sleep(random.uniform(0, 0.05 * (2 ** attempt)))
+    
+    raise SummaryIndexError(f"Summary update conflicted {MAX_WRITE_ATTEMPTS} times")
+
+
+def _write_in_steps(client, head: Dict[str, Any], version: int, actions: List[Dict[str, Any]]) -> None:
+    """Write a change too big for one transaction (see the module comment)."""
+    stale_version = version + 1
+    stale_head = {
+        'pk': SUMMARY_PARTITION,
+        'sk': HEAD_SORT_KEY,
+        'version': stale_version,
+        'stale': True,
+        'shard_hashes': [],
+        'count': 0,
+        'digest': '',
+        'updated_at': head['updated_at']
+    }
+    client.transact_write_items(TransactItems=[{'Put': _head_put(stale_head, version)}])
+    read_cache.invalidate_table(BLOGPOST_INDEX_TABLE)
+    
+    # Every step fails if another writer has taken over HEAD meanwhile
+    check = {'ConditionCheck': {
+        'TableName': BLOGPOST_INDEX_TABLE,
+        'Key': {'pk': {'S': SUMMARY_PARTITION}, 'sk': {'S': HEAD_SORT_KEY}},
+        **_version_condition(stale_version)
+    }}
+    for chunk in _chunk_actions(actions, check):
+        client.transact_write_items(TransactItems=[check] + chunk)
+    
+    final_head = dict(head, version=stale_version + 1)
+    client.transact_write_items(TransactItems=[{'Put': _head_put(final_head, stale_version)}])
+
+
+def upsert_summary(post: Dict[str, Any]) -> None:
+    """
+    Add or replace a blogpost's summary (call after creating or updating the post).
+    
+    The first write builds the collection from the existing blogpost table.
+    """
+    batch_upsert_summaries([post])
+
+
+def batch_upsert_summaries(posts: List[Dict[str, Any]]) -> None:
+    """Add or replace the summaries of many blogposts in one collection write."""
+    new_summaries = {summary['slug']: summary for summary in map(summarize, posts)}
+    if not new_summaries:
+        return
+    
+    def mutate(summaries):
+        return [s for s in summaries if s.get('slug') not in new_summaries] + list(new_summaries.values())
+    
+    _write(mutate)
+
+
+def remove_summary(slug: str) -> None:
+    """Remove a blogpost's summary (call after deleting the post)."""
+    def mutate(summaries):
+        return [s for s in summaries if s.get('slug') != slug]
+    
+    _write(mutate)
+
+
+def rebuild_summaries() -> None:
+    """Rebuild the whole collection from the blogpost table (repair / backfill)."""
+    _write(lambda summaries: _bootstrap())
+
+
+def mark_summaries_stale() -> None:
+    """
+    Mark the collection stale after a failed update, so GET /blogpost scans
+    until the next write rebuilds it from the blogpost table.
+    """
+    update_item(
+        BLOGPOST_INDEX_TABLE,
+        {'pk': SUMMARY_PARTITION, 'sk': HEAD_SORT_KEY},
+        'SET #stale = :stale, updated_at = :now ADD #version :one',
+        {':stale': True, ':now': datetime.utcnow().isoformat(), ':one': 1},
+        {'#stale': 'stale', '#version': 'version'}
+    )
+
+
+def update_summaries(posts: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Add created blogposts to the summary collection.
+    
+    On failure the collection is marked stale, so GET /blogpost scans and
+    the next write rebuilds it from the blogpost table instead of copying a
+    collection without these posts.
+    
+    Returns:
+        The error message, or None if the collection was updated
+    """
+    try:
+        batch_upsert_summaries(posts)
+        return None
+    except Exception as e:
+        print(f"Error updating blogpost summary index: {str(e)}")
+        try:
+            mark_summaries_stale()
+        except Exception as stale_error:
+            print(f"Error marking blogpost summary index stale: {str(stale_error)}")
+        return str(e)
+
+
+def normalize_tag(tag: str) -> str:
+    """Normalize a tag for the index (tag matching is case-insensitive)."""
+    return tag.lower()
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_PREFIX}{normalize_tag(tag)}"
+
+
+def tag_entries(post: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Build the tag index items for a blogpost (one per distinct tag)."""
+    summary = summarize(post)
+    sort_key = f"{summary['date']}#{summary['slug']}"
+    partitions = {
+        _tag_key(tag) for tag in post.get('tags') or []
+        if isinstance(tag, str)
+    }
+    return [{'pk': pk, 'sk': sort_key, **summary} for pk in sorted(partitions)]
+
+
+def _index_ready(partition: str, use_cache: bool) -> bool:
+    """Check for the marker item written once an index has been fully built."""
+    key = {'pk': partition, 'sk': HEAD_SORT_KEY}
+    return get_item(BLOGPOST_INDEX_TABLE, key, use_cache=use_cache) is not None
+
+
+def _mark_ready(partition: str, posts: int) -> None:
+    batch_write_items(BLOGPOST_INDEX_TABLE, items=[{
+        'pk': partition,
+        'sk': HEAD_SORT_KEY,
+        'posts': posts,
+        'updated_at': datetime.utcnow().isoformat()
+    }])
+
+
+def _date_range(
+    sort_key_name: str,
+    date_from: Optional[str],
+    date_to: Optional[str]
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the sort key part of a key condition for '<date>#<slug>' sort keys.
+    
+    Both bounds are inclusive and compared as date prefixes, so
+    from=2024&to=2024 selects every post dated in 2024.
+    """
+    if date_from and date_to:
+        return (
+            f" AND {sort_key_name} BETWEEN :date_from AND :date_to",
+            {':date_from': date_from, ':date_to': date_to + DATE_RANGE_END}
+        )
+    if date_from:
+        return f" AND {sort_key_name} >= :date_from", {':date_from': date_from}
+    if date_to:
+        return f" AND {sort_key_name} <= :date_to", {':date_to': date_to + DATE_RANGE_END}
+    return '', {}
+
+
+def in_date_range(date: str, date_from: Optional[str], date_to: Optional[str]) -> bool:
+    """Apply the same inclusive prefix bounds as _date_range to a single date."""
+    if date_from and date < date_from:
+        return False
+    if date_to and date > date_to + DATE_RANGE_END:
+        return False
+    return True
+
+
+def tag_index_ready(use_cache: bool = True) -> bool:
+    """Check whether the tag index has been built (see rebuild_tag_index)."""
+    return _index_ready(TAG_INDEX_PARTITION, use_cache)
+
+
+def rebuild_tag_index() -> int:
+    """
+    Write tag index items for every blogpost, then mark the index as complete.
+    
+    Returns:
+        Number of index items written
+    """
+    posts = scan_table(BLOGPOST_TABLE, projection=SUMMARY_FIELDS + ['tags'])
+    entries = [entry for post in posts for entry in tag_entries(post)]
+    written = batch_write_items(BLOGPOST_INDEX_TABLE, items=entries)
+    _mark_ready(TAG_INDEX_PARTITION, len(posts))
+    return written
+
+
+def index_tags(post: Dict[str, Any]) -> None:
+    """
+    Add a blogpost to the tag index (call after creating the post).
+    
+    The first call builds the index from the existing blogpost table.
+    """
+    batch_index_tags([post])
+
+
+def invalidate_tag_index() -> None:
+    """
+    Drop the tag index marker after a failed update, so ?tag= scans until
+    the next index_tags call rebuilds the index.
+    """
+    batch_write_items(BLOGPOST_INDEX_TABLE, delete_keys=[{'pk': TAG_INDEX_PARTITION, 'sk': HEAD_SORT_KEY}])
+
+
+def batch_index_tags(posts: List[Dict[str, Any]]) -> None:
+    """Add many blogposts to the tag index (entries are written 25 per request)."""
+    if not tag_index_ready(use_cache=False):
+        rebuild_tag_index()
+        return
+    entries = [entry for post in posts for entry in tag_entries(post)]
+    if entries:
+        batch_write_items(BLOGPOST_INDEX_TABLE, items=entries)
+
+
+def update_tag_index(posts: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Add created blogposts to the tag index.
+    
+    On failure the index marker is dropped, so ?tag= scans and the next
+    write rebuilds the index from the blogpost table.
+    
+    Returns:
+        The error message, or None if the index was updated
+    """
+    try:
+        batch_index_tags(posts)
+        return None
+    except Exception as e:
+        print(f"Error updating blogpost tag index: {str(e)}")
+        try:
+            invalidate_tag_index()
+        except Exception as marker_error:
+            print(f"Error invalidating blogpost tag index: {str(marker_error)}")
+        return str(e)
+
+
+def unindex_tags(post: Dict[str, Any]) -> None:
+    """Remove a blogpost from the tag index (call after deleting the post)."""
+    keys = [{'pk': entry['pk'], 'sk': entry['sk']} for entry in tag_entries(post)]
+    if keys:
+        batch_write_items(BLOGPOST_INDEX_TABLE, delete_keys=keys)
+
+
+def tag_pages(
+    tag: str,
+    newest_first: bool = True,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+) -> Iterator[Page]:
+    """
+    Read the summaries of the posts with a tag, ordered by date.
+    
+    Args:
+        tag: Tag to look up (case-insensitive)
+        newest_first: False for oldest first
+        limit: Optional maximum number of summaries per page
+        cursor: Optional cursor returned with a previous page
+        date_from: Optional first date (inclusive prefix, e.g. '2024' or '2024-03-01')
+        date_to: Optional last date (inclusive prefix)
+    
+    Yields:
+        Page of summaries with the cursor for the next page (None on the last page)
+    """
+    range_condition, range_values = _date_range('sk', date_from, date_to)
+    return query_pages(
+        BLOGPOST_INDEX_TABLE,
+        'pk = :pk' + range_condition,
+        {':pk': _tag_key(tag), **range_values},
+        limit=limit,
+        cursor=cursor,
+        projection=SUMMARY_FIELDS,
+        scan_index_forward=not newest_first
+    )
+
+
+def date_index_attributes(post: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the attributes that place a blogpost in the date_index GSI."""
+    return {
+        DATE_INDEX_PARTITION_KEY: DATE_INDEX_PARTITION,
+        DATE_INDEX_SORT_KEY: f"{post.get('date', '')}#{post.get('slug', '')}"
+    }
+
+
+def strip_index_attributes(post: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove the date_index attributes from a blogpost before returning it."""
+    return {k: v for k, v in post.items() if k not in INDEX_ATTRIBUTES}
+
+
+def date_index_ready(use_cache: bool = True) -> bool:
+    """Check whether every blogpost carries the date_index attributes (see backfill_date_index)."""
+    return _index_ready(DATE_INDEX_MARKER_PARTITION, use_cache)
+
+
+def backfill_date_index() -> int:
+    """
+    Add the date_index attributes to blogposts created before the index existed,
+    then mark the index as complete.
+    
+    Returns:
+        Number of blogposts updated
+    """
+    posts = scan_table(BLOGPOST_TABLE, projection=['slug', 'date'] + INDEX_ATTRIBUTES)
+    updated = 0
+    for post in posts:
+        attributes = date_index_attributes(post)
+        if all(post.get(name) == value for name, value in attributes.items()):
+            continue
+        update_item(
+            BLOGPOST_TABLE,
+            {'slug': post['slug']},
+            'SET ' + ', '.join(f"{name} = :{name}" for name in attributes),
+            {f":{name}": value for name, value in attributes.items()}
+        )
+        updated += 1
+    _mark_ready(DATE_INDEX_MARKER_PARTITION, len(posts))
+    return updated
+
+
+def ensure_date_index() -> None:
+    """Backfill the date_index once (call after creating a post)."""
+    if not date_index_ready(use_cache=False):
+        backfill_date_index()
+
+
+def update_post_indexes(posts: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Update the indexes behind GET /blogpost for created blogposts (call
+    once per create request, after the posts are stored).
+    
+    A failed index does not raise: it is marked so lists scan instead of
+    leaving the posts out, reported, and counted in IndexUpdateErrors. The
+    list version is replaced last, so a list is never older than its ETag,
+    and retried once, since without it clients keep getting 304 for lists
+    without the new posts.
+    
+    Returns:
+        One {'index': name, 'error': message} per failed update ('summaries',
+        'tags', 'date' or 'listVersion')
+    """
+    errors = []
+    for index, error in (('summaries', update_summaries(posts)), ('tags', update_tag_index(posts))):
+        if error:
+            errors.append({'index': index, 'error': error})
+    
+    try:
+        ensure_date_index()
+    except Exception as e:
+        # The new posts carry their date_index keys; the marker stays unset
+        print(f"Error backfilling blogpost date index: {str(e)}")
+        errors.append({'index': 'date', 'error': str(e)})
+    
+    for attempt in range(2):
+        try:
+            touch_list_etag(BLOGPOST_TABLE, posts[-1])
+            break
+        except Exception as e:
+            print(f"Error updating blogpost list version: {str(e)}")
+            if attempt:
+                errors.append({'index': 'listVersion', 'error': str(e)})
+    
+    if errors:
+        add_count('IndexUpdateErrors', len(errors))
+    return errors
+
+
+def date_pages(
+    newest_first: bool = True,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+) -> Iterator[Page]:
+    """
+    Read blogpost summaries from the date_index GSI, ordered by date.
+    
+    Args:
+        newest_first: False for oldest first
+        limit: Optional maximum number of summaries per page
+        cursor: Optional cursor returned with a previous page
+        date_from: Optional first date (inclusive prefix, e.g. '2024' or '2024-03-01')
+        date_to: Optional last date (inclusive prefix)
+    
+    Yields:
+        Page of summaries with the cursor for the next page (None on the last page)
+    """
+    range_condition, range_values = _date_range(DATE_INDEX_SORT_KEY, date_from, date_to)
+    return query_pages(
+        BLOGPOST_TABLE,
+        f"{DATE_INDEX_PARTITION_KEY} = :pk" + range_condition,
+        {':pk': DATE_INDEX_PARTITION, **range_values},
+        index_name=DATE_INDEX_NAME,
+        limit=limit,
+        cursor=cursor,
+        projection=SUMMARY_FIELDS,
+        scan_index_forward=not newest_first
+    )
@@ -5,10 +5,11 @@ resource "aws_apigatewayv2_api" "main" {
   description   = "API Gateway for ${var.project_name}"
 
   cors_configuration {
-    allow_origins = ["*"]
-    allow_methods = ["*"]
-    allow_headers = ["*"]
-    max_age       = 300
+    allow_origins  = ["*"]
+    allow_methods  = ["*"]
+    allow_headers  = ["*"]
+    expose_headers = ["etag"]
+    max_age        = 300
   }
 
   tags = {
@@ -17,27 +18,74 @@ resource "aws_apigatewayv2_api" "main" {
   }
 }
 
+# Integration behind each route: the endpoint's own function, or the router
+# (one() is null for the layout that isn't deployed)
+locals {
+  router_integration_id = one(aws_apigatewayv2_integration.router[*].id)
+
+  route_integration_ids = {
+    blogpost_create  = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.blogpost_create[*].id)
+    blogpost_batch_create = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.blogpost_batch_create[*].id)
+    blogpost_get     = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.blogpost_get[*].id)
+    blogpost_list    = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.blogpost_list[*].id)
+    portfolio_create = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.portfolio_create[*].id)
+    portfolio_get    = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.portfolio_get[*].id)
+    portfolio_list   = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.portfolio_list[*].id)
+    resume_create    = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.resume_create[*].id)
+    resume_list      = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.resume_list[*].id)
+    image_presign    = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.image_presign[*].id)
+    image_finalize   = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.image_finalize[*].id)
+    image_upload     = var.deployment_mode == "router" ? local.router_integration_id : one(aws_apigatewayv2_integration.image_upload[*].id)
+  }
+}
+
+# API Gateway Integration for the router (router deployment)
+resource "aws_apigatewayv2_integration" "router" {
+  count = local.router_count
+
+  api_id           = aws_apigatewayv2_api.main.id
+  integration_type = "AWS_PROXY"
+  integration_uri  = aws_lambda_function.router[0].invoke_arn
+  integration_method = "POST"
+}
+
 # API Gateway Integration for Blogpost Create
 resource "aws_apigatewayv2_integration" "blogpost_create" {
+  count = local.function_count
+
+  api_id           = aws_apigatewayv2_api.main.id
+  integration_type = "AWS_PROXY"
+  integration_uri  = aws_lambda_function.blogpost_create[0].invoke_arn
+  integration_method = "POST"
+}
+
+# API Gateway Integration for Blogpost Batch Create
+resource "aws_apigatewayv2_integration" "blogpost_batch_create" {
+  count = local.function_count
+
   api_id           = aws_apigatewayv2_api.main.id
   integration_type = "AWS_PROXY"
-  integration_uri  = aws_lambda_function.blogpost_create.invoke_arn
+  integration_uri  = aws_lambda_function.blogpost_batch_create[0].invoke_arn
   integration_method = "POST"
 }
 
 # API Gateway Integration for Blogpost Get
 resource "aws_apigatewayv2_integration" "blogpost_get" {
+  count = local.function_count
+
   api_id           = aws_apigatewayv2_api.main.id
   integration_type = "AWS_PROXY"
-  integration_uri  = aws_lambda_function.blogpost_get.invoke_arn
+  integration_uri  = aws_lambda_function.blogpost_get[0].invoke_arn
   integration_method = "POST"
 }
 
 # API Gateway Integration for Blogpost List
 resource "aws_apigatewayv2_integration" "blogpost_list" {
+  count = local.function_count
+
   api_id           = aws_apigatewayv2_api.main.id
   integration_type = "AWS_PROXY"
-  integration_uri  = aws_lambda_function.blogpost_list.invoke_arn
+  integration_uri  = aws_lambda_function.blogpost_list[0].invoke_arn
   integration_method = "POST"
 }
 
@@ -45,44 +93,57 @@ resource "aws_apigatewayv2_integration" "blogpost_list" {
 resource "aws_apigatewayv2_route" "blogpost_create" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "POST /blogpost"
-  target    = "integrations/${aws_apigatewayv2_integration.blogpost_create.id}"
+  target    = "integrations/${local.route_integration_ids.blogpost_create}"
+}
+
+# API Gateway Route for Blogpost - Batch create (POST)
+resource "aws_apigatewayv2_route" "blogpost_batch_create" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /blogpost/batch"
+  target    = "integrations/${local.route_integration_ids.blogpost_batch_create}"
 }
 
 # API Gateway Route for Blogpost - Get by slug (GET)
 resource "aws_apigatewayv2_route" "blogpost_get" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "GET /blogpost/{slug}"
-  target    = "integrations/${aws_apigatewayv2_integration.blogpost_get.id}"
+  target    = "integrations/${local.route_integration_ids.blogpost_get}"
 }
 
 # API Gateway Route for Blogpost - List all (GET)
 resource "aws_apigatewayv2_route" "blogpost_list" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "GET /blogpost"
-  target    = "integrations/${aws_apigatewayv2_integration.blogpost_list.id}"
+  target    = "integrations/${local.route_integration_ids.blogpost_list}"
 }
 
 # API Gateway Integration for Portfolio Create
 resource "aws_apigatewayv2_integration" "portfolio_create" {
+  count = local.function_count
+
   api_id           = aws_apigatewayv2_api.main.id
   integration_type = "AWS_PROXY"
-  integration_uri  = aws_lambda_function.portfolio_create.invoke_arn
+  integration_uri  = aws_lambda_function.portfolio_create[0].invoke_arn
   integration_method = "POST"
 }
 
 # API Gateway Integration for Portfolio Get
 resource "aws_apigatewayv2_integration" "portfolio_get" {
+  count = local.function_count
+
   api_id           = aws_apigatewayv2_api.main.id
   integration_type = "AWS_PROXY"
-  integration_uri  = aws_lambda_function.portfolio_get.invoke_arn
+  integration_uri  = aws_lambda_function.portfolio_get[0].invoke_arn
   integration_method = "POST"
 }
 
 # API Gateway Integration for Portfolio List
 resource "aws_apigatewayv2_integration" "portfolio_list" {
+  count = local.function_count
+
   api_id           = aws_apigatewayv2_api.main.id
   integration_type = "AWS_PROXY"
-  integration_uri  = aws_lambda_function.portfolio_list.invoke_arn
+  integration_uri  = aws_lambda_function.portfolio_list[0].invoke_arn
   integration_method = "POST"
 }
 
@@ -90,36 +151,40 @@ resource "aws_apigatewayv2_integration" "portfolio_list" {
 resource "aws_apigatewayv2_route" "portfolio_create" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "POST /portfolio"
-  target    = "integrations/${aws_apigatewayv2_integration.portfolio_create.id}"
+  target    = "integrations/${local.route_integration_ids.portfolio_create}"
 }
 
 # API Gateway Route for Portfolio - Get by slug (GET)
 resource "aws_apigatewayv2_route" "portfolio_get" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "GET /portfolio/{slug}"
-  target    = "integrations/${aws_apigatewayv2_integration.portfolio_get.id}"
+  target    = "integrations/${local.route_integration_ids.portfolio_get}"
 }
 
 # API Gateway Route for Portfolio - List all (GET)
 resource "aws_apigatewayv2_route" "portfolio_list" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "GET /portfolio"
-  target    = "integrations/${aws_apigatewayv2_integration.portfolio_list.id}"
+  target    = "integrations/${local.route_integration_ids.portfolio_list}"
 }
 
 # API Gateway Integration for Resume Create
 resource "aws_apigatewayv2_integration" "resume_create" {
+  count = local.function_count
+
   api_id           = aws_apigatewayv2_api.main.id
   integration_type = "AWS_PROXY"
-  integration_uri  = aws_lambda_function.resume_create.invoke_arn
+  integration_uri  = aws_lambda_function.resume_create[0].invoke_arn
   integration_method = "POST"
 }
 
 # API Gateway Integration for Resume List
 resource "aws_apigatewayv2_integration" "resume_list" {
+  count = local.function_count
+
   api_id           = aws_apigatewayv2_api.main.id
   integration_type = "AWS_PROXY"
-  integration_uri  = aws_lambda_function.resume_list.invoke_arn
+  integration_uri  = aws_lambda_function.resume_list[0].invoke_arn
   integration_method = "POST"
 }
 
@@ -127,21 +192,23 @@ resource "aws_apigatewayv2_integration" "resume_list" {
 resource "aws_apigatewayv2_route" "resume_create" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "POST /resume"
-  target    = "integrations/${aws_apigatewayv2_integration.resume_create.id}"
+  target    = "integrations/${local.route_integration_ids.resume_create}"
 }
 
 # API Gateway Route for Resume - List all (GET)
 resource "aws_apigatewayv2_route" "resume_list" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "GET /resume"
-  target    = "integrations/${aws_apigatewayv2_integration.resume_list.id}"
+  target    = "integrations/${local.route_integration_ids.resume_list}"
 }
 
 # API Gateway Integration for Image Upload
 resource "aws_apigatewayv2_integration" "image_upload" {
+  count = local.function_count
+
   api_id           = aws_apigatewayv2_api.main.id
   integration_type = "AWS_PROXY"
-  integration_uri  = aws_lambda_function.image_upload.invoke_arn
+  integration_uri  = aws_lambda_function.image_upload[0].invoke_arn
   integration_method = "POST"
 }
 
@@ -149,7 +216,41 @@ resource "aws_apigatewayv2_integration" "image_upload" {
 resource "aws_apigatewayv2_route" "image_upload" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "POST /image/upload"
-  target    = "integrations/${aws_apigatewayv2_integration.image_upload.id}"
+  target    = "integrations/${local.route_integration_ids.image_upload}"
+}
+
+# API Gateway Integration for Image Presign
+resource "aws_apigatewayv2_integration" "image_presign" {
+  count = local.function_count
+
+  api_id           = aws_apigatewayv2_api.main.id
+  integration_type = "AWS_PROXY"
+  integration_uri  = aws_lambda_function.image_presign[0].invoke_arn
+  integration_method = "POST"
+}
+
+# API Gateway Route for Image Presign (POST)
+resource "aws_apigatewayv2_route" "image_presign" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /image/presign"
+  target    = "integrations/${local.route_integration_ids.image_presign}"
+}
+
+# API Gateway Integration for Image Finalize
+resource "aws_apigatewayv2_integration" "image_finalize" {
+  count = local.function_count
+
+  api_id           = aws_apigatewayv2_api.main.id
+  integration_type = "AWS_PROXY"
+  integration_uri  = aws_lambda_function.image_finalize[0].invoke_arn
+  integration_method = "POST"
+}
+
+# API Gateway Route for Image Finalize (POST)
+resource "aws_apigatewayv2_route" "image_finalize" {
+  api_id    = aws_apigatewayv2_api.main.id
+  route_key = "POST /image/finalize"
+  target    = "integrations/${local.route_integration_ids.image_finalize}"
 }
 
 # API Gateway Stage
@@ -171,74 +272,223 @@ resource "aws_apigatewayv2_stage" "main" {
 
 # Lambda Permissions for API Gateway
 resource "aws_lambda_permission" "blogpost_create_api_gw" {
+  count = local.function_count
+
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.blogpost_create[0].function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "blogpost_batch_create_api_gw" {
+  count = local.function_count
+
   statement_id  = "AllowExecutionFromAPIGateway"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.blogpost_create.function_name
+  function_name = aws_lambda_function.blogpost_batch_create[0].function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
 resource "aws_lambda_permission" "blogpost_get_api_gw" {
+  count = local.function_count
+
   statement_id  = "AllowExecutionFromAPIGateway"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.blogpost_get.function_name
+  function_name = aws_lambda_function.blogpost_get[0].function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
 resource "aws_lambda_permission" "blogpost_list_api_gw" {
+  count = local.function_count
+
   statement_id  = "AllowExecutionFromAPIGateway"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.blogpost_list.function_name
+  function_name = aws_lambda_function.blogpost_list[0].function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
 resource "aws_lambda_permission" "portfolio_create_api_gw" {
+  count = local.function_count
+
   statement_id  = "AllowExecutionFromAPIGateway"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.portfolio_create.function_name
+  function_name = aws_lambda_function.portfolio_create[0].function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
 resource "aws_lambda_permission" "portfolio_get_api_gw" {
+  count = local.function_count
+
   statement_id  = "AllowExecutionFromAPIGateway"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.portfolio_get.function_name
+  function_name = aws_lambda_function.portfolio_get[0].function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
 resource "aws_lambda_permission" "portfolio_list_api_gw" {
+  count = local.function_count
+
   statement_id  = "AllowExecutionFromAPIGateway"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.portfolio_list.function_name
+  function_name = aws_lambda_function.portfolio_list[0].function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
 resource "aws_lambda_permission" "resume_create_api_gw" {
+  count = local.function_count
+
   statement_id  = "AllowExecutionFromAPIGateway"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.resume_create.function_name
+  function_name = aws_lambda_function.resume_create[0].function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
 resource "aws_lambda_permission" "resume_list_api_gw" {
+  count = local.function_count
+
   statement_id  = "AllowExecutionFromAPIGateway"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.resume_list.function_name
+  function_name = aws_lambda_function.resume_list[0].function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
 resource "aws_lambda_permission" "image_upload_api_gw" {
+  count = local.function_count
+
   statement_id  = "AllowExecutionFromAPIGateway"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.image_upload.function_name
+  function_name = aws_lambda_function.image_upload[0].function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
+resource "aws_lambda_permission" "image_presign_api_gw" {
+  count = local.function_count
+
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.image_presign[0].function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "image_finalize_api_gw" {
+  count = local.function_count
+
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.image_finalize[0].function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "router_api_gw" {
+  count = local.router_count
+
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.router[0].function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
+}
+
+# The per-endpoint integrations and permissions gained a count with
+# deployment_mode; keep existing deployments in place
+moved {
+  from = aws_apigatewayv2_integration.blogpost_create
+  to   = aws_apigatewayv2_integration.blogpost_create[0]
+}
+
+moved {
+  from = aws_lambda_permission.blogpost_create_api_gw
+  to   = aws_lambda_permission.blogpost_create_api_gw[0]
+}
+
+moved {
+  from = aws_apigatewayv2_integration.blogpost_get
+  to   = aws_apigatewayv2_integration.blogpost_get[0]
+}
+
+moved {
+  from = aws_lambda_permission.blogpost_get_api_gw
+  to   = aws_lambda_permission.blogpost_get_api_gw[0]
+}
+
+moved {
+  from = aws_apigatewayv2_integration.blogpost_list
+  to   = aws_apigatewayv2_integration.blogpost_list[0]
+}
+
+moved {
+  from = aws_lambda_permission.blogpost_list_api_gw
+  to   = aws_lambda_permission.blogpost_list_api_gw[0]
+}
+
+moved {
+  from = aws_apigatewayv2_integration.portfolio_create
+  to   = aws_apigatewayv2_integration.portfolio_create[0]
+}
+
+moved {
+  from = aws_lambda_permission.portfolio_create_api_gw
+  to   = aws_lambda_permission.portfolio_create_api_gw[0]
+}
+
+moved {
+  from = aws_apigatewayv2_integration.portfolio_get
+  to   = aws_apigatewayv2_integration.portfolio_get[0]
+}
+
+moved {
+  from = aws_lambda_permission.portfolio_get_api_gw
+  to   = aws_lambda_permission.portfolio_get_api_gw[0]
+}
+
+moved {
+  from = aws_apigatewayv2_integration.portfolio_list
+  to   = aws_apigatewayv2_integration.portfolio_list[0]
+}
+
+moved {
+  from = aws_lambda_permission.portfolio_list_api_gw
+  to   = aws_lambda_permission.portfolio_list_api_gw[0]
+}
+
+moved {
+  from = aws_apigatewayv2_integration.resume_create
+  to   = aws_apigatewayv2_integration.resume_create[0]
+}
+
+moved {
+  from = aws_lambda_permission.resume_create_api_gw
+  to   = aws_lambda_permission.resume_create_api_gw[0]
+}
+
+moved {
+  from = aws_apigatewayv2_integration.resume_list
+  to   = aws_apigatewayv2_integration.resume_list[0]
+}
+
+moved {
+  from = aws_lambda_permission.resume_list_api_gw
+  to   = aws_lambda_permission.resume_list_api_gw[0]
+}
+
+moved {
+  from = aws_apigatewayv2_integration.image_upload
+  to   = aws_apigatewayv2_integration.image_upload[0]
+}
+
+moved {
+  from = aws_lambda_permission.image_upload_api_gw
+  to   = aws_lambda_permission.image_upload_api_gw[0]
+}
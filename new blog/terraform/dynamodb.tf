@@ -9,6 +9,26 @@ resource "aws_dynamodb_table" "blogpost" {
     type = "S"
   }
 
+  attribute {
+    name = "list_pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "date_slug"
+    type = "S"
+  }
+
+  # All posts in one partition sorted by "<date>#<slug>": date ordering,
+  # "latest N" and date ranges for GET /blogpost without scanning
+  global_secondary_index {
+    name               = "date_index"
+    hash_key           = "list_pk"
+    range_key          = "date_slug"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["title_image_url", "title", "summary", "author", "date"]
+  }
+
   tags = {
     Name        = "${var.project_name}-blogpost"
     Environment = var.environment
@@ -49,3 +69,49 @@ resource "aws_dynamodb_table" "experience" {
   }
 }
 
+
+# DynamoDB Table for derived blogpost indexes (materialized summary collection)
+resource "aws_dynamodb_table" "blogpost_index" {
+  name           = "blogpost_index"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "pk"
+  range_key      = "sk"
+
+  attribute {
+    name = "pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "sk"
+    type = "S"
+  }
+
+  tags = {
+    Name        = "${var.project_name}-blogpost-index"
+    Environment = var.environment
+  }
+}
+
+# DynamoDB Table for direct-to-S3 image uploads (POST /image/presign and
+# /image/finalize); pending uploads expire through TTL
+resource "aws_dynamodb_table" "image_upload" {
+  name           = "image_upload"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "id"
+
+  attribute {
+    name = "id"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "${var.project_name}-image-upload"
+    Environment = var.environment
+  }
+}
@@ -46,12 +46,18 @@ resource "aws_iam_role_policy" "lambda" {
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Scan",
-          "dynamodb:Query"
+          "dynamodb:Query",
+          "dynamodb:BatchGetItem",
+          "dynamodb:BatchWriteItem",
+          "dynamodb:TransactWriteItems"
         ]
         Resource = [
           aws_dynamodb_table.blogpost.arn,
+          "${aws_dynamodb_table.blogpost.arn}/index/*",
           aws_dynamodb_table.portfolio.arn,
-          aws_dynamodb_table.experience.arn
+          aws_dynamodb_table.experience.arn,
+          aws_dynamodb_table.blogpost_index.arn,
+          aws_dynamodb_table.image_upload.arn
         ]
       },
       {
@@ -59,9 +65,18 @@ resource "aws_iam_role_policy" "lambda" {
         Action = [
           "s3:PutObject",
           "s3:GetObject",
-          "s3:DeleteObject"
+          "s3:DeleteObject",
+          "s3:AbortMultipartUpload"
         ]
         Resource = "${aws_s3_bucket.images.arn}/*"
+      },
+      {
+        # Without it HeadObject answers 403 instead of 404 for a missing key
+        Effect = "Allow"
+        Action = [
+          "s3:ListBucket"
+        ]
+        Resource = aws_s3_bucket.images.arn
       }
     ]
   })
@@ -1,9 +1,38 @@
+# Lambda layout (var.deployment_mode):
+#   functions  one function per endpoint (the resources below with function_count)
+#   router     one function serving every route (src/lambda/router/handler.py)
+locals {
+  function_count = var.deployment_mode == "functions" ? 1 : 0
+  router_count   = var.deployment_mode == "router" ? 1 : 0
+
+  # Functions that decode images need about 8 bytes per pixel of the largest
+  # image that gets variants, plus the runtime
+  image_memory_size = max(
+    var.lambda_memory_size,
+    var.image_lambda_memory_size,
+    ceil(var.image_variant_max_pixels * 8 / 1048576) + 256
+  )
+}
+
 # Prepare Lambda packages with shared utils
-# We use null_resource to copy utils into each function directory before packaging
+# We use null_resource to copy utils into each function directory before packaging.
+# Each package is rebuilt when its handler or any module of its group's utils
+# copy (the synced src/utils modules it ships) changes.
+locals {
+  utils_hashes = {
+    for group in ["blogpost", "portfolio", "resume", "image"] : group => sha1(join("", [
+      for f in sort(fileset("${path.module}/../src/lambda/${group}/utils", "*.py")) :
+      filesha1("${path.module}/../src/lambda/${group}/utils/${f}")
+    ]))
+  }
+}
+
 resource "null_resource" "blogpost_create_package" {
+  count = local.function_count
+
   triggers = {
     handler_hash = filemd5("${path.module}/../src/lambda/blogpost/blogpost-create/handler.py")
-    utils_hash    = filemd5("${path.module}/../src/lambda/blogpost/utils/dynamodb_helper.py")
+    utils_hash   = local.utils_hashes["blogpost"]
   }
 
   provisioner "local-exec" {
@@ -15,10 +44,29 @@ resource "null_resource" "blogpost_create_package" {
   }
 }
 
+resource "null_resource" "blogpost_batch_create_package" {
+  count = local.function_count
+
+  triggers = {
+    handler_hash = filemd5("${path.module}/../src/lambda/blogpost/blogpost-batch-create/handler.py")
+    utils_hash   = local.utils_hashes["blogpost"]
+  }
+
+  provisioner "local-exec" {
+    command = <<-EOT
+      mkdir -p ${path.module}/.terraform/blogpost-batch-create-temp
+      cp -r ${path.module}/../src/lambda/blogpost/blogpost-batch-create/* ${path.module}/.terraform/blogpost-batch-create-temp/
+      cp -r ${path.module}/../src/lambda/blogpost/utils ${path.module}/.terraform/blogpost-batch-create-temp/
+    EOT
+  }
+}
+
 resource "null_resource" "blogpost_get_package" {
+  count = local.function_count
+
   triggers = {
     handler_hash = filemd5("${path.module}/../src/lambda/blogpost/blogpost-get/handler.py")
-    utils_hash   = filemd5("${path.module}/../src/lambda/blogpost/utils/dynamodb_helper.py")
+    utils_hash   = local.utils_hashes["blogpost"]
   }
 
   provisioner "local-exec" {
@@ -31,9 +79,11 @@ resource "null_resource" "blogpost_get_package" {
 }
 
 resource "null_resource" "blogpost_list_package" {
+  count = local.function_count
+
   triggers = {
     handler_hash = filemd5("${path.module}/../src/lambda/blogpost/blogpost-list/handler.py")
-    utils_hash   = filemd5("${path.module}/../src/lambda/blogpost/utils/dynamodb_helper.py")
+    utils_hash   = local.utils_hashes["blogpost"]
   }
 
   provisioner "local-exec" {
@@ -47,13 +97,26 @@ resource "null_resource" "blogpost_list_package" {
 
 # Archive Lambda function code
 data "archive_file" "blogpost_create_zip" {
+  count = local.function_count
+
   type        = "zip"
   source_dir  = "${path.module}/.terraform/blogpost-create-temp"
   output_path = "${path.module}/.terraform/blogpost-create.zip"
   depends_on  = [null_resource.blogpost_create_package]
 }
 
+data "archive_file" "blogpost_batch_create_zip" {
+  count = local.function_count
+
+  type        = "zip"
+  source_dir  = "${path.module}/.terraform/blogpost-batch-create-temp"
+  output_path = "${path.module}/.terraform/blogpost-batch-create.zip"
+  depends_on  = [null_resource.blogpost_batch_create_package]
+}
+
 data "archive_file" "blogpost_get_zip" {
+  count = local.function_count
+
   type        = "zip"
   source_dir  = "${path.module}/.terraform/blogpost-get-temp"
   output_path = "${path.module}/.terraform/blogpost-get.zip"
@@ -61,6 +124,8 @@ data "archive_file" "blogpost_get_zip" {
 }
 
 data "archive_file" "blogpost_list_zip" {
+  count = local.function_count
+
   type        = "zip"
   source_dir  = "${path.module}/.terraform/blogpost-list-temp"
   output_path = "${path.module}/.terraform/blogpost-list.zip"
@@ -68,9 +133,11 @@ data "archive_file" "blogpost_list_zip" {
 }
 
 resource "null_resource" "portfolio_create_package" {
+  count = local.function_count
+
   triggers = {
     handler_hash = filemd5("${path.module}/../src/lambda/portfolio/portfolio-create/handler.py")
-    utils_hash    = filemd5("${path.module}/../src/lambda/portfolio/utils/dynamodb_helper.py")
+    utils_hash   = local.utils_hashes["portfolio"]
   }
 
   provisioner "local-exec" {
@@ -83,9 +150,11 @@ resource "null_resource" "portfolio_create_package" {
 }
 
 resource "null_resource" "portfolio_get_package" {
+  count = local.function_count
+
   triggers = {
     handler_hash = filemd5("${path.module}/../src/lambda/portfolio/portfolio-get/handler.py")
-    utils_hash   = filemd5("${path.module}/../src/lambda/portfolio/utils/dynamodb_helper.py")
+    utils_hash   = local.utils_hashes["portfolio"]
   }
 
   provisioner "local-exec" {
@@ -98,9 +167,11 @@ resource "null_resource" "portfolio_get_package" {
 }
 
 resource "null_resource" "portfolio_list_package" {
+  count = local.function_count
+
   triggers = {
     handler_hash = filemd5("${path.module}/../src/lambda/portfolio/portfolio-list/handler.py")
-    utils_hash   = filemd5("${path.module}/../src/lambda/portfolio/utils/dynamodb_helper.py")
+    utils_hash   = local.utils_hashes["portfolio"]
   }
 
   provisioner "local-exec" {
@@ -114,6 +185,8 @@ resource "null_resource" "portfolio_list_package" {
 
 # Archive Lambda function code
 data "archive_file" "portfolio_create_zip" {
+  count = local.function_count
+
   type        = "zip"
   source_dir  = "${path.module}/.terraform/portfolio-create-temp"
   output_path = "${path.module}/.terraform/portfolio-create.zip"
@@ -121,6 +194,8 @@ data "archive_file" "portfolio_create_zip" {
 }
 
 data "archive_file" "portfolio_get_zip" {
+  count = local.function_count
+
   type        = "zip"
   source_dir  = "${path.module}/.terraform/portfolio-get-temp"
   output_path = "${path.module}/.terraform/portfolio-get.zip"
@@ -128,6 +203,8 @@ data "archive_file" "portfolio_get_zip" {
 }
 
 data "archive_file" "portfolio_list_zip" {
+  count = local.function_count
+
   type        = "zip"
   source_dir  = "${path.module}/.terraform/portfolio-list-temp"
   output_path = "${path.module}/.terraform/portfolio-list.zip"
@@ -135,9 +212,11 @@ data "archive_file" "portfolio_list_zip" {
 }
 
 resource "null_resource" "resume_create_package" {
+  count = local.function_count
+
   triggers = {
     handler_hash = filemd5("${path.module}/../src/lambda/resume/resume-create/handler.py")
-    utils_hash    = filemd5("${path.module}/../src/lambda/resume/utils/dynamodb_helper.py")
+    utils_hash   = local.utils_hashes["resume"]
   }
 
   provisioner "local-exec" {
@@ -150,9 +229,11 @@ resource "null_resource" "resume_create_package" {
 }
 
 resource "null_resource" "resume_list_package" {
+  count = local.function_count
+
   triggers = {
     handler_hash = filemd5("${path.module}/../src/lambda/resume/resume-list/handler.py")
-    utils_hash   = filemd5("${path.module}/../src/lambda/resume/utils/dynamodb_helper.py")
+    utils_hash   = local.utils_hashes["resume"]
   }
 
   provisioner "local-exec" {
@@ -166,6 +247,8 @@ resource "null_resource" "resume_list_package" {
 
 # Archive Lambda function code
 data "archive_file" "resume_create_zip" {
+  count = local.function_count
+
   type        = "zip"
   source_dir  = "${path.module}/.terraform/resume-create-temp"
   output_path = "${path.module}/.terraform/resume-create.zip"
@@ -173,6 +256,8 @@ data "archive_file" "resume_create_zip" {
 }
 
 data "archive_file" "resume_list_zip" {
+  count = local.function_count
+
   type        = "zip"
   source_dir  = "${path.module}/.terraform/resume-list-temp"
   output_path = "${path.module}/.terraform/resume-list.zip"
@@ -180,9 +265,11 @@ data "archive_file" "resume_list_zip" {
 }
 
 resource "null_resource" "image_upload_package" {
+  count = local.function_count
+
   triggers = {
     handler_hash = filemd5("${path.module}/../src/lambda/image/image-upload/handler.py")
-    utils_hash    = filemd5("${path.module}/../src/lambda/image/utils/s3_helper.py")
+    utils_hash   = local.utils_hashes["image"]
   }
 
   provisioner "local-exec" {
@@ -194,21 +281,77 @@ resource "null_resource" "image_upload_package" {
   }
 }
 
+resource "null_resource" "image_presign_package" {
+  count = local.function_count
+
+  triggers = {
+    handler_hash = filemd5("${path.module}/../src/lambda/image/image-presign/handler.py")
+    utils_hash   = local.utils_hashes["image"]
+  }
+
+  provisioner "local-exec" {
+    command = <<-EOT
+      mkdir -p ${path.module}/.terraform/image-presign-temp
+      cp -r ${path.module}/../src/lambda/image/image-presign/* ${path.module}/.terraform/image-presign-temp/
+      cp -r ${path.module}/../src/lambda/image/utils ${path.module}/.terraform/image-presign-temp/
+    EOT
+  }
+}
+
+resource "null_resource" "image_finalize_package" {
+  count = local.function_count
+
+  triggers = {
+    handler_hash = filemd5("${path.module}/../src/lambda/image/image-finalize/handler.py")
+    utils_hash   = local.utils_hashes["image"]
+  }
+
+  provisioner "local-exec" {
+    command = <<-EOT
+      mkdir -p ${path.module}/.terraform/image-finalize-temp
+      cp -r ${path.module}/../src/lambda/image/image-finalize/* ${path.module}/.terraform/image-finalize-temp/
+      cp -r ${path.module}/../src/lambda/image/utils ${path.module}/.terraform/image-finalize-temp/
+    EOT
+  }
+}
+
 # Archive Lambda function code
 data "archive_file" "image_upload_zip" {
+  count = local.function_count
+
   type        = "zip"
   source_dir  = "${path.module}/.terraform/image-upload-temp"
   output_path = "${path.module}/.terraform/image-upload.zip"
   depends_on  = [null_resource.image_upload_package]
 }
 
+data "archive_file" "image_presign_zip" {
+  count = local.function_count
+
+  type        = "zip"
+  source_dir  = "${path.module}/.terraform/image-presign-temp"
+  output_path = "${path.module}/.terraform/image-presign.zip"
+  depends_on  = [null_resource.image_presign_package]
+}
+
+data "archive_file" "image_finalize_zip" {
+  count = local.function_count
+
+  type        = "zip"
+  source_dir  = "${path.module}/.terraform/image-finalize-temp"
+  output_path = "${path.module}/.terraform/image-finalize.zip"
+  depends_on  = [null_resource.image_finalize_package]
+}
+
 # Lambda Function for Blogpost Create
 resource "aws_lambda_function" "blogpost_create" {
-  filename         = data.archive_file.blogpost_create_zip.output_path
+  count = local.function_count
+
+  filename         = data.archive_file.blogpost_create_zip[0].output_path
   function_name    = "${var.project_name}-blogpost-create"
   role            = aws_iam_role.lambda.arn
   handler         = "handler.lambda_handler"
-  source_code_hash = data.archive_file.blogpost_create_zip.output_base64sha256
+  source_code_hash = data.archive_file.blogpost_create_zip[0].output_base64sha256
   runtime         = var.lambda_runtime
   timeout         = var.lambda_timeout
   memory_size     = var.lambda_memory_size
@@ -219,6 +362,9 @@ resource "aws_lambda_function" "blogpost_create" {
       PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
       EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
       S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
       SECRET_TOKEN    = var.secret_token
     }
   }
@@ -229,13 +375,49 @@ resource "aws_lambda_function" "blogpost_create" {
   }
 }
 
+# Lambda Function for Blogpost Batch Create (bulk imports: more memory and
+# CPU for encoding and the concurrent batch requests)
+resource "aws_lambda_function" "blogpost_batch_create" {
+  count = local.function_count
+
+  filename         = data.archive_file.blogpost_batch_create_zip[0].output_path
+  function_name    = "${var.project_name}-blogpost-batch-create"
+  role            = aws_iam_role.lambda.arn
+  handler         = "handler.lambda_handler"
+  source_code_hash = data.archive_file.blogpost_batch_create_zip[0].output_base64sha256
+  runtime         = var.lambda_runtime
+  timeout         = var.lambda_timeout
+  memory_size     = max(var.lambda_memory_size, var.batch_lambda_memory_size)
+
+  environment {
+    variables = {
+      BLOGPOST_TABLE  = aws_dynamodb_table.blogpost.name
+      PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
+      EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
+      S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
+      BLOGPOST_BATCH_MAX_ITEMS = var.blogpost_batch_max_items
+      SECRET_TOKEN    = var.secret_token
+    }
+  }
+
+  tags = {
+    Name        = "${var.project_name}-blogpost-batch-create"
+    Environment = var.environment
+  }
+}
+
 # Lambda Function for Blogpost Get
 resource "aws_lambda_function" "blogpost_get" {
-  filename         = data.archive_file.blogpost_get_zip.output_path
+  count = local.function_count
+
+  filename         = data.archive_file.blogpost_get_zip[0].output_path
   function_name    = "${var.project_name}-blogpost-get"
   role            = aws_iam_role.lambda.arn
   handler         = "handler.lambda_handler"
-  source_code_hash = data.archive_file.blogpost_get_zip.output_base64sha256
+  source_code_hash = data.archive_file.blogpost_get_zip[0].output_base64sha256
   runtime         = var.lambda_runtime
   timeout         = var.lambda_timeout
   memory_size     = var.lambda_memory_size
@@ -246,6 +428,10 @@ resource "aws_lambda_function" "blogpost_get" {
       PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
       EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
       S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
+      READ_CACHE_TTL_SECONDS = var.read_cache_ttl_seconds
     }
   }
 
@@ -257,11 +443,13 @@ resource "aws_lambda_function" "blogpost_get" {
 
 # Lambda Function for Blogpost List
 resource "aws_lambda_function" "blogpost_list" {
-  filename         = data.archive_file.blogpost_list_zip.output_path
+  count = local.function_count
+
+  filename         = data.archive_file.blogpost_list_zip[0].output_path
   function_name    = "${var.project_name}-blogpost-list"
   role            = aws_iam_role.lambda.arn
   handler         = "handler.lambda_handler"
-  source_code_hash = data.archive_file.blogpost_list_zip.output_base64sha256
+  source_code_hash = data.archive_file.blogpost_list_zip[0].output_base64sha256
   runtime         = var.lambda_runtime
   timeout         = var.lambda_timeout
   memory_size     = var.lambda_memory_size
@@ -272,6 +460,11 @@ resource "aws_lambda_function" "blogpost_list" {
       PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
       EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
       S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
+      READ_CACHE_TTL_SECONDS = var.read_cache_ttl_seconds
+      CURSOR_SECRET   = sha256("cursor:${var.secret_token}")
     }
   }
 
@@ -283,11 +476,13 @@ resource "aws_lambda_function" "blogpost_list" {
 
 # Lambda Function for Portfolio Create
 resource "aws_lambda_function" "portfolio_create" {
-  filename         = data.archive_file.portfolio_create_zip.output_path
+  count = local.function_count
+
+  filename         = data.archive_file.portfolio_create_zip[0].output_path
   function_name    = "${var.project_name}-portfolio-create"
   role            = aws_iam_role.lambda.arn
   handler         = "handler.lambda_handler"
-  source_code_hash = data.archive_file.portfolio_create_zip.output_base64sha256
+  source_code_hash = data.archive_file.portfolio_create_zip[0].output_base64sha256
   runtime         = var.lambda_runtime
   timeout         = var.lambda_timeout
   memory_size     = var.lambda_memory_size
@@ -298,6 +493,9 @@ resource "aws_lambda_function" "portfolio_create" {
       PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
       EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
       S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
       SECRET_TOKEN    = var.secret_token
     }
   }
@@ -310,11 +508,13 @@ resource "aws_lambda_function" "portfolio_create" {
 
 # Lambda Function for Portfolio Get
 resource "aws_lambda_function" "portfolio_get" {
-  filename         = data.archive_file.portfolio_get_zip.output_path
+  count = local.function_count
+
+  filename         = data.archive_file.portfolio_get_zip[0].output_path
   function_name    = "${var.project_name}-portfolio-get"
   role            = aws_iam_role.lambda.arn
   handler         = "handler.lambda_handler"
-  source_code_hash = data.archive_file.portfolio_get_zip.output_base64sha256
+  source_code_hash = data.archive_file.portfolio_get_zip[0].output_base64sha256
   runtime         = var.lambda_runtime
   timeout         = var.lambda_timeout
   memory_size     = var.lambda_memory_size
@@ -325,6 +525,10 @@ resource "aws_lambda_function" "portfolio_get" {
       PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
       EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
       S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
+      READ_CACHE_TTL_SECONDS = var.read_cache_ttl_seconds
     }
   }
 
@@ -336,11 +540,13 @@ resource "aws_lambda_function" "portfolio_get" {
 
 # Lambda Function for Portfolio List
 resource "aws_lambda_function" "portfolio_list" {
-  filename         = data.archive_file.portfolio_list_zip.output_path
+  count = local.function_count
+
+  filename         = data.archive_file.portfolio_list_zip[0].output_path
   function_name    = "${var.project_name}-portfolio-list"
   role            = aws_iam_role.lambda.arn
   handler         = "handler.lambda_handler"
-  source_code_hash = data.archive_file.portfolio_list_zip.output_base64sha256
+  source_code_hash = data.archive_file.portfolio_list_zip[0].output_base64sha256
   runtime         = var.lambda_runtime
   timeout         = var.lambda_timeout
   memory_size     = var.lambda_memory_size
@@ -351,6 +557,11 @@ resource "aws_lambda_function" "portfolio_list" {
       PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
       EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
       S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
+      READ_CACHE_TTL_SECONDS = var.read_cache_ttl_seconds
+      CURSOR_SECRET   = sha256("cursor:${var.secret_token}")
     }
   }
 
@@ -362,11 +573,13 @@ resource "aws_lambda_function" "portfolio_list" {
 
 # Lambda Function for Resume Create
 resource "aws_lambda_function" "resume_create" {
-  filename         = data.archive_file.resume_create_zip.output_path
+  count = local.function_count
+
+  filename         = data.archive_file.resume_create_zip[0].output_path
   function_name    = "${var.project_name}-resume-create"
   role            = aws_iam_role.lambda.arn
   handler         = "handler.lambda_handler"
-  source_code_hash = data.archive_file.resume_create_zip.output_base64sha256
+  source_code_hash = data.archive_file.resume_create_zip[0].output_base64sha256
   runtime         = var.lambda_runtime
   timeout         = var.lambda_timeout
   memory_size     = var.lambda_memory_size
@@ -377,6 +590,9 @@ resource "aws_lambda_function" "resume_create" {
       PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
       EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
       S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
       SECRET_TOKEN    = var.secret_token
     }
   }
@@ -389,11 +605,13 @@ resource "aws_lambda_function" "resume_create" {
 
 # Lambda Function for Resume List
 resource "aws_lambda_function" "resume_list" {
-  filename         = data.archive_file.resume_list_zip.output_path
+  count = local.function_count
+
+  filename         = data.archive_file.resume_list_zip[0].output_path
   function_name    = "${var.project_name}-resume-list"
   role            = aws_iam_role.lambda.arn
   handler         = "handler.lambda_handler"
-  source_code_hash = data.archive_file.resume_list_zip.output_base64sha256
+  source_code_hash = data.archive_file.resume_list_zip[0].output_base64sha256
   runtime         = var.lambda_runtime
   timeout         = var.lambda_timeout
   memory_size     = var.lambda_memory_size
@@ -404,6 +622,11 @@ resource "aws_lambda_function" "resume_list" {
       PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
       EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
       S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
+      READ_CACHE_TTL_SECONDS = var.read_cache_ttl_seconds
+      CURSOR_SECRET   = sha256("cursor:${var.secret_token}")
     }
   }
 
@@ -415,14 +638,17 @@ resource "aws_lambda_function" "resume_list" {
 
 # Lambda Function for Image Upload
 resource "aws_lambda_function" "image_upload" {
-  filename         = data.archive_file.image_upload_zip.output_path
+  count = local.function_count
+
+  filename         = data.archive_file.image_upload_zip[0].output_path
   function_name    = "${var.project_name}-image-upload"
   role            = aws_iam_role.lambda.arn
   handler         = "handler.lambda_handler"
-  source_code_hash = data.archive_file.image_upload_zip.output_base64sha256
+  source_code_hash = data.archive_file.image_upload_zip[0].output_base64sha256
   runtime         = var.lambda_runtime
   timeout         = var.lambda_timeout
-  memory_size     = var.lambda_memory_size
+  memory_size     = local.image_memory_size
+  layers          = var.image_layer_arns
 
   environment {
     variables = {
@@ -430,6 +656,13 @@ resource "aws_lambda_function" "image_upload" {
       PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
       EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
       S3_BUCKET       = aws_s3_bucket.images.id
+      IMAGE_VARIANT_WIDTHS = var.image_variant_widths
+      IMAGE_VARIANT_FORMATS = var.image_variant_formats
+      IMAGE_VARIANT_MAX_PIXELS = var.image_variant_max_pixels
+      IMAGE_CONTENT_ADDRESSED = var.image_content_addressed
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
       SECRET_TOKEN    = var.secret_token
     }
   }
@@ -440,3 +673,197 @@ resource "aws_lambda_function" "image_upload" {
   }
 }
 
+# Lambda Function for Image Presign
+resource "aws_lambda_function" "image_presign" {
+  count = local.function_count
+
+  filename         = data.archive_file.image_presign_zip[0].output_path
+  function_name    = "${var.project_name}-image-presign"
+  role            = aws_iam_role.lambda.arn
+  handler         = "handler.lambda_handler"
+  source_code_hash = data.archive_file.image_presign_zip[0].output_base64sha256
+  runtime         = var.lambda_runtime
+  timeout         = var.lambda_timeout
+  memory_size     = var.lambda_memory_size
+
+  environment {
+    variables = {
+      IMAGE_UPLOAD_TABLE = aws_dynamodb_table.image_upload.name
+      S3_BUCKET       = aws_s3_bucket.images.id
+      IMAGE_MAX_BYTES = var.image_max_bytes
+      IMAGE_PRESIGN_EXPIRES_SECONDS = var.image_presign_expires_seconds
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
+      SECRET_TOKEN    = var.secret_token
+    }
+  }
+
+  tags = {
+    Name        = "${var.project_name}-image-presign"
+    Environment = var.environment
+  }
+}
+
+# Lambda Function for Image Finalize
+resource "aws_lambda_function" "image_finalize" {
+  count = local.function_count
+
+  filename         = data.archive_file.image_finalize_zip[0].output_path
+  function_name    = "${var.project_name}-image-finalize"
+  role            = aws_iam_role.lambda.arn
+  handler         = "handler.lambda_handler"
+  source_code_hash = data.archive_file.image_finalize_zip[0].output_base64sha256
+  runtime         = var.lambda_runtime
+  timeout         = var.lambda_timeout
+  memory_size     = local.image_memory_size
+  layers          = var.image_layer_arns
+
+  environment {
+    variables = {
+      IMAGE_UPLOAD_TABLE = aws_dynamodb_table.image_upload.name
+      S3_BUCKET       = aws_s3_bucket.images.id
+      IMAGE_VARIANT_WIDTHS = var.image_variant_widths
+      IMAGE_VARIANT_FORMATS = var.image_variant_formats
+      IMAGE_VARIANT_MAX_PIXELS = var.image_variant_max_pixels
+      IMAGE_MAX_BYTES = var.image_max_bytes
+      IMAGE_PRESIGN_EXPIRES_SECONDS = var.image_presign_expires_seconds
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
+      SECRET_TOKEN    = var.secret_token
+    }
+  }
+
+  tags = {
+    Name        = "${var.project_name}-image-finalize"
+    Environment = var.environment
+  }
+}
+
+# Router package: the router entry point, src/utils and every endpoint
+# handler as functions/<name>.py (same layout as package-lambdas.sh router)
+resource "null_resource" "router_package" {
+  count = local.router_count
+
+  triggers = {
+    router_hash   = filemd5("${path.module}/../src/lambda/router/handler.py")
+    handlers_hash = md5(join(",", [for f in sort(fileset("${path.module}/../src/lambda", "*/*/handler.py")) : filemd5("${path.module}/../src/lambda/${f}")]))
+    utils_hash    = md5(join(",", [for f in sort(fileset("${path.module}/../src/utils", "*.py")) : filemd5("${path.module}/../src/utils/${f}")]))
+  }
+
+  provisioner "local-exec" {
+    command = <<-EOT
+      rm -rf ${path.module}/.terraform/router-temp
+      mkdir -p ${path.module}/.terraform/router-temp/functions
+      cp ${path.module}/../src/lambda/router/handler.py ${path.module}/.terraform/router-temp/
+      cp -r ${path.module}/../src/utils ${path.module}/.terraform/router-temp/
+      touch ${path.module}/.terraform/router-temp/functions/__init__.py
+      for f in ${path.module}/../src/lambda/*/*/handler.py; do
+        name=$(basename $(dirname $f))
+        cp $f ${path.module}/.terraform/router-temp/functions/$${name//-/_}.py
+      done
+    EOT
+    interpreter = ["/bin/bash", "-c"]
+  }
+}
+
+data "archive_file" "router_zip" {
+  count = local.router_count
+
+  type        = "zip"
+  source_dir  = "${path.module}/.terraform/router-temp"
+  output_path = "${path.module}/.terraform/router.zip"
+  depends_on  = [null_resource.router_package]
+}
+
+# Lambda Function for every route (router deployment)
+resource "aws_lambda_function" "router" {
+  count = local.router_count
+
+  filename         = data.archive_file.router_zip[0].output_path
+  function_name    = "${var.project_name}-router"
+  role            = aws_iam_role.lambda.arn
+  handler         = "handler.lambda_handler"
+  source_code_hash = data.archive_file.router_zip[0].output_base64sha256
+  runtime         = var.lambda_runtime
+  timeout         = var.lambda_timeout
+  # Serves image finalize/upload too: with Pillow it decodes images
+  memory_size     = length(var.image_layer_arns) > 0 ? local.image_memory_size : var.lambda_memory_size
+  layers          = var.image_layer_arns
+
+  environment {
+    variables = {
+      BLOGPOST_TABLE  = aws_dynamodb_table.blogpost.name
+      PORTFOLIO_TABLE = aws_dynamodb_table.portfolio.name
+      EXPERIENCE_TABLE = aws_dynamodb_table.experience.name
+      S3_BUCKET       = aws_s3_bucket.images.id
+      METRICS_NAMESPACE = var.project_name
+      METRICS_SAMPLE_RATE = var.metrics_sample_rate
+      DYNAMODB_CONSUMED_CAPACITY = var.dynamodb_consumed_capacity
+      BLOGPOST_BATCH_MAX_ITEMS = var.blogpost_batch_max_items
+      IMAGE_UPLOAD_TABLE = aws_dynamodb_table.image_upload.name
+      IMAGE_MAX_BYTES = var.image_max_bytes
+      IMAGE_PRESIGN_EXPIRES_SECONDS = var.image_presign_expires_seconds
+      IMAGE_VARIANT_WIDTHS = var.image_variant_widths
+      IMAGE_VARIANT_FORMATS = var.image_variant_formats
+      IMAGE_VARIANT_MAX_PIXELS = var.image_variant_max_pixels
+      IMAGE_CONTENT_ADDRESSED = var.image_content_addressed
+      SECRET_TOKEN    = var.secret_token
+      READ_CACHE_TTL_SECONDS = var.read_cache_ttl_seconds
+      CURSOR_SECRET   = sha256("cursor:${var.secret_token}")
+    }
+  }
+
+  tags = {
+    Name        = "${var.project_name}-router"
+    Environment = var.environment
+  }
+}
+
+# The per-endpoint functions gained a count with deployment_mode; keep
+# existing deployments in place
+moved {
+  from = aws_lambda_function.blogpost_create
+  to   = aws_lambda_function.blogpost_create[0]
+}
+
+moved {
+  from = aws_lambda_function.blogpost_get
+  to   = aws_lambda_function.blogpost_get[0]
+}
+
+moved {
+  from = aws_lambda_function.blogpost_list
+  to   = aws_lambda_function.blogpost_list[0]
+}
+
+moved {
+  from = aws_lambda_function.portfolio_create
+  to   = aws_lambda_function.portfolio_create[0]
+}
+
+moved {
+  from = aws_lambda_function.portfolio_get
+  to   = aws_lambda_function.portfolio_get[0]
+}
+
+moved {
+  from = aws_lambda_function.portfolio_list
+  to   = aws_lambda_function.portfolio_list[0]
+}
+
+moved {
+  from = aws_lambda_function.resume_create
+  to   = aws_lambda_function.resume_create[0]
+}
+
+moved {
+  from = aws_lambda_function.resume_list
+  to   = aws_lambda_function.resume_list[0]
+}
+
+moved {
+  from = aws_lambda_function.image_upload
+  to   = aws_lambda_function.image_upload[0]
+}
@@ -34,21 +34,26 @@ output "dynamodb_tables" {
     blogpost  = aws_dynamodb_table.blogpost.name
     portfolio = aws_dynamodb_table.portfolio.name
     experience = aws_dynamodb_table.experience.name
+    image_upload = aws_dynamodb_table.image_upload.name
   }
 }
 
 output "lambda_functions" {
   description = "Lambda function names"
-  value = {
-    blogpost_create = aws_lambda_function.blogpost_create.function_name
-    blogpost_get    = aws_lambda_function.blogpost_get.function_name
-    blogpost_list   = aws_lambda_function.blogpost_list.function_name
-    portfolio_create = aws_lambda_function.portfolio_create.function_name
-    portfolio_get    = aws_lambda_function.portfolio_get.function_name
-    portfolio_list   = aws_lambda_function.portfolio_list.function_name
-    resume_create    = aws_lambda_function.resume_create.function_name
-    resume_list      = aws_lambda_function.resume_list.function_name
-    image_upload     = aws_lambda_function.image_upload.function_name
-  }
+  value = var.deployment_mode == "router" ? tomap({
+    router = one(aws_lambda_function.router[*].function_name)
+  }) : tomap({
+    blogpost_create  = one(aws_lambda_function.blogpost_create[*].function_name)
+    blogpost_batch_create = one(aws_lambda_function.blogpost_batch_create[*].function_name)
+    blogpost_get     = one(aws_lambda_function.blogpost_get[*].function_name)
+    blogpost_list    = one(aws_lambda_function.blogpost_list[*].function_name)
+    portfolio_create = one(aws_lambda_function.portfolio_create[*].function_name)
+    portfolio_get    = one(aws_lambda_function.portfolio_get[*].function_name)
+    portfolio_list   = one(aws_lambda_function.portfolio_list[*].function_name)
+    resume_create    = one(aws_lambda_function.resume_create[*].function_name)
+    resume_list      = one(aws_lambda_function.resume_list[*].function_name)
+    image_upload     = one(aws_lambda_function.image_upload[*].function_name)
+    image_presign    = one(aws_lambda_function.image_presign[*].function_name)
+    image_finalize   = one(aws_lambda_function.image_finalize[*].function_name)
+  })
 }
-
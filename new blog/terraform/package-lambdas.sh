@@ -3,6 +3,12 @@
 # Script to package all Lambda functions before Terraform deployment
 # This script packages all Lambda functions with their dependencies
 # Run this from the terraform directory
+#
+# Usage: ./package-lambdas.sh [functions|router|all]
+#   functions  one package per endpoint (default, deployment_mode = "functions")
+#   router     a single package serving every route (deployment_mode = "router")
+#   all        both layouts
+# The mode can also be set with the DEPLOYMENT_MODE environment variable.
 
 set -e  # Exit on error
 
@@ -11,8 +17,17 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(cd "${SCRIPT_DIR}/.." && pwd)"
 SRC_DIR="${PROJECT_ROOT}/src/lambda"
 TEMP_DIR="${SCRIPT_DIR}/.terraform"
+MODE="${1:-${DEPLOYMENT_MODE:-functions}}"
 
-echo "🚀 Packaging Lambda functions..."
+case "${MODE}" in
+    functions|router|all) ;;
+    *)
+        echo "Unknown deployment mode: ${MODE} (expected functions, router or all)" >&2
+        exit 1
+        ;;
+esac
+
+echo "🚀 Packaging Lambda functions (${MODE})..."
 
 # Create temp directory if it doesn't exist
 mkdir -p "${TEMP_DIR}"
@@ -47,45 +62,100 @@ package_lambda() {
     echo "✅ ${function_name} packaged successfully"
 }
 
-# Package Blogpost functions
-package_lambda "blogpost-create" \
-    "${SRC_DIR}/blogpost/blogpost-create" \
-    "${SRC_DIR}/blogpost/utils"
-
-package_lambda "blogpost-get" \
-    "${SRC_DIR}/blogpost/blogpost-get" \
-    "${SRC_DIR}/blogpost/utils"
-
-package_lambda "blogpost-list" \
-    "${SRC_DIR}/blogpost/blogpost-list" \
-    "${SRC_DIR}/blogpost/utils"
-
-# Package Portfolio functions
-package_lambda "portfolio-create" \
-    "${SRC_DIR}/portfolio/portfolio-create" \
-    "${SRC_DIR}/portfolio/utils"
-
-package_lambda "portfolio-get" \
-    "${SRC_DIR}/portfolio/portfolio-get" \
-    "${SRC_DIR}/portfolio/utils"
-
-package_lambda "portfolio-list" \
-    "${SRC_DIR}/portfolio/portfolio-list" \
-    "${SRC_DIR}/portfolio/utils"
-
-# Package Resume functions
-package_lambda "resume-create" \
-    "${SRC_DIR}/resume/resume-create" \
-    "${SRC_DIR}/resume/utils"
-
-package_lambda "resume-list" \
-    "${SRC_DIR}/resume/resume-list" \
-    "${SRC_DIR}/resume/utils"
-
-# Package Image functions
-package_lambda "image-upload" \
-    "${SRC_DIR}/image/image-upload" \
-    "${SRC_DIR}/image/utils"
+# Package the router: one entry point, the shared utils, and every
+# endpoint handler as functions/<name>.py (see src/lambda/router/handler.py)
+package_router() {
+    echo "📦 Packaging router..."
+    
+    local temp_dir="${TEMP_DIR}/router-temp"
+    
+    # Clean and create temp directory
+    rm -rf "${temp_dir}"
+    mkdir -p "${temp_dir}/functions"
+    
+    cp "${SRC_DIR}/router/handler.py" "${temp_dir}/"
+    cp -r "${PROJECT_ROOT}/src/utils" "${temp_dir}/"
+    touch "${temp_dir}/functions/__init__.py"
+    
+    local handler_dir
+    for handler_dir in "${SRC_DIR}"/*/*/; do
+        local function_name
+        function_name="$(basename "${handler_dir}")"
+        if [ -f "${handler_dir}/handler.py" ]; then
+            cp "${handler_dir}/handler.py" "${temp_dir}/functions/${function_name//-/_}.py"
+        fi
+    done
+    
+    # Create zip file
+    rm -f "${TEMP_DIR}/router.zip"
+    cd "${temp_dir}"
+    zip -r "${TEMP_DIR}/router.zip" . > /dev/null
+    cd - > /dev/null
+    
+    echo "✅ router packaged successfully"
+}
+
+package_functions() {
+    # Package Blogpost functions
+    package_lambda "blogpost-create" \
+        "${SRC_DIR}/blogpost/blogpost-create" \
+        "${SRC_DIR}/blogpost/utils"
+
+    package_lambda "blogpost-batch-create" \
+        "${SRC_DIR}/blogpost/blogpost-batch-create" \
+        "${SRC_DIR}/blogpost/utils"
+
+    package_lambda "blogpost-get" \
+        "${SRC_DIR}/blogpost/blogpost-get" \
+        "${SRC_DIR}/blogpost/utils"
+
+    package_lambda "blogpost-list" \
+        "${SRC_DIR}/blogpost/blogpost-list" \
+        "${SRC_DIR}/blogpost/utils"
+
+    # Package Portfolio functions
+    package_lambda "portfolio-create" \
+        "${SRC_DIR}/portfolio/portfolio-create" \
+        "${SRC_DIR}/portfolio/utils"
+
+    package_lambda "portfolio-get" \
+        "${SRC_DIR}/portfolio/portfolio-get" \
+        "${SRC_DIR}/portfolio/utils"
+
+    package_lambda "portfolio-list" \
+        "${SRC_DIR}/portfolio/portfolio-list" \
+        "${SRC_DIR}/portfolio/utils"
+
+    # Package Resume functions
+    package_lambda "resume-create" \
+        "${SRC_DIR}/resume/resume-create" \
+        "${SRC_DIR}/resume/utils"
+
+    package_lambda "resume-list" \
+        "${SRC_DIR}/resume/resume-list" \
+        "${SRC_DIR}/resume/utils"
+
+    # Package Image functions
+    package_lambda "image-upload" \
+        "${SRC_DIR}/image/image-upload" \
+        "${SRC_DIR}/image/utils"
+
+    package_lambda "image-presign" \
+        "${SRC_DIR}/image/image-presign" \
+        "${SRC_DIR}/image/utils"
+
+    package_lambda "image-finalize" \
+        "${SRC_DIR}/image/image-finalize" \
+        "${SRC_DIR}/image/utils"
+}
+
+if [ "${MODE}" != "router" ]; then
+    package_functions
+fi
+
+if [ "${MODE}" != "functions" ]; then
+    package_router
+fi
 
 echo ""
 echo "✨ All Lambda functions packaged successfully!"
@@ -51,3 +51,19 @@ resource "aws_s3_bucket_cors_configuration" "images" {
   }
 }
 
+# Remove parts of multipart uploads that were never completed or aborted
+# (e.g. the function timed out mid-upload); they are billed until then
+resource "aws_s3_bucket_lifecycle_configuration" "images" {
+  bucket = aws_s3_bucket.images.id
+
+  rule {
+    id     = "abort-incomplete-multipart-uploads"
+    status = "Enabled"
+
+    filter {}
+
+    abort_incomplete_multipart_upload {
+      days_after_initiation = 1
+    }
+  }
+}
@@ -46,3 +46,117 @@ variable "secret_token" {
   sensitive   = true
 }
 
+
+variable "read_cache_ttl_seconds" {
+  description = "TTL in seconds for the warm-container read cache in the get/list functions (0 disables it)"
+  type        = number
+  default     = 60
+}
+
+variable "deployment_mode" {
+  description = "Lambda layout: \"functions\" (one function per endpoint) or \"router\" (one function serving every route, sharing warm containers)"
+  type        = string
+  default     = "functions"
+
+  validation {
+    condition     = contains(["functions", "router"], var.deployment_mode)
+    error_message = "deployment_mode must be \"functions\" or \"router\"."
+  }
+}
+
+variable "metrics_sample_rate" {
+  description = "Fraction of warm, successful invocations that write their timing metrics (EMF log line); cold starts and 5xx responses are always written"
+  type        = number
+  default     = 1
+
+  validation {
+    condition     = var.metrics_sample_rate >= 0 && var.metrics_sample_rate <= 1
+    error_message = "metrics_sample_rate must be between 0 and 1."
+  }
+}
+
+variable "batch_lambda_memory_size" {
+  description = "Memory size in MB for the blogpost batch create function (at least lambda_memory_size)"
+  type        = number
+  default     = 1024
+}
+
+variable "blogpost_batch_max_items" {
+  description = "Largest number of blogposts accepted by POST /blogpost/batch"
+  type        = number
+  default     = 1000
+
+  validation {
+    condition     = var.blogpost_batch_max_items >= 1
+    error_message = "blogpost_batch_max_items must be at least 1."
+  }
+}
+
+variable "image_max_bytes" {
+  description = "Largest image accepted by the direct-to-S3 upload (POST /image/presign), in bytes"
+  type        = number
+  default     = 10485760
+}
+
+variable "image_presign_expires_seconds" {
+  description = "Lifetime of presigned image upload URLs and POST policies, in seconds"
+  type        = number
+  default     = 300
+
+  validation {
+    condition     = var.image_presign_expires_seconds >= 1 && var.image_presign_expires_seconds <= 604800
+    error_message = "image_presign_expires_seconds must be between 1 and 604800 (7 days)."
+  }
+}
+
+variable "image_lambda_memory_size" {
+  description = "Memory size in MB for the image upload and finalize functions, which encode the responsive variants (1769 MB is one full vCPU; raised if image_variant_max_pixels needs more)"
+  type        = number
+  default     = 1769
+}
+
+variable "image_variant_max_pixels" {
+  description = "Largest image (width x height) that gets responsive variants; decoding takes about 8 bytes per pixel"
+  type        = number
+  default     = 50000000
+
+  validation {
+    condition     = var.image_variant_max_pixels >= 1
+    error_message = "image_variant_max_pixels must be positive."
+  }
+}
+
+variable "image_layer_arns" {
+  description = "Lambda layers for the image functions, e.g. one providing Pillow; without Pillow no image variants are generated"
+  type        = list(string)
+  default     = []
+}
+
+variable "image_variant_widths" {
+  description = "Comma-separated widths of the responsive image variants"
+  type        = string
+  default     = "320,640,1024,1600"
+}
+
+variable "image_variant_formats" {
+  description = "Comma-separated formats of the responsive image variants: avif, webp, jpeg, png or original (the upload's own format)"
+  type        = string
+  default     = "avif,webp,original"
+}
+
+variable "image_content_addressed" {
+  description = "Key images uploaded through POST /image/upload by a SHA-256 of their content: identical uploads are stored once and served with an immutable Cache-Control"
+  type        = bool
+  default     = false
+}
+
+variable "dynamodb_consumed_capacity" {
+  description = "ReturnConsumedCapacity for every DynamoDB call, added to the timing metrics: \"\" (off), \"TOTAL\" or \"INDEXES\" (per table and index)"
+  type        = string
+  default     = ""
+
+  validation {
+    condition     = contains(["", "TOTAL", "INDEXES"], var.dynamodb_consumed_capacity)
+    error_message = "dynamodb_consumed_capacity must be \"\", \"TOTAL\" or \"INDEXES\"."
+  }
+}